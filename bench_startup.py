@@ -0,0 +1,93 @@
+"""
+Startup benchmark: time-to-ready and RSS with and without lazy member mode.
+
+Launches bot.py (with the token from .env) once per run and mode, waits for
+the "Logged in as" line that on_ready logs, samples the process RSS at that
+point, then stops the bot.
+
+    python bench_startup.py [--runs 3] [--timeout 600]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+from dotenv import load_dotenv
+
+READY_MARKER = "Logged in as"
+
+
+def run_once(lazy: bool, timeout: float) -> tuple[float, float] | None:
+    """Return (seconds to ready, RSS MiB at ready) or None on timeout."""
+    env = os.environ.copy()
+    env["KINGSHOT_LAZY_MEMBERS"] = "1" if lazy else "0"
+    env["PYTHONUNBUFFERED"] = "1"
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "bot.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    ready = threading.Event()
+
+    def watch():
+        for line in proc.stdout:
+            if READY_MARKER in line:
+                ready.set()
+                break
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        if not ready.wait(timeout):
+            return None
+        elapsed = time.perf_counter() - start
+        rss = psutil.Process(proc.pid).memory_info().rss / (1024 * 1024)
+        return elapsed, rss
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not os.getenv("KINGSHOT_BOT_TOKEN"):
+        sys.exit("❌ KINGSHOT_BOT_TOKEN is required to benchmark a real login.")
+
+    print(f"{'mode':<8} {'run':>3} {'ready (s)':>10} {'RSS (MiB)':>10}")
+    for lazy in (False, True):
+        mode = "lazy" if lazy else "chunked"
+        results = []
+        for i in range(1, args.runs + 1):
+            result = run_once(lazy, args.timeout)
+            if result is None:
+                print(f"{mode:<8} {i:>3} {'timeout':>10}")
+                continue
+            results.append(result)
+            print(f"{mode:<8} {i:>3} {result[0]:>10.2f} {result[1]:>10.1f}")
+        if results:
+            avg_t = sum(r[0] for r in results) / len(results)
+            avg_m = sum(r[1] for r in results) / len(results)
+            print(f"{mode:<8} {'avg':>3} {avg_t:>10.2f} {avg_m:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
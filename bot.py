@@ -1,16 +1,44 @@
 # bot.py
+# First import: the tracer's clock starts here, timing everything below
+from startup_trace import startup_tracer
 import os
 import logging
 import asyncio
 import discord
+import yarl
 from discord import app_commands, Interaction
 from discord.utils import escape_markdown, escape_mentions
 from discord.ext import commands
 from dotenv import load_dotenv
-from config import DEFAULT_ACTIVITY, DEFAULT_ACTIVITY_TYPE, DEFAULT_STATUS
+from config import (
+    DEFAULT_ACTIVITY,
+    DEFAULT_ACTIVITY_TYPE,
+    DEFAULT_STATUS,
+    ROLE_COUNT_RECOUNT_SEC,
+    LAZY_MEMBERS,
+    METRICS_PORT,
+    CLUSTER_ID,
+    SHARD_COUNT,
+    SHARD_IDS,
+    DISCORD_URL,
+    MASTER_GUILD_ID,
+)
 import sys
-from admin_tools import start_admin_tools, handle_command
-from helpers import update_guild_count, update_role_counts, start_config_writer
+import time
+import signal
+from admin_tools import start_admin_tools, handle_command, live_feed
+from event_log import setup_logging
+from metrics import http_trace, start_metrics_server
+from rest_accounting import rest_accounting, rest_feature
+from circuit_breaker import channel_breaker
+from channel_cache import channel_cache
+from loop_monitor import loop_monitor
+from heartbeat import start_heartbeat
+from warm_state import save_snapshot
+from command_sync import sync_commands
+from helpers import update_guild_count, update_role_counts, start_config_writer, role_counter
+
+startup_tracer.since_start("imports")
 
 load_dotenv()  # ⬅️ This loads variables from .env into os.environ
 
@@ -48,6 +76,15 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 log = logging.getLogger("kingshot")
+setup_logging(live_feed)
+
+if DISCORD_URL:
+    # Load testing against fake_discord.py
+    discord.http.Route.BASE = f"{DISCORD_URL}/api/v10"
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(
+        DISCORD_URL.replace("http", "ws", 1) + "/gateway"
+    )
+    log.warning(f"Using a stand-in Discord at {DISCORD_URL}")
 
 # ─── Intents & Bot ───────────────────────────────────
 intents = discord.Intents.default()
@@ -56,10 +93,57 @@ intents.members = True
 intents.reactions = True
 intents.message_content = True
 
-bot = commands.Bot(
-    command_prefix=commands.when_mentioned, help_command=None, intents=intents
+# Lazy member mode: skip chunking every guild before on_ready; members are
+# resolved on demand (helpers.resolve_member) and reaction-role guilds are
+# chunked by the reaction cog's startup reconcile.
+bot_options = dict(
+    command_prefix=commands.when_mentioned,
+    help_command=None,
+    intents=intents,
+    chunk_guilds_at_startup=not LAZY_MEMBERS,
+    # Counts REST calls by route/outcome for /metrics
+    http_trace=http_trace() if METRICS_PORT else None,
 )
+
+
+class _WarmSnapshotOnClose:
+    """
+    Writes the warm restart snapshot at the start of close(), while the cogs
+    still exist; BotBase.close() unloads every extension before returning.
+    /stop, /restart and SIGTERM all shut down through here.
+    """
+
+    snapshot_on_close = True
+
+    async def close(self):
+        if DISCORD_ENABLED and self.snapshot_on_close and not self.is_closed():
+            # Once only: later close() calls find no cogs to snapshot
+            self.snapshot_on_close = False
+            save_snapshot(self)
+        await super().close()
+
+
+class KingshotBot(_WarmSnapshotOnClose, commands.Bot):
+    pass
+
+
+class KingshotShardedBot(_WarmSnapshotOnClose, commands.AutoShardedBot):
+    pass
+
+
+if SHARD_IDS:
+    # Clustered (cluster.py): this process runs only its own shards, so
+    # bot.guilds, and every scheduler driven by it, holds only their guilds
+    bot = KingshotShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **bot_options)
+else:
+    bot = KingshotBot(**bot_options)
 bot.role_message_ids = {}
+# Charges every REST call to the feature that made it (/rest)
+rest_accounting.install(bot.http)
+# Skips channels that keep failing with Forbidden / Unknown Channel (/breakers)
+channel_breaker.attach(bot)
+# Channel-by-name and permission lookups, dropped by channel/role events
+channel_cache.attach(bot)
 
 # ─── Cogs List ───
 COGS = [
@@ -98,12 +182,21 @@ async def terminal_input_loop(bot):
 # ─── Main Entrypoint ───
 async def main():
     log.info("Starting Kingshot Bot...")
+    loop_monitor.start()
+    start_heartbeat(bot)
+    if os.name != "nt":
+        # SIGTERM (watchdog restarts, deploys) closes the bot cleanly
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, lambda: asyncio.create_task(bot.close())
+        )
     try:
         if DISCORD_ENABLED:
             log.info("Connecting to Discord...")
-            await bot.login(token)
+            with startup_tracer.span("bot.login"):
+                await bot.login(token)
             bot_task = asyncio.create_task(bot.connect())
-            await bot.wait_until_ready()
+            with startup_tracer.span("gateway.ready"):
+                await bot.wait_until_ready()
         else:
             log.info("🚫 Discord gateway connection disabled (DEV MODE)")
             bot_task = asyncio.create_task(dummy_lifecycle())
@@ -111,7 +204,8 @@ async def main():
         log.info("Loading cogs...")
         for cog in COGS:
             try:
-                await bot.load_extension(cog)
+                with startup_tracer.span(f"load {cog}"):
+                    await bot.load_extension(cog)
                 log.info(f"Loaded cog: {cog}")
             except Exception as e:
                 log.error(f"Failed to load cog {cog}: {e}")
@@ -119,19 +213,13 @@ async def main():
                     raise
 
         if DISCORD_ENABLED:
-            # Sync commands after all cogs are loaded
+            # Sync commands after all cogs are loaded (skipped when unchanged)
             log.info("Syncing commands...")
-            # Sync globally first
-            synced = await bot.tree.sync()
-            log.info(f"✅ Globally synced {len(synced)} commands.")
-            
-            # Sync for each guild individually
-            for guild in bot.guilds:
-                try:
-                    await bot.tree.sync(guild=guild)
-                    log.info(f"🔁 Synced commands in {guild.name}")
-                except Exception as e:
-                    log.error(f"Failed to sync commands in {guild.name}: {e}")
+            with startup_tracer.span("command_sync"):
+                await sync_commands(bot, sync_global=CLUSTER_ID in (None, 0))
+
+        # Print the startup waterfall once cog startup tasks have finished
+        startup_tracer.finish_when_idle()
 
         # Start terminal input loop
         asyncio.create_task(terminal_input_loop(bot))
@@ -141,6 +229,8 @@ async def main():
 
     except Exception as e:
         log.exception("Bot encountered an exception:", exc_info=e)
+        # Not a clean shutdown; the next boot does a full resync
+        bot.snapshot_on_close = False
         if DISCORD_ENABLED:  # Only exit in production mode
             sys.exit(1)
     finally:
@@ -188,8 +278,16 @@ async def on_ready():
     start_admin_tools(bot)
     log.info("Admin tools started")
 
+    await start_metrics_server(bot)
+
     await update_guild_count(bot)
-    await update_role_counts(bot)
+    # on_ready fires again after reconnects; later recounts are left to the
+    # ROLE_COUNT_RECOUNT_SEC check in periodic_updates
+    if role_counter.last_recount == 0:
+        with startup_tracer.span("role_counter.recount"):
+            role_counter.recount(bot)
+    with rest_feature("role_count_rename", MASTER_GUILD_ID):
+        await update_role_counts(bot)
 
     # Start periodic update task
     async def periodic_updates():
@@ -197,7 +295,11 @@ async def on_ready():
             try:
                 await asyncio.sleep(300)  # Update every 5 minutes
                 await update_guild_count(bot)
-                await update_role_counts(bot)
+                # Counts are kept incrementally; a full recount is only a slow safety net
+                if time.monotonic() - role_counter.last_recount >= ROLE_COUNT_RECOUNT_SEC:
+                    role_counter.recount(bot)
+                with rest_feature("role_count_rename", MASTER_GUILD_ID):
+                    await update_role_counts(bot)
             except Exception as e:
                 log.error(f"Error in periodic updates: {e}")
     
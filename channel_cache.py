@@ -0,0 +1,152 @@
+# channel_cache.py
+
+import discord
+from discord.ext import commands
+
+
+class ChannelCache:
+    """
+    Per-guild channel lookups and the bot's permissions in each channel.
+
+    by_name() stands in for discord.utils.get(guild.text_channels, name=...),
+    which sorts and scans every channel on each call, with a name index
+    built once per guild. can_send()/can_manage() keep the result of
+    permissions_for(guild.me), which walks every role and overwrite, per
+    channel. ID lookups need no cache; guild.get_channel() is a dict lookup.
+
+    Both are dropped by the gateway events that can change them (see
+    attach()): channel create/update/delete for the guild's name index and
+    that channel's flags, and role changes, the bot's own roles changing
+    or a category's overwrites changing for every flag in the guild. A new
+    READY, or a guild becoming available or joined, replaces discord.py's
+    Guild and channel objects without replaying what was missed, so those
+    drop everything for the guild (or everything, on READY).
+    """
+
+    def __init__(self):
+        # guild id -> channel name -> first text channel by position
+        self._names: dict[int, dict[str, discord.TextChannel]] = {}
+        # guild id -> channel id -> (can send, can manage messages)
+        self._flags: dict[int, dict[int, tuple[bool, bool]]] = {}
+        self.hits = 0
+        self.builds = 0
+
+    def by_name(self, guild: discord.Guild, name: str) -> discord.TextChannel | None:
+        """The guild's first text channel called `name`, as discord.utils.get would find it."""
+        index = self._names.get(guild.id)
+        if index is not None:
+            ch = index.get(name)
+            if ch is None or guild.get_channel(ch.id) is ch:
+                self.hits += 1
+                return ch
+            # Replaced or deleted without an event we saw; rebuild
+        index = {}
+        for ch in guild.text_channels:
+            index.setdefault(ch.name, ch)
+        self._names[guild.id] = index
+        self.builds += 1
+        return index.get(name)
+
+    def _perms(self, ch: discord.abc.GuildChannel) -> tuple[bool, bool]:
+        flags = self._flags.setdefault(ch.guild.id, {})
+        cached = flags.get(ch.id)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        perms = ch.permissions_for(ch.guild.me)
+        cached = flags[ch.id] = (perms.send_messages, perms.manage_messages)
+        self.builds += 1
+        return cached
+
+    def can_send(self, ch: discord.abc.GuildChannel) -> bool:
+        return self._perms(ch)[0]
+
+    def can_manage(self, ch: discord.abc.GuildChannel) -> bool:
+        return self._perms(ch)[1]
+
+    def forget_channel(self, ch: discord.abc.GuildChannel) -> None:
+        self._names.pop(ch.guild.id, None)
+        if isinstance(ch, discord.CategoryChannel):
+            # Synced children inherit the category's overwrites
+            self._flags.pop(ch.guild.id, None)
+        else:
+            self._flags.get(ch.guild.id, {}).pop(ch.id, None)
+
+    def forget_permissions(self, guild: discord.Guild) -> None:
+        self._flags.pop(guild.id, None)
+
+    def forget_guild(self, guild: discord.Guild) -> None:
+        self._names.pop(guild.id, None)
+        self._flags.pop(guild.id, None)
+
+    def clear(self) -> None:
+        self._names.clear()
+        self._flags.clear()
+
+    def stats(self) -> dict:
+        return {
+            "guilds": len(self._names.keys() | self._flags.keys()),
+            "channels": sum(len(f) for f in self._flags.values()),
+            "hits": self.hits,
+            "builds": self.builds,
+        }
+
+    def attach(self, bot: commands.Bot) -> None:
+        """Drop cached entries on the gateway events that change them."""
+
+        async def on_guild_channel_create(ch):
+            self.forget_channel(ch)
+
+        async def on_guild_channel_delete(ch):
+            self.forget_channel(ch)
+
+        async def on_guild_channel_update(before, after):
+            self.forget_channel(after)
+
+        async def on_guild_role_create(role):
+            self.forget_permissions(role.guild)
+
+        async def on_guild_role_update(before, after):
+            self.forget_permissions(after.guild)
+
+        async def on_guild_role_delete(role):
+            self.forget_permissions(role.guild)
+
+        async def on_member_update(before, after):
+            if after.id == bot.user.id and before.roles != after.roles:
+                self.forget_permissions(after.guild)
+
+        async def on_guild_update(before, after):
+            # Ownership and guild-wide settings feed into permissions
+            self.forget_permissions(after)
+
+        async def on_guild_remove(guild):
+            self.forget_guild(guild)
+
+        async def on_ready():
+            self.clear()
+
+        async def on_guild_available(guild):
+            self.forget_guild(guild)
+
+        async def on_guild_join(guild):
+            self.forget_guild(guild)
+
+        for listener in (
+            on_guild_channel_create,
+            on_guild_channel_delete,
+            on_guild_channel_update,
+            on_guild_role_create,
+            on_guild_role_update,
+            on_guild_role_delete,
+            on_member_update,
+            on_guild_update,
+            on_guild_remove,
+            on_ready,
+            on_guild_available,
+            on_guild_join,
+        ):
+            bot.add_listener(listener)
+
+
+channel_cache = ChannelCache()
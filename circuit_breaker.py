@@ -0,0 +1,181 @@
+# circuit_breaker.py
+
+import logging
+
+import discord
+from discord.ext import commands
+
+from clock import clock
+from config import BREAKER_FAILURE_THRESHOLD, BREAKER_PROBE_BASE_SEC, BREAKER_PROBE_MAX_SEC
+
+log = logging.getLogger("kingshot")
+
+# NotFound codes that mean the channel itself is gone, not just a message in it
+UNKNOWN_CHANNEL = 10003
+
+
+class ChannelBreaker:
+    """
+    Stops the schedulers from retrying channels they can't use.
+
+    Every REST call on a channel route reports its outcome (see install()):
+    a Forbidden, or a NotFound for the channel itself, is a failure, and
+    anything that succeeds clears the channel. After
+    BREAKER_FAILURE_THRESHOLD failures in a row the breaker opens and
+    allow() turns work for that channel away, except for one probe every
+    BREAKER_PROBE_BASE_SEC, doubling up to BREAKER_PROBE_MAX_SEC while
+    probes keep failing. A permission overwrite change on the channel, a
+    role change in its guild or the bot's own roles changing closes it
+    early, since that is usually the fix.
+    """
+
+    def __init__(
+        self,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        base: float = BREAKER_PROBE_BASE_SEC,
+        cap: float = BREAKER_PROBE_MAX_SEC,
+    ):
+        self.threshold = threshold
+        self.base = base
+        self.cap = cap
+        # channel id -> {"failures", "opened_at", "retry_at", "backoff", "skipped", "error", "guild", "name"}
+        self.channels: dict[int, dict] = {}
+        self.opened = 0
+        self.skipped = 0
+        self.probes = 0
+
+    def is_open(self, channel_id: int) -> bool:
+        state = self.channels.get(channel_id)
+        return bool(state and state["opened_at"] is not None)
+
+    def open_count(self) -> int:
+        return sum(1 for state in self.channels.values() if state["opened_at"] is not None)
+
+    def allow(self, channel: discord.abc.GuildChannel) -> bool:
+        """False while the channel's breaker is open and no re-probe is due."""
+        state = self.channels.get(channel.id)
+        if state is None or state["opened_at"] is None:
+            return True
+        state["guild"], state["name"] = channel.guild.name, channel.name
+        now = clock.time()
+        if now < state["retry_at"]:
+            state["skipped"] += 1
+            self.skipped += 1
+            return False
+        # Let this caller through as the probe; the next one waits longer
+        # unless the probe succeeds and clears the channel
+        state["backoff"] = min(state["backoff"] * 2, self.cap)
+        state["retry_at"] = now + state["backoff"]
+        self.probes += 1
+        return True
+
+    def failure(self, channel_id: int, error: discord.HTTPException) -> None:
+        state = self.channels.get(channel_id)
+        if state is None:
+            state = self.channels[channel_id] = {
+                "failures": 0,
+                "opened_at": None,
+                "retry_at": 0.0,
+                "backoff": self.base,
+                "skipped": 0,
+                "error": None,
+                "guild": None,
+                "name": None,
+            }
+        state["failures"] += 1
+        state["error"] = f"{error.status} {error.text or type(error).__name__}"[:120]
+        if state["opened_at"] is None and state["failures"] >= self.threshold:
+            now = clock.time()
+            state["opened_at"] = now
+            state["retry_at"] = now + self.base
+            self.opened += 1
+            log.warning(
+                f"Circuit opened for channel {channel_id} after {state['failures']} failures "
+                f"({state['error']}); re-probing in {self.base:g}s",
+                extra={"phase": "breaker_open"},
+            )
+
+    def success(self, channel_id: int) -> None:
+        state = self.channels.pop(channel_id, None)
+        if state and state["opened_at"] is not None:
+            self._closed(channel_id, state, "probe succeeded")
+
+    def reset_channel(self, channel_id: int, reason: str) -> None:
+        state = self.channels.pop(channel_id, None)
+        if state and state["opened_at"] is not None:
+            self._closed(channel_id, state, reason)
+
+    def reset_guild(self, guild: discord.Guild, reason: str) -> None:
+        for channel_id in [cid for cid in self.channels if guild.get_channel(cid)]:
+            self.reset_channel(channel_id, reason)
+
+    def _closed(self, channel_id: int, state: dict, reason: str) -> None:
+        where = f"#{state['name']} in {state['guild']}" if state["name"] else f"channel {channel_id}"
+        log.info(
+            f"Circuit closed for {where} ({reason}) after {state['skipped']} skipped attempt(s)",
+            extra={"phase": "breaker_close"},
+        )
+
+    def install(self, http: discord.http.HTTPClient) -> None:
+        """Report the outcome of every REST call on a channel route."""
+        original = http.request
+
+        async def request(route, *args, **kwargs):
+            channel_id = route.channel_id
+            try:
+                result = await original(route, *args, **kwargs)
+            except discord.Forbidden as e:
+                if channel_id:
+                    self.failure(int(channel_id), e)
+                raise
+            except discord.NotFound as e:
+                if channel_id and e.code == UNKNOWN_CHANNEL:
+                    self.failure(int(channel_id), e)
+                raise
+            if channel_id and int(channel_id) in self.channels:
+                self.success(int(channel_id))
+            return result
+
+        http.request = request
+
+    def attach(self, bot: commands.Bot) -> None:
+        """Record REST outcomes and close breakers on permission-related events."""
+        self.install(bot.http)
+
+        async def on_guild_channel_update(before, after):
+            if after.id in self.channels and before.overwrites != after.overwrites:
+                self.reset_channel(after.id, "permission overwrites changed")
+
+        async def on_guild_role_update(before, after):
+            if self.channels and before.permissions != after.permissions:
+                self.reset_guild(after.guild, f"role {after.name} changed")
+
+        async def on_member_update(before, after):
+            if self.channels and after.id == bot.user.id and before.roles != after.roles:
+                self.reset_guild(after.guild, "the bot's roles changed")
+
+        async def on_guild_join(guild):
+            if self.channels:
+                self.reset_guild(guild, "rejoined the guild")
+
+        for listener in (on_guild_channel_update, on_guild_role_update, on_member_update, on_guild_join):
+            bot.add_listener(listener)
+
+    def report(self) -> str:
+        lines = [
+            f"\n🔌 Channel breakers: {self.open_count()} open • {len(self.channels)} failing • "
+            f"{self.opened} opened • {self.skipped} attempt(s) skipped • {self.probes} probe(s)"
+        ]
+        now = clock.time()
+        for channel_id, s in sorted(self.channels.items(), key=lambda kv: -kv[1]["skipped"]):
+            if s["opened_at"] is None:
+                continue
+            where = f"#{s['name']} in {s['guild']}" if s["name"] else "(not used since)"
+            lines.append(
+                f"  {channel_id} {where} • open {(now - s['opened_at']) / 60:.0f}m • "
+                f"{s['skipped']} skipped • probe in {max(0, s['retry_at'] - now):.0f}s • {s['error']}"
+            )
+        return "\n".join(lines)
+
+
+channel_breaker = ChannelBreaker()
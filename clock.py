@@ -0,0 +1,82 @@
+# clock.py
+
+import asyncio
+import selectors
+import time
+from datetime import datetime, timezone
+
+
+class Clock:
+    """
+    Wall-clock time and sleeping for the bear, arena and event schedulers.
+
+    Real time by default. After use_virtual() the time is read from a
+    VirtualTimeLoop, whose sleeps end as soon as nothing else is runnable,
+    so days of schedules play out in seconds (see simulate.py).
+    """
+
+    def __init__(self):
+        self._loop: VirtualTimeLoop | None = None
+        self._offset = 0.0
+
+    def use_virtual(self, loop: "VirtualTimeLoop", start: float) -> None:
+        """Read time from `loop` from now on, with its current time at `start` (epoch seconds)."""
+        self._loop = loop
+        self._offset = start - loop.time()
+
+    @property
+    def virtual(self) -> bool:
+        return self._loop is not None
+
+    def time(self) -> float:
+        """Seconds since the epoch, like time.time()."""
+        if self._loop is None:
+            return time.time()
+        return self._offset + self._loop.time()
+
+    def now(self) -> datetime:
+        """Aware UTC datetime, like datetime.now(timezone.utc)."""
+        return datetime.fromtimestamp(self.time(), tz=timezone.utc)
+
+    async def sleep(self, seconds: float) -> None:
+        # asyncio.sleep already follows a VirtualTimeLoop's clock
+        await asyncio.sleep(seconds)
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Polls for I/O without blocking and skips the loop's clock to its next timer instead."""
+
+    def __init__(self, loop: "VirtualTimeLoop"):
+        super().__init__()
+        self._loop = loop
+
+    def select(self, timeout: float | None = None):
+        ready = super().select(0)
+        if ready or (timeout is not None and timeout <= 0):
+            return ready
+        if timeout is None:
+            # No timers pending; only I/O or another thread can wake the loop
+            return super().select(None)
+        self._loop.advance(timeout)
+        return []
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on virtual time: whenever every task is waiting on a timer,
+    time jumps to the earliest one. Work in other threads is not waited for,
+    so it should only run code whose waits are timers.
+    """
+
+    def __init__(self):
+        self._now = 0.0
+        super().__init__(_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += seconds
+
+
+clock = Clock()
@@ -0,0 +1,166 @@
+"""
+Run the bot as several processes, each owning a contiguous slice of shards.
+
+    python cluster.py
+
+KINGSHOT_CLUSTERS processes (default: one per CPU) share KINGSHOT_SHARD_COUNT
+shards (default: one per process). Each process is supervised by its own
+BotWatchdog, connects only its shards and so only schedules its guilds.
+Every CLUSTER_STATUS_SEC the launcher merges the clusters' heartbeats into
+cluster_status.json (read back by the bots for fleet-wide counts) and
+periodically prints a status table. Talk to one cluster with
+`kingshotctl.py --cluster N`, or to all of them with `--cluster all`.
+"""
+
+import json
+import os
+import signal
+import threading
+import time
+
+from watchdog import BotWatchdog, IS_WINDOWS, SCRIPT_DIR
+
+CLUSTER_COUNT = int(os.getenv("KINGSHOT_CLUSTERS", str(os.cpu_count() or 1)))
+SHARD_COUNT = int(os.getenv("KINGSHOT_SHARD_COUNT", str(CLUSTER_COUNT)))
+CLUSTER_STATUS_FILE = os.getenv(
+    "KINGSHOT_CLUSTER_STATUS_FILE", os.path.join(SCRIPT_DIR, "cluster_status.json")
+)
+CLUSTER_STATUS_SEC = 5
+CLUSTER_REPORT_SEC = 300
+# Discord allows one IDENTIFY per 5s (max_concurrency 1); space out launches
+IDENTIFY_INTERVAL_SEC = 5
+
+ROLE_KINDS = ("bear", "arena", "event")
+
+
+def plan_shards(shard_count: int, clusters: int) -> list[list[int]]:
+    """Split shard IDs into `clusters` contiguous, near-equal slices."""
+    clusters = max(1, min(clusters, shard_count))
+    base, extra = divmod(shard_count, clusters)
+    plan, start = [], 0
+    for i in range(clusters):
+        size = base + (1 if i < extra else 0)
+        plan.append(list(range(start, start + size)))
+        start += size
+    return plan
+
+
+class ClusterLauncher:
+    def __init__(self, shard_count: int = SHARD_COUNT, clusters: int = CLUSTER_COUNT):
+        self.shard_count = shard_count
+        self.plan = plan_shards(shard_count, clusters)
+        self.watchdogs = [
+            BotWatchdog(
+                cluster_id=i,
+                env={
+                    "KINGSHOT_CLUSTER_ID": str(i),
+                    "KINGSHOT_SHARD_COUNT": str(shard_count),
+                    "KINGSHOT_SHARD_IDS": ",".join(map(str, shards)),
+                    "KINGSHOT_CLUSTER_STATUS_FILE": CLUSTER_STATUS_FILE,
+                },
+            )
+            for i, shards in enumerate(self.plan)
+        ]
+        self.threads = []
+        self._stop = threading.Event()
+
+    def status(self) -> dict:
+        """Merge every cluster's latest heartbeat and resource sample."""
+        clusters = {}
+        totals = {"guilds": 0, "ready": 0, "clusters": len(self.watchdogs)}
+        totals.update({kind: 0 for kind in ROLE_KINDS})
+        for wd, shards in zip(self.watchdogs, self.plan):
+            proc = wd.bot_process  # may be cleared by its thread mid-restart
+            beat = wd._read_heartbeat() or {}
+            sample = wd.resources[-1] if wd.resources else {}
+            clusters[str(wd.cluster_id)] = {
+                "pid": proc.pid if proc else None,
+                "shards": shards,
+                "ready": bool(beat.get("ready")),
+                "guilds": beat.get("guilds"),
+                "latency": beat.get("latency"),
+                "loop_lag": beat.get("loop_lag"),
+                "heartbeat_age": round(time.time() - beat["ts"], 1) if beat else None,
+                "rss_mb": sample.get("rss_mb"),
+                "cpu_percent": sample.get("cpu_percent"),
+            }
+            totals["guilds"] += beat.get("guilds") or 0
+            totals["ready"] += bool(beat.get("ready"))
+            for kind in ROLE_KINDS:
+                totals[kind] += (beat.get("role_counts") or {}).get(kind, 0)
+        return {"updated": time.time(), "shard_count": self.shard_count, "clusters": clusters, "totals": totals}
+
+    def _write_status(self, status: dict):
+        tmp = CLUSTER_STATUS_FILE + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(status, f, indent=2)
+            os.replace(tmp, CLUSTER_STATUS_FILE)
+        except OSError as e:
+            print(f"❌ Failed to write cluster status: {e}")
+
+    @staticmethod
+    def format_status(status: dict) -> str:
+        t = status["totals"]
+        lines = [
+            f"\n🧩 Fleet: {t['ready']}/{t['clusters']} clusters ready • {status['shard_count']} shards • "
+            f"{t['guilds']} guilds • 🐻 {t['bear']} ⚔️ {t['arena']} 🏆 {t['event']}"
+        ]
+        for cid, c in status["clusters"].items():
+            shards = c["shards"]
+            span = f"{shards[0]}-{shards[-1]}" if len(shards) > 1 else str(shards[0])
+            latency = f"{c['latency'] * 1000:.0f}ms" if c["latency"] is not None else "?"
+            lag = f"{c['loop_lag'] * 1000:.0f}ms" if c["loop_lag"] is not None else "?"
+            rss = f"{c['rss_mb']:.0f}MB" if c["rss_mb"] is not None else "?"
+            lines.append(
+                f"  [{cid}] shards {span:<7} PID {c['pid'] or '-':<7} "
+                f"{'🟢 ready' if c['ready'] else '🟡 starting'} • {c['guilds'] or 0} guilds • "
+                f"latency {latency} • lag {lag} • RSS {rss}"
+            )
+        return "\n".join(lines)
+
+    def run(self):
+        print(
+            f"\n👀 Cluster launcher: {len(self.plan)} process(es) × {self.shard_count} shard(s) "
+            f"({', '.join(f'{i}: {s[0]}-{s[-1]}' for i, s in enumerate(self.plan))})"
+        )
+        if not IS_WINDOWS:
+            signal.signal(signal.SIGTERM, lambda *_: self.shutdown())
+
+        try:
+            for wd, shards in zip(self.watchdogs, self.plan):
+                thread = threading.Thread(
+                    target=wd.supervise, name=f"cluster-{wd.cluster_id}", daemon=True
+                )
+                thread.start()
+                self.threads.append(thread)
+                if self._stop.wait(IDENTIFY_INTERVAL_SEC * len(shards)):
+                    break
+
+            next_report = time.monotonic()
+            while not self._stop.wait(CLUSTER_STATUS_SEC):
+                status = self.status()
+                self._write_status(status)
+                if time.monotonic() >= next_report:
+                    print(self.format_status(status))
+                    next_report = time.monotonic() + CLUSTER_REPORT_SEC
+        except KeyboardInterrupt:
+            self.shutdown()
+
+        # Ask every cluster to close at once, then wait for each
+        for wd in self.watchdogs:
+            proc = wd.bot_process
+            if proc and proc.poll() is None:
+                proc.terminate()
+        for thread in self.threads:
+            thread.join()
+        print("\n👋 Cluster launcher stopped")
+
+    def shutdown(self):
+        self._stop.set()
+        for wd in self.watchdogs:
+            wd.shutdown()
+
+
+if __name__ == "__main__":
+    ClusterLauncher().run()
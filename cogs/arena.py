@@ -9,6 +9,7 @@ from discord.ext import commands
 
 from helpers import save_config, ensure_channel
 from admin_tools import live_feed
+from clock import clock
 from config import (
     gcfg,
     ARENA_CHANNEL,
@@ -18,7 +19,10 @@ from config import (
     EMBED_COLOR_WARNING,
     SCHEDULER_INTERVAL_SEC
 )
+from circuit_breaker import channel_breaker
 from config_helpers import get_arena_ping_settings
+from rest_accounting import tag
+from startup_trace import startup_tracer
 
 def make_arena_embed(status: str, open_ts: int, reset_ts: int) -> discord.Embed:
     if status == "scheduled":
@@ -56,7 +60,10 @@ class ArenaScheduler(commands.Cog):
 
     async def cog_load(self):
         # Now that the bot is fully initialised, start our arena loop
+        self._first_cycle_span = startup_tracer.begin("arena.first_cycle")
         self.task = asyncio.create_task(self._arena_loop())
+        # Don't hold the startup timeline open if the loop dies early
+        self.task.add_done_callback(lambda _: startup_tracer.end(self._first_cycle_span))
 
     def cog_unload(self):
         # Clean up on cog unload or shutdown
@@ -68,7 +75,7 @@ class ArenaScheduler(commands.Cog):
         last_processed_date = None
         
         while not self.bot.is_closed():
-            now = datetime.now(timezone.utc)
+            now = clock.now()
             today = now.date()
             open_h, open_m = map(int, ARENA_OPEN_TIME.split(":"))
             reset_h, reset_m = map(int, ARENA_RESET_TIME.split(":"))
@@ -79,9 +86,10 @@ class ArenaScheduler(commands.Cog):
             if last_processed_date and last_processed_date != today:
                 live_feed.log(
                     "Arena daily transition detected",
-                    f"From {last_processed_date} to {today}",
+                    "From {} to {}",
                     None,
-                    None
+                    None,
+                    last_processed_date, today
                 )
             
             last_processed_date = today
@@ -116,8 +124,9 @@ class ArenaScheduler(commands.Cog):
                 if chan_id:
                     ch = guild.get_channel(int(chan_id))
                 
-                if not ch:
+                if not ch or not channel_breaker.allow(ch):
                     continue
+                tag("arena_edit", guild.id)
 
                 # Get ping settings for this guild
                 ping_settings = get_arena_ping_settings(guild_id)
@@ -144,9 +153,10 @@ class ArenaScheduler(commands.Cog):
                             global_errors += 1
                             live_feed.log(
                                 "Failed to send arena ping",
-                                f"Guild: {guild.name} • Error: {e}",
+                                "Guild: {} • Error: {}",
                                 guild,
-                                ch
+                                ch,
+                                guild.name, e
                             )
 
                 # Cleanup ping after reset
@@ -171,34 +181,39 @@ class ArenaScheduler(commands.Cog):
 
                 self.message_map[int(guild_id)] = msg
 
+            startup_tracer.end(self._first_cycle_span)
+
             # Log global events
             if global_pings_sent > 0:
                 live_feed.log(
                     "Arena ping sent globally",
-                    f"Sent to {global_pings_sent} guild(s)",
+                    "Sent to {} guild(s)",
+                    None,
                     None,
-                    None
+                    global_pings_sent
                 )
             
             if global_pings_cleaned > 0:
                 live_feed.log(
                     "Arena ping cleaned up globally",
-                    f"Cleaned from {global_pings_cleaned} guild(s)",
+                    "Cleaned from {} guild(s)",
                     None,
-                    None
+                    None,
+                    global_pings_cleaned
                 )
             
             if global_errors > 0:
                 live_feed.log(
                     "Arena errors occurred",
-                    f"{global_errors} error(s) across all guilds",
+                    "{} error(s) across all guilds",
+                    None,
                     None,
-                    None
+                    global_errors
                 )
 
             # Sleep until next phase or fallback interval
-            sleep_secs = (target - datetime.now(timezone.utc)).total_seconds()
-            await asyncio.sleep(max(sleep_secs, SCHEDULER_INTERVAL_SEC))
+            sleep_secs = (target - clock.now()).total_seconds()
+            await clock.sleep(max(sleep_secs, SCHEDULER_INTERVAL_SEC))
 
     async def _get_or_fix_message(
         self,
@@ -236,17 +251,19 @@ class ArenaScheduler(commands.Cog):
         except discord.Forbidden:
             live_feed.log(
                 "Failed to send arena embed (no permissions)",
-                f"Guild: {ch.guild.name} • Channel: #{ch.name} • Phase: {phase}",
+                "Guild: {} • Channel: #{} • Phase: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name, ch.name, phase
             )
             return None
         except discord.HTTPException as e:
             live_feed.log(
                 "Failed to send arena embed (HTTP error)",
-                f"Guild: {ch.guild.name} • Channel: #{ch.name} • Phase: {phase} • Error: {e}",
+                "Guild: {} • Channel: #{} • Phase: {} • Error: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name, ch.name, phase, e
             )
             return None
 
@@ -264,9 +281,10 @@ class ArenaScheduler(commands.Cog):
         if not mode:
             live_feed.log(
                 "Arena sync for uninstalled guild",
-                f"Guild: {guild.name} • Skipping",
+                "Guild: {} • Skipping",
                 guild,
-                None
+                None,
+                guild.name
             )
             return
         
@@ -287,16 +305,17 @@ class ArenaScheduler(commands.Cog):
         if not ch:
             live_feed.log(
                 "Failed to get arena channel (manual sync)",
-                f"Guild: {guild.name} • Mode: {mode} • Channel ID: {chan_id}",
+                "Guild: {} • Mode: {} • Channel ID: {}",
                 guild,
-                None
+                None,
+                guild.name, mode, chan_id
             )
             return
 
         # Get ping settings for this guild
         ping_settings = get_arena_ping_settings(str(guild.id))
 
-        now = datetime.now(timezone.utc)
+        now = clock.now()
         today = now.date()
         open_h, open_m = map(int, ARENA_OPEN_TIME.split(":"))
         reset_h, reset_m = map(int, ARENA_RESET_TIME.split(":"))
@@ -327,9 +346,10 @@ class ArenaScheduler(commands.Cog):
                 except (discord.Forbidden, discord.HTTPException) as e:
                     live_feed.log(
                         "Failed to send arena ping (manual sync)",
-                        f"Guild: {guild.name} • Error: {e}",
+                        "Guild: {} • Error: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, e
                     )
 
         if msg and msg.id != arena_cfg.get("message_id"):
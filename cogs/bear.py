@@ -8,7 +8,6 @@ Kingshot Bot – Bear Scheduler
 from __future__ import annotations
 
 import asyncio
-import time
 import uuid
 from datetime import datetime, timezone
 from typing import Dict, Optional, List
@@ -31,7 +30,13 @@ from config import (
     EMOJI_THUMBNAILS,
 )
 from admin_tools import live_feed
+from clock import clock
+from channel_cache import channel_cache
+from circuit_breaker import channel_breaker
 from config_helpers import get_bear_ping_settings
+from rest_accounting import rest_feature, tag
+from startup_trace import startup_tracer
+from warm_state import restored
 
 # ────────────────────────────────────────────────────────────
 # Embed Builders (copied exactly for visual parity)
@@ -122,6 +127,9 @@ class BearEvent:
         self.phase: str = "scheduled"
         self.message_id: Optional[int] = None
         self.task: Optional[asyncio.Task] = None
+        # Last phase whose embed / ping is known to be in the channel
+        self.rendered_phase: Optional[str] = None
+        self.pinged_phase: Optional[str] = None
 
 
 # ────────────────────────────────────────────────────────────
@@ -135,13 +143,30 @@ class NewBearScheduler(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.events: Dict[str, BearEvent] = {}
+        # What was rendered before a clean restart, keyed by bear ID
+        self._warm: dict = restored(type(self).__name__)
         # Load existing bears on startup
-        asyncio.create_task(self._startup_sync())
+        asyncio.create_task(
+            startup_tracer.track("bear._startup_sync", self._startup_sync())
+        )
+
+    def snapshot_state(self) -> dict:
+        """What each bear has already rendered, for warm_state.save_snapshot."""
+        return {
+            ev.id: {
+                "message_id": ev.message_id,
+                "epoch": ev.epoch,
+                "rendered_phase": ev.rendered_phase,
+                "pinged_phase": ev.pinged_phase,
+            }
+            for ev in self.events.values()
+            if ev.message_id
+        }
 
     async def _startup_sync(self):
         """Sync all guilds on startup and start any active bears."""
         await self.bot.wait_until_ready()
-        now = int(time.time())
+        now = int(clock.time())
         
         for guild in self.bot.guilds:
             # Check if this guild is installed and get the mode
@@ -162,9 +187,10 @@ class NewBearScheduler(commands.Cog):
                 if not ch or not log_ch:
                     live_feed.log(
                         "Manual mode: missing bear channels",
-                        f"Guild: {guild.name} • Bear channel: {bear_channel_id} • Log channel: {bear_log_channel_id}",
+                        "Guild: {} • Bear channel: {} • Log channel: {}",
                         guild,
-                        None
+                        None,
+                        guild.name, bear_channel_id, bear_log_channel_id
                     )
                     continue
             else:
@@ -175,9 +201,10 @@ class NewBearScheduler(commands.Cog):
                 if not ch or not log_ch:
                     live_feed.log(
                         "Auto mode: failed to ensure bear channels",
-                        f"Guild: {guild.name}",
+                        "Guild: {}",
                         guild,
-                        None
+                        None,
+                        guild.name
                     )
                     continue
 
@@ -189,31 +216,34 @@ class NewBearScheduler(commands.Cog):
                 # Check if bear is past victory phase
                 if now > bear["epoch"] + BEAR_PHASE_OFFSETS["victory"] * 60:
                     # Send victory message to log if it wasn't sent and we have permissions
-                    if log_ch and log_ch.permissions_for(guild.me).send_messages:
+                    if log_ch and channel_cache.can_send(log_ch):
                         try:
                             await log_ch.send(embed=make_phase_embed("victory", bear["epoch"]))
                         except (discord.Forbidden, discord.HTTPException) as e:
                             live_feed.log(
                                 "Failed to send victory message to log channel",
-                                f"Bear ID: {bear['id']} • Error: {e}",
+                                "Bear ID: {} • Error: {}",
                                 guild,
                                 log_ch,
+                                bear['id'], e,
                             )
                     elif log_ch:
                         live_feed.log(
                             "Skipping victory message (no send permissions)",
-                            f"Bear ID: {bear['id']} • Channel: #{log_ch.name}",
+                            "Bear ID: {} • Channel: #{}",
                             guild,
                             log_ch,
+                            bear['id'], log_ch.name,
                         )
                     
-                    dt = datetime.fromtimestamp(bear["epoch"], tz=timezone.utc)
-                    live_feed.log(
-                        "Cleaned up past bear (offline completion)",
-                        f"Bear ID: {bear['id']} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                        guild,
-                        ch,
-                    )
+                    if live_feed.enabled:
+                        dt = datetime.fromtimestamp(bear["epoch"], tz=timezone.utc)
+                        live_feed.log(
+                            "Cleaned up past bear (offline completion)",
+                            f"Bear ID: {bear['id']} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                            guild,
+                            ch,
+                        )
 
                     # Clean up the bear message if it exists
                     if bear.get("message_id"):
@@ -245,20 +275,27 @@ class NewBearScheduler(commands.Cog):
                 next_entry = min(active_bears, key=lambda b: b["epoch"])
                 ev = BearEvent(guild.id, next_entry["epoch"], next_entry["id"])
                 ev.message_id = next_entry.get("message_id")
+                warm = self._warm.pop(ev.id, None)
+                if warm and warm["epoch"] == ev.epoch and warm["message_id"] == ev.message_id:
+                    # Trust the snapshot; the message is verified on the next phase edit
+                    ev.rendered_phase = warm["rendered_phase"]
+                    ev.pinged_phase = warm["pinged_phase"]
                 self.events[ev.id] = ev
                 # Kick off processing
                 ev.task = asyncio.create_task(self._run_event_cycle(ev))
-                dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
-                live_feed.log(
-                    "Started bear on bot startup",
-                    f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                    guild,
-                    ch,
-                )
+                if live_feed.enabled:
+                    dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
+                    live_feed.log(
+                        "Started bear on bot startup",
+                        f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                        guild,
+                        ch,
+                    )
 
     # ────────────── Core Event Loop ──────────────
 
     async def _run_event_cycle(self, ev: BearEvent):
+        tag("bear_phase", ev.guild_id)
         guild = self.bot.get_guild(ev.guild_id)
         if not guild:
             return
@@ -271,9 +308,10 @@ class NewBearScheduler(commands.Cog):
         if not mode:
             live_feed.log(
                 "Bear event for uninstalled guild",
-                f"Guild: {guild.name} • Bear ID: {ev.id} • Skipping",
+                "Guild: {} • Bear ID: {} • Skipping",
                 guild,
-                None
+                None,
+                guild.name, ev.id
             )
             return
         
@@ -290,9 +328,10 @@ class NewBearScheduler(commands.Cog):
         if not ch:
             live_feed.log(
                 f"Failed to get bear channel (mode: {mode})",
-                f"Guild: {guild.name} • Bear ID: {ev.id} • Channel ID: {bear_channel_id}",
+                "Guild: {} • Bear ID: {} • Channel ID: {}",
                 guild,
-                None
+                None,
+                guild.name, ev.id, bear_channel_id
             )
             return
 
@@ -300,7 +339,7 @@ class NewBearScheduler(commands.Cog):
         ping_settings = get_bear_ping_settings(str(ev.guild_id))
 
         # Determine current phase and ensure we're in the correct phase
-        now = int(time.time())
+        now = int(clock.time())
         current_phase = self._calc_phase(now, ev.epoch, ev.guild_id)
         ev.phase = current_phase
 
@@ -315,25 +354,27 @@ class NewBearScheduler(commands.Cog):
                 bear_log_channel_id = guild_cfg.get("bear", {}).get("log_channel_id")
                 log_ch = guild.get_channel(bear_log_channel_id) if bear_log_channel_id else None
                 
-            if log_ch and log_ch.permissions_for(guild.me).send_messages:
+            if log_ch and channel_cache.can_send(log_ch):
                 try:
                     await log_ch.send(embed=make_phase_embed("victory", ev.epoch))
                 except (discord.Forbidden, discord.HTTPException) as e:
                     live_feed.log(
                         "Failed to send victory message to log channel",
-                        f"Bear ID: {ev.id} • Error: {e}",
+                        "Bear ID: {} • Error: {}",
                         guild,
                         log_ch,
+                        ev.id, e,
                     )
             elif log_ch:
                 live_feed.log(
                     "Skipping victory message (no send permissions)",
-                    f"Bear ID: {ev.id} • Channel: #{log_ch.name}",
+                    "Bear ID: {} • Channel: #{}",
                     guild,
                     log_ch,
+                    ev.id, log_ch.name,
                 )
             # Clean up
-            if ev.message_id:
+            if ev.message_id and channel_breaker.allow(ch):
                 try:
                     msg = await ch.fetch_message(ev.message_id)
                     await msg.delete()
@@ -361,12 +402,16 @@ class NewBearScheduler(commands.Cog):
                 next_ev.task = asyncio.create_task(self._run_event_cycle(next_ev))
             return
 
-        # Sync embed and ping for current phase
-        await self._send_or_edit_embed(ch, ev)
-        await self._cleanup_pings(ch, keep_phase=ev.phase)
+        # Sync embed and ping for current phase, unless a warm restart
+        # snapshot shows they are already in the channel
+        if ev.rendered_phase != ev.phase:
+            await self._send_or_edit_embed(ch, ev)
+            await self._cleanup_pings(ch, keep_phase=ev.phase)
 
         # Only send ping if phase is enabled in settings
-        if ev.phase == "incoming" and ping_settings.incoming_enabled:
+        if ev.pinged_phase == ev.phase:
+            pass  # sent before the restart
+        elif ev.phase == "incoming" and ping_settings.incoming_enabled:
             await self._send_ping(ch, ev, ev.phase)
         elif ev.phase == "pre_attack" and ping_settings.pre_attack_enabled:
             await self._send_ping(ch, ev, ev.phase)
@@ -375,9 +420,10 @@ class NewBearScheduler(commands.Cog):
         else:
             live_feed.log(
                 f"Skipping {ev.phase} ping (disabled in settings)",
-                f"Bear ID: {ev.id}",
+                "Bear ID: {}",
                 guild,
                 ch,
+                ev.id,
             )
 
         # Calculate time until next phase
@@ -396,9 +442,9 @@ class NewBearScheduler(commands.Cog):
 
         delay = target - now
         if delay > 0:
-            await asyncio.sleep(delay)
+            await clock.sleep(delay)
             # Recalculate phase after sleep to ensure accuracy
-            now = int(time.time())
+            now = int(clock.time())
             new_phase = self._calc_phase(now, ev.epoch, ev.guild_id)
             if new_phase != current_phase:
                 ev.phase = new_phase
@@ -415,9 +461,10 @@ class NewBearScheduler(commands.Cog):
                 else:
                     live_feed.log(
                         f"Skipping {new_phase} ping (disabled in settings)",
-                        f"Bear ID: {ev.id}",
+                        "Bear ID: {}",
                         guild,
                         ch,
+                        ev.id,
                     )
 
                 # If we've reached victory, handle cleanup
@@ -430,24 +477,26 @@ class NewBearScheduler(commands.Cog):
                         bear_log_channel_id = guild_cfg.get("bear", {}).get("log_channel_id")
                         log_ch = guild.get_channel(bear_log_channel_id) if bear_log_channel_id else None
                         
-                    if log_ch and log_ch.permissions_for(guild.me).send_messages:
+                    if log_ch and channel_cache.can_send(log_ch):
                         try:
                             await log_ch.send(embed=make_phase_embed("victory", ev.epoch))
                         except (discord.Forbidden, discord.HTTPException) as e:
                             live_feed.log(
                                 "Failed to send victory message to log channel",
-                                f"Bear ID: {ev.id} • Error: {e}",
+                                "Bear ID: {} • Error: {}",
                                 guild,
                                 log_ch,
+                                ev.id, e,
                             )
                     elif log_ch:
                         live_feed.log(
                             "Skipping victory message (no send permissions)",
-                            f"Bear ID: {ev.id} • Channel: #{log_ch.name}",
+                            "Bear ID: {} • Channel: #{}",
                             guild,
                             log_ch,
+                            ev.id, log_ch.name,
                         )
-                    if ev.message_id:
+                    if ev.message_id and channel_breaker.allow(ch):
                         try:
                             msg = await ch.fetch_message(ev.message_id)
                             await msg.delete()
@@ -489,11 +538,11 @@ class NewBearScheduler(commands.Cog):
                     target = ev.epoch - (ping_settings.pre_attack_offset * 60)
                 else:
                     target = ev.epoch + BEAR_PHASE_OFFSETS[phase] * 60
-            delay = target - int(time.time())
+            delay = target - int(clock.time())
             if delay > 0:
-                await asyncio.sleep(delay)
+                await clock.sleep(delay)
                 # Recalculate phase after sleep
-                now = int(time.time())
+                now = int(clock.time())
                 new_phase = self._calc_phase(now, ev.epoch, ev.guild_id)
                 if new_phase != ev.phase:
                     ev.phase = new_phase
@@ -510,9 +559,10 @@ class NewBearScheduler(commands.Cog):
                     else:
                         live_feed.log(
                             f"Skipping {new_phase} ping (disabled in settings)",
-                            f"Bear ID: {ev.id}",
+                            "Bear ID: {}",
                             guild,
                             ch,
+                            ev.id,
                         )
 
                     if new_phase == "victory":
@@ -524,24 +574,26 @@ class NewBearScheduler(commands.Cog):
                             bear_log_channel_id = guild_cfg.get("bear", {}).get("log_channel_id")
                             log_ch = guild.get_channel(bear_log_channel_id) if bear_log_channel_id else None
                             
-                        if log_ch and log_ch.permissions_for(guild.me).send_messages:
+                        if log_ch and channel_cache.can_send(log_ch):
                             try:
                                 await log_ch.send(embed=make_phase_embed("victory", ev.epoch))
                             except (discord.Forbidden, discord.HTTPException) as e:
                                 live_feed.log(
                                     "Failed to send victory message to log channel",
-                                    f"Bear ID: {ev.id} • Error: {e}",
+                                    "Bear ID: {} • Error: {}",
                                     guild,
                                     log_ch,
+                                    ev.id, e,
                                 )
                         elif log_ch:
                             live_feed.log(
                                 "Skipping victory message (no send permissions)",
-                                f"Bear ID: {ev.id} • Channel: #{log_ch.name}",
+                                "Bear ID: {} • Channel: #{}",
                                 guild,
                                 log_ch,
+                                ev.id, log_ch.name,
                             )
-                        if ev.message_id:
+                        if ev.message_id and channel_breaker.allow(ch):
                             try:
                                 msg = await ch.fetch_message(ev.message_id)
                                 await msg.delete()
@@ -593,38 +645,49 @@ class NewBearScheduler(commands.Cog):
         return "scheduled"
 
     async def _send_or_edit_embed(self, ch: discord.TextChannel, ev: BearEvent):
+        if not channel_breaker.allow(ch):
+            return
         embed = make_phase_embed(ev.phase, ev.epoch)
         if ev.message_id:
             try:
                 msg = await ch.fetch_message(ev.message_id)
                 await msg.edit(embed=embed)
-                dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
-                live_feed.log(
-                    f"Updated bear phase to {ev.phase}",
-                    f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                    ch.guild,
-                    ch,
-                )
+                ev.rendered_phase = ev.phase
+                if live_feed.enabled:
+                    dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
+                    live_feed.log(
+                        f"Updated bear phase to {ev.phase}",
+                        f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                        ch.guild,
+                        ch,
+                        entity_id=ev.id,
+                        phase=ev.phase,
+                    )
                 return
             except (discord.NotFound, discord.Forbidden):
                 ev.message_id = None
                 live_feed.log(
                     "Failed to update bear embed",
-                    f"Bear ID: {ev.id} • Message not found",
+                    "Bear ID: {} • Message not found",
                     ch.guild,
                     ch,
+                    ev.id,
                 )
 
         # Send new embed and persist its ID
         msg = await ch.send(embed=embed)
         ev.message_id = msg.id
-        dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
-        live_feed.log(
-            f"Created new bear {ev.phase} embed",
-            f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-            ch.guild,
-            ch,
-        )
+        ev.rendered_phase = ev.phase
+        if live_feed.enabled:
+            dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
+            live_feed.log(
+                f"Created new bear {ev.phase} embed",
+                f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                ch.guild,
+                ch,
+                entity_id=ev.id,
+                phase=ev.phase,
+            )
         # update JSON so we can re-fetch/edit on next startup
         for b in gcfg[str(ch.guild.id)]["bears"]:
             if b["id"] == ev.id:
@@ -647,19 +710,22 @@ class NewBearScheduler(commands.Cog):
         }
         # we only want to delete phrases *not* matching keep_phase
         to_delete = [txt for phase, txt in patterns_map.items() if phase != keep_phase]
+        if not channel_breaker.allow(ch):
+            return
 
-        async for msg in ch.history(limit=25):
-            if msg.author.id != self.bot.user.id:
-                continue
-            content = msg.content.lower()
-            if any(core in content for core in to_delete):
-                try:
-                    await msg.delete()
-                except (discord.NotFound, discord.Forbidden):
-                    pass
+        with rest_feature("bear_cleanup", ch.guild.id):
+            async for msg in ch.history(limit=25):
+                if msg.author.id != self.bot.user.id:
+                    continue
+                content = msg.content.lower()
+                if any(core in content for core in to_delete):
+                    try:
+                        await msg.delete()
+                    except (discord.NotFound, discord.Forbidden):
+                        pass
 
     async def _send_ping(self, ch: discord.TextChannel, ev: BearEvent, phase: str):
-        if phase not in ("incoming", "pre_attack", "attack"):
+        if phase not in ("incoming", "pre_attack", "attack") or not channel_breaker.allow(ch):
             return
 
         # ——— don't resend if this phase's ping already exists ———
@@ -671,6 +737,7 @@ class NewBearScheduler(commands.Cog):
         core = core_map[phase]
         async for msg in ch.history(limit=25):
             if msg.author.id == self.bot.user.id and core in msg.content.lower():
+                ev.pinged_phase = phase
                 return
 
         # Determine role mention
@@ -688,13 +755,17 @@ class NewBearScheduler(commands.Cog):
         }
         # Send ping for this phase
         await ch.send(texts[phase])
-        dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
-        live_feed.log(
-            f"Sent {phase} ping",
-            f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-            ch.guild,
-            ch,
-        )
+        ev.pinged_phase = phase
+        if live_feed.enabled:
+            dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
+            live_feed.log(
+                f"Sent {phase} ping",
+                f"Bear ID: {ev.id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                ch.guild,
+                ch,
+                entity_id=ev.id,
+                phase=phase,
+            )
 
     # ───────────── Slash Commands ─────────────
 
@@ -722,7 +793,7 @@ class NewBearScheduler(commands.Cog):
                 "❌ Invalid time format", ephemeral=True
             )
 
-        now = int(time.time())
+        now = int(clock.time())
         if epoch <= now:
             return await interaction.followup.send(
                 "❌ Time must be in the future", ephemeral=True
@@ -749,13 +820,14 @@ class NewBearScheduler(commands.Cog):
         bears.sort(key=lambda b: b["epoch"])
         save_config(gcfg)
 
-        dt = datetime.fromtimestamp(epoch, tz=timezone.utc)
-        live_feed.log(
-            "Scheduled new bear",
-            f"Bear ID: {new_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
-            interaction.guild,
-            interaction.channel,
-        )
+        if live_feed.enabled:
+            dt = datetime.fromtimestamp(epoch, tz=timezone.utc)
+            live_feed.log(
+                "Scheduled new bear",
+                f"Bear ID: {new_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
+                interaction.guild,
+                interaction.channel,
+            )
 
         # Find the current active bear event for this guild
         active_ev = None
@@ -780,9 +852,10 @@ class NewBearScheduler(commands.Cog):
                 if not mode:
                     live_feed.log(
                         "Bear command for uninstalled guild",
-                        f"Guild: {interaction.guild.name} • Skipping",
+                        "Guild: {} • Skipping",
                         interaction.guild,
-                        interaction.channel
+                        interaction.channel,
+                        interaction.guild.name
                     )
                     return await interaction.followup.send(
                         "❌ Bot not installed in this server.", ephemeral=True
@@ -808,9 +881,10 @@ class NewBearScheduler(commands.Cog):
                 self.events.pop(active_ev.id, None)
                 live_feed.log(
                     "Cancelled active bear for new schedule",
-                    f"Old Bear ID: {active_ev.id} • New Bear ID: {new_id}",
+                    "Old Bear ID: {} • New Bear ID: {}",
                     interaction.guild,
                     interaction.channel,
+                    active_ev.id, new_id,
                 )
             # Start the new bear event cycle
             ev = BearEvent(interaction.guild.id, epoch, new_id)
@@ -852,13 +926,14 @@ class NewBearScheduler(commands.Cog):
             # Bear exists in config but not active - just remove from config
             cfg["bears"] = [b for b in bears if b["id"] != bear_id]
             save_config(gcfg)
-            dt = datetime.fromtimestamp(bear_config["epoch"], tz=timezone.utc)
-            live_feed.log(
-                "Removed queued bear from schedule",
-                f"Bear ID: {bear_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
-                interaction.guild,
-                interaction.channel,
-            )
+            if live_feed.enabled:
+                dt = datetime.fromtimestamp(bear_config["epoch"], tz=timezone.utc)
+                live_feed.log(
+                    "Removed queued bear from schedule",
+                    f"Bear ID: {bear_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
+                    interaction.guild,
+                    interaction.channel,
+                )
             return await interaction.followup.send(
                 "🗑️ Removed bear from schedule", ephemeral=True
             )
@@ -873,9 +948,10 @@ class NewBearScheduler(commands.Cog):
             except Exception as e:
                 live_feed.log(
                     "Error cancelling bear task",
-                    f"Bear ID: {bear_id} • Error: {str(e)}",
+                    "Bear ID: {} • Error: {}",
                     interaction.guild,
                     interaction.channel,
+                    bear_id, e,
                 )
 
         # Cleanup embed & pings
@@ -885,9 +961,10 @@ class NewBearScheduler(commands.Cog):
         if not mode:
             live_feed.log(
                 "Bear command for uninstalled guild",
-                f"Guild: {interaction.guild.name} • Skipping",
+                "Guild: {} • Skipping",
                 interaction.guild,
-                interaction.channel
+                interaction.channel,
+                interaction.guild.name
             )
             return await interaction.followup.send(
                 "❌ Bot not installed in this server.", ephemeral=True
@@ -908,23 +985,26 @@ class NewBearScheduler(commands.Cog):
             except discord.NotFound:
                 live_feed.log(
                     "Bear message already deleted",
-                    f"Bear ID: {bear_id}",
+                    "Bear ID: {}",
                     interaction.guild,
                     interaction.channel,
+                    bear_id,
                 )
             except discord.Forbidden:
                 live_feed.log(
                     "No permission to delete bear message",
-                    f"Bear ID: {bear_id}",
+                    "Bear ID: {}",
                     interaction.guild,
                     interaction.channel,
+                    bear_id,
                 )
             except Exception as e:
                 live_feed.log(
                     "Error deleting bear message",
-                    f"Bear ID: {bear_id} • Error: {str(e)}",
+                    "Bear ID: {} • Error: {}",
                     interaction.guild,
                     interaction.channel,
+                    bear_id, e,
                 )
 
         if ch:
@@ -935,13 +1015,14 @@ class NewBearScheduler(commands.Cog):
         cfg["bears"] = [b for b in bears if b["id"] != bear_id]
         save_config(gcfg)
 
-        dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
-        live_feed.log(
-            "Cancelled active bear",
-            f"Bear ID: {bear_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
-            interaction.guild,
-            interaction.channel,
-        )
+        if live_feed.enabled:
+            dt = datetime.fromtimestamp(ev.epoch, tz=timezone.utc)
+            live_feed.log(
+                "Cancelled active bear",
+                f"Bear ID: {bear_id} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')} • By: {interaction.user}",
+                interaction.guild,
+                interaction.channel,
+            )
 
         # Start the next soonest bear if any are queued
         remaining_bears = [b for b in cfg.get("bears", []) if b["epoch"] > ev.epoch]
@@ -954,13 +1035,14 @@ class NewBearScheduler(commands.Cog):
                 )
                 self.events[next_ev.id] = next_ev
                 next_ev.task = asyncio.create_task(self._run_event_cycle(next_ev))
-                dt = datetime.fromtimestamp(next_bear["epoch"], tz=timezone.utc)
-                live_feed.log(
-                    "Started next queued bear",
-                    f"Bear ID: {next_bear['id']} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-                    interaction.guild,
-                    interaction.channel,
-                )
+                if live_feed.enabled:
+                    dt = datetime.fromtimestamp(next_bear["epoch"], tz=timezone.utc)
+                    live_feed.log(
+                        "Started next queued bear",
+                        f"Bear ID: {next_bear['id']} • Time: {dt.strftime('%Y-%m-%d %H:%M:%S UTC')}",
+                        interaction.guild,
+                        interaction.channel,
+                    )
 
         await interaction.followup.send("🗑️ Bear cancelled", ephemeral=True)
 
@@ -973,7 +1055,7 @@ class NewBearScheduler(commands.Cog):
                 "📭 No bears scheduled", ephemeral=True
             )
 
-        now = int(time.time())
+        now = int(clock.time())
         # sort by scheduled time
         all_bears.sort(key=lambda b: b["epoch"])
 
@@ -6,7 +6,7 @@ from discord.ext import commands
 from discord import app_commands, ui, Interaction, Embed
 
 from config import EMBED_COLOR_PRIMARY
-from helpers import ensure_channel, update_guild_count, update_role_counts
+from helpers import ensure_channel, update_guild_count, update_role_counts, role_counter
 from admin_tools import live_feed
 
 log = logging.getLogger("kingshot")
@@ -23,10 +23,12 @@ class Core(commands.Cog):
         log.info(f"Joined guild: {guild.name} ({guild.id})")
         live_feed.log(
             "Bot joined new guild",
-            f"Guild: {guild.name} • Members: {guild.member_count}",
+            "Guild: {} • Members: {}",
             guild,
             None,
+            guild.name, guild.member_count,
         )
+        role_counter.recount_guild(guild)
         # Send a welcome embed in the system channel or first writable channel
         dest = guild.system_channel or next(
             (
@@ -39,9 +41,10 @@ class Core(commands.Cog):
         if not dest:
             live_feed.log(
                 "Failed to send welcome message",
-                f"Guild: {guild.name} • Error: No suitable channel found",
+                "Guild: {} • Error: No suitable channel found",
                 guild,
                 None,
+                guild.name,
             )
             await update_guild_count(self.bot)
             await update_role_counts(self.bot)
@@ -67,9 +70,10 @@ class Core(commands.Cog):
         await dest.send(embed=embed)
         live_feed.log(
             "Sent welcome message",
-            f"Guild: {guild.name} • Channel: #{dest.name}",
+            "Guild: {} • Channel: #{}",
             guild,
             dest,
+            guild.name, dest.name,
         )
         await update_guild_count(self.bot)
         await update_role_counts(self.bot)
@@ -79,13 +83,35 @@ class Core(commands.Cog):
         log.info(f"Left guild: {guild.name} ({guild.id})")
         live_feed.log(
             "Bot removed from guild",
-            f"Guild: {guild.name}",
+            "Guild: {}",
             guild,
             None,
+            guild.name,
         )
+        role_counter.forget_guild(guild.id)
         await update_guild_count(self.bot)
         await update_role_counts(self.bot)
 
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """Keep role watcher counts in sync with role grants and removals."""
+        before_ids = {r.id for r in before.roles}
+        after_ids = {r.id for r in after.roles}
+        if before_ids == after_ids:
+            return
+        for role_id in after_ids - before_ids:
+            role_counter.add(after.guild.id, role_id, after.id)
+        for role_id in before_ids - after_ids:
+            role_counter.remove(after.guild.id, role_id, after.id)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        role_counter.member_left(payload.guild_id, payload.user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        role_counter.role_deleted(role.guild.id, role.id)
+
     @app_commands.command(
         name="synccommands", description="🔧 Force sync of slash commands (Admins only)"
     )
@@ -95,16 +121,18 @@ class Core(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         live_feed.log(
             "Syncing commands",
-            f"Guild: {interaction.guild.name} • By: {interaction.user}",
+            "Guild: {} • By: {}",
             interaction.guild,
             interaction.channel,
+            interaction.guild.name, interaction.user,
         )
         synced = await self.bot.tree.sync(guild=interaction.guild)
         live_feed.log(
             "Commands synced",
-            f"Guild: {interaction.guild.name} • Count: {len(synced)}",
+            "Guild: {} • Count: {}",
             interaction.guild,
             interaction.channel,
+            interaction.guild.name, len(synced),
         )
         await interaction.followup.send(
             f"✅ Synced {len(synced)} commands to this server.", ephemeral=True
@@ -122,9 +150,10 @@ class General(commands.Cog):
         """Show help information."""
         live_feed.log(
             "Help command used",
-            f"Guild: {interaction.guild.name} • By: {interaction.user}",
+            "Guild: {} • By: {}",
             interaction.guild,
             interaction.channel,
+            interaction.guild.name, interaction.user,
         )
         embed = Embed(
             title="🤴 Kingshot Bot • Help",
@@ -176,9 +205,10 @@ class General(commands.Cog):
         if not isinstance(ch, discord.TextChannel):
             live_feed.log(
                 "Purge failed",
-                f"Guild: {interaction.guild.name} • Error: Invalid channel type",
+                "Guild: {} • Error: Invalid channel type",
                 interaction.guild,
                 interaction.channel,
+                interaction.guild.name,
             )
             return await interaction.followup.send(
                 "❌ Could not determine the channel.", ephemeral=True
@@ -186,9 +216,10 @@ class General(commands.Cog):
 
         live_feed.log(
             "Starting message purge",
-            f"Guild: {interaction.guild.name} • Channel: #{ch.name} • Amount: {amount} • By: {interaction.user}",
+            "Guild: {} • Channel: #{} • Amount: {} • By: {}",
             interaction.guild,
             ch,
+            interaction.guild.name, ch.name, amount, interaction.user,
         )
 
         # Clamp between 1 and 100
@@ -200,9 +231,10 @@ class General(commands.Cog):
 
         live_feed.log(
             "Purge complete",
-            f"Guild: {interaction.guild.name} • Channel: #{ch.name} • Deleted: {len(deleted)} • Kept: {kept}",
+            "Guild: {} • Channel: #{} • Deleted: {} • Kept: {}",
             interaction.guild,
             ch,
+            interaction.guild.name, ch.name, len(deleted), kept,
         )
 
         await interaction.followup.send(
@@ -235,9 +267,10 @@ class EmbedModal(ui.Modal, title="Create an Embed"):
     async def on_submit(self, interaction: Interaction):
         live_feed.log(
             "Embed created",
-            f"Guild: {interaction.guild.name} • By: {interaction.user} • Title: {self.title_input.value[:30]}...",
+            "Guild: {} • By: {} • Title: {}...",
             interaction.guild,
             interaction.channel,
+            interaction.guild.name, interaction.user, self.title_input.value[:30],
         )
         embed = Embed(
             title=self.title_input.value,
@@ -269,9 +302,10 @@ class Utility(commands.Cog):
         """Show the Embed creation modal."""
         live_feed.log(
             "Embed creation started",
-            f"Guild: {interaction.guild.name} • By: {interaction.user}",
+            "Guild: {} • By: {}",
             interaction.guild,
             interaction.channel,
+            interaction.guild.name, interaction.user,
         )
         await interaction.response.send_modal(EmbedModal(self.bot))
 
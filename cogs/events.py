@@ -1,7 +1,6 @@
 # cogs/events.py
 
 import asyncio
-import time
 import uuid
 from datetime import datetime, timezone
 import re
@@ -14,8 +13,15 @@ from discord.ext import commands
 from helpers import save_config, ensure_channel
 from config import gcfg, EVENT_CHANNEL, EMBED_COLOR_EVENT, EMOJI_THUMBNAILS_EVENTS
 from admin_tools import live_feed
+from clock import clock
+from channel_cache import channel_cache
+from circuit_breaker import channel_breaker
 from config_helpers import get_event_ping_settings
-from welcome_embeds import make_event_welcome_embed, WELCOME_EMBED_VERSION
+from rest_accounting import tag
+from welcome_embeds import make_event_welcome_embed
+from welcome_migration import mark_migrated
+from startup_trace import startup_tracer
+from warm_state import restored
 
 EVENT_TEMPLATES = {
     "hall_of_governors": {
@@ -104,6 +110,9 @@ class EventEntry:
         self.message: discord.Message | None = None
         self.message_id: int | None = None
         self.task: asyncio.Task | None = None
+        # Per-event ping records, shared with the persisted config entry:
+        # {"reminder_id", "reminder_sent_at", "final_call_id", "final_call_sent_at"}
+        self.notifications: dict = {}
 
     def make_embed(self) -> discord.Embed:
         embed = discord.Embed(
@@ -296,8 +305,14 @@ class EventScheduler(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.events: dict[str, EventEntry] = {}
+        # guild ID -> welcome message ID seen or sent since boot
+        self.welcome_ids: dict[int, int] = {}
+        # Message IDs verified before a clean restart; trusted without a fetch
+        self._warm: dict = restored(type(self).__name__)
         # Kick off loading existing events
-        self._init_task = asyncio.create_task(self._initialize())
+        self._init_task = asyncio.create_task(
+            startup_tracer.track("events._initialize", self._initialize())
+        )
 
     def cog_unload(self):
         # Cancel startup loader
@@ -307,20 +322,34 @@ class EventScheduler(commands.Cog):
             if ev.task:
                 ev.task.cancel()
 
+    def snapshot_state(self) -> dict:
+        """Welcome and event message IDs known to exist, for warm_state.save_snapshot."""
+        return {
+            "welcome": {str(gid): mid for gid, mid in self.welcome_ids.items()},
+            "messages": {ev.id: ev.message_id for ev in self.events.values() if ev.message_id},
+        }
+
     async def _initialize(self):
         await self.bot.wait_until_ready()
-        now = int(time.time())
+        warm_welcome = self._warm.get("welcome", {})
+        warm_messages = self._warm.get("messages", {})
+        now = int(clock.time())
 
         for guild in self.bot.guilds:
             guild_cfg = gcfg.get(str(guild.id), {})
             if guild_cfg.get("mode") != "auto":
                 continue
+            # Startup checks, the welcome existence check included, are
+            # charged with the reminders; the welcome_migration budget
+            # would throttle this serial loop
+            tag("event_reminder", guild.id)
 
             live_feed.log(
                 "Initializing events",
-                f"Guild: {guild.name}",
+                "Guild: {}",
                 guild,
-                None
+                None,
+                guild.name
             )
 
             # 1) Prune expired events
@@ -330,9 +359,10 @@ class EventScheduler(commands.Cog):
             if expired:
                 live_feed.log(
                     "Pruned expired events",
-                    f"Guild: {guild.name} • Count: {len(expired)}",
+                    "Guild: {} • Count: {}",
                     guild,
-                    None
+                    None,
+                    guild.name, len(expired)
                 )
             save_config(gcfg)
 
@@ -345,93 +375,104 @@ class EventScheduler(commands.Cog):
                 ch = guild.get_channel(chan_id)
             else:
                 # Only try to find by name if we have a channel ID, don't create new channels
-                ch = discord.utils.get(guild.text_channels, name=EVENT_CHANNEL)
+                ch = channel_cache.by_name(guild, EVENT_CHANNEL)
                 if not ch:
                     live_feed.log(
                         "Missing event channel",
-                        f"Guild: {guild.name} • Mode: {guild_cfg.get('mode')} • Channel ID: {chan_id}",
+                        "Guild: {} • Mode: {} • Channel ID: {}",
                         guild,
-                        None
+                        None,
+                        guild.name, guild_cfg.get('mode'), chan_id
                     )
                     continue
 
-            # ─── Ensure welcome embed exists and is up to date ─────────────────────
+            # ─── Ensure welcome embed exists ───────────────────────────────────────
             evt_cfg = guild_cfg.setdefault("event", {})
             welcome_id = evt_cfg.get("message_id")
             welcome_msg = None
             
             live_feed.log(
                 "Checking event welcome message",
-                f"Guild: {guild.name} • Channel: #{ch.name} • Saved ID: {welcome_id}",
+                "Guild: {} • Channel: #{} • Saved ID: {}",
                 guild,
-                ch
+                ch,
+                guild.name, ch.name, welcome_id
             )
             
-            # Check if welcome embed needs updating
-            current_version = guild_cfg.get("welcome_embed_version", "1.0")
-            needs_update = current_version != WELCOME_EMBED_VERSION
-            
-            if welcome_id:
+            if welcome_id and warm_welcome.get(str(guild.id)) == welcome_id:
+                # Unchanged since the last clean shutdown; skip the fetch
+                welcome_msg = ch.get_partial_message(welcome_id)
+                live_feed.log(
+                    "Trusted welcome message from warm restart",
+                    "Guild: {} • Channel: #{} • Message ID: {}",
+                    guild,
+                    ch,
+                    guild.name, ch.name, welcome_id
+                )
+            elif welcome_id:
+                # Only checks the message still exists; outdated embeds are
+                # left to the background welcome migration
                 try:
                     welcome_msg = await ch.fetch_message(welcome_id)
                     live_feed.log(
                         "Successfully fetched existing welcome message",
-                        f"Guild: {guild.name} • Channel: #{ch.name} • Message ID: {welcome_id}",
+                        "Guild: {} • Channel: #{} • Message ID: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, ch.name, welcome_id
                     )
-                    # Update the embed if version is outdated
-                    if needs_update:
-                        new_embed = make_event_welcome_embed(guild.id)
-                        await welcome_msg.edit(embed=new_embed)
-                        guild_cfg["welcome_embed_version"] = WELCOME_EMBED_VERSION
-                        save_config(gcfg)
-                        live_feed.log(
-                            "Updated event welcome embed",
-                            f"Guild: {guild.name} • Channel: #{ch.name} • Version: {current_version} → {WELCOME_EMBED_VERSION}",
-                            guild,
-                            ch
-                        )
                 except (discord.NotFound, discord.Forbidden) as e:
                     welcome_msg = None
                     live_feed.log(
                         "Failed to fetch event welcome message",
-                        f"Guild: {guild.name} • Channel: #{ch.name} • Message ID: {welcome_id} • Error: {type(e).__name__}",
+                        "Guild: {} • Channel: #{} • Message ID: {} • Error: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, ch.name, welcome_id, type(e).__name__
                     )
             else:
                 live_feed.log(
                     "No saved welcome message ID found",
-                    f"Guild: {guild.name} • Channel: #{ch.name}",
+                    "Guild: {} • Channel: #{}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ch.name
                 )
             
             if not welcome_msg:
                 live_feed.log(
                     "Creating new welcome message",
-                    f"Guild: {guild.name} • Channel: #{ch.name} • Reason: {'No saved ID' if not welcome_id else 'Fetch failed'}",
+                    "Guild: {} • Channel: #{} • Reason: {}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ch.name, 'No saved ID' if not welcome_id else 'Fetch failed'
                 )
                 msg = await ch.send(embed=make_event_welcome_embed(guild.id))
                 evt_cfg["message_id"] = msg.id
-                guild_cfg["welcome_embed_version"] = WELCOME_EMBED_VERSION
+                mark_migrated(guild_cfg, "event")
                 save_config(gcfg)
                 live_feed.log(
                     "Created welcome message",
-                    f"Guild: {guild.name} • Channel: #{ch.name} • New ID: {msg.id}",
+                    "Guild: {} • Channel: #{} • New ID: {}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ch.name, msg.id
                 )
             else:
                 live_feed.log(
                     "Using existing welcome message",
-                    f"Guild: {guild.name} • Channel: #{ch.name} • Message ID: {welcome_id}",
+                    "Guild: {} • Channel: #{} • Message ID: {}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ch.name, welcome_id
                 )
+            self.welcome_ids[guild.id] = evt_cfg["message_id"]
+
+            # Drop the old guild-wide reminder slot; its owner is unknown
+            legacy_id = evt_cfg.pop("reminder_id", None)
+            if legacy_id:
+                await self._delete_messages(ch, [legacy_id])
+                save_config(gcfg)
 
             # 3) Reconstruct and schedule each event
             for entry in ev_list:
@@ -445,35 +486,51 @@ class EventScheduler(commands.Cog):
                     entry.get("thumbnail", ""),
                     entry.get("template_key")
                 )
+                ev.notifications = entry.setdefault("notifications", {})
                 # Try to re-fetch existing message
                 msg_id = entry.get("message_id")
-                if msg_id:
+                if msg_id and warm_messages.get(ev.id) == msg_id:
+                    # Verified before a clean restart; a deleted message is
+                    # caught by the NotFound fallback when the embed is edited
+                    ev.message = ch.get_partial_message(msg_id)
+                    ev.message_id = msg_id
+                    live_feed.log(
+                        "Trusted event message from warm restart",
+                        "Guild: {} • Event: {} • ID: {}",
+                        guild,
+                        ch,
+                        guild.name, ev.title, ev.id
+                    )
+                elif msg_id:
                     try:
                         ev.message = await ch.fetch_message(msg_id)
                         ev.message_id = msg_id
                         live_feed.log(
                             "Restored event message",
-                            f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                            "Guild: {} • Event: {} • ID: {}",
                             guild,
-                            ch
+                            ch,
+                            guild.name, ev.title, ev.id
                         )
                     except (discord.NotFound, discord.Forbidden):
                         ev.message = None
                         ev.message_id = None
                         live_feed.log(
                             "Failed to restore event message",
-                            f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                            "Guild: {} • Event: {} • ID: {}",
                             guild,
-                            ch
+                            ch,
+                            guild.name, ev.title, ev.id
                         )
 
                 self.events[ev.id] = ev
                 ev.task = asyncio.create_task(self._run_event_cycle(guild, ev, ch))
                 live_feed.log(
                     "Scheduled event",
-                    f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id} • Start: <t:{ev.start_epoch}:F>",
+                    "Guild: {} • Event: {} • ID: {} • Start: <t:{}:F>",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ev.title, ev.id, ev.start_epoch
                 )
 
     async def _send_event_ping(self, ch: discord.TextChannel, guild_cfg: dict, minutes_left: int) -> int:
@@ -484,19 +541,23 @@ class EventScheduler(commands.Cog):
         if minutes_left == 60 and not ping_settings.reminder_enabled:
             live_feed.log(
                 "Skipping 1-hour event reminder (disabled in settings)",
-                f"Guild: {ch.guild.name}",
+                "Guild: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name
             )
             return None
         if minutes_left == 10 and not ping_settings.final_call_enabled:
             live_feed.log(
                 "Skipping 10-minute event reminder (disabled in settings)",
-                f"Guild: {ch.guild.name}",
+                "Guild: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name
             )
             return None
+        if not channel_breaker.allow(ch):
+            return None
 
         role_id = guild_cfg.get("event", {}).get("role_id")
         role_mention = "@here"
@@ -508,28 +569,82 @@ class EventScheduler(commands.Cog):
             msg = await ch.send(f"{role_mention} 🏆 Get ready for the event!")
             live_feed.log(
                 "Sent 1-hour event reminder",
-                f"Guild: {ch.guild.name} • Channel: #{ch.name} • Role: {role.name if role else '@here'}",
+                "Guild: {} • Channel: #{} • Role: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name, ch.name, role.name if role else '@here'
             )
         else:
             msg = await ch.send(f"{role_mention} 🏆 The event is starting soon!")
             live_feed.log(
                 "Sent 10-minute event reminder",
-                f"Guild: {ch.guild.name} • Channel: #{ch.name} • Role: {role.name if role else '@here'}",
+                "Guild: {} • Channel: #{} • Role: {}",
                 ch.guild,
-                ch
+                ch,
+                ch.guild.name, ch.name, role.name if role else '@here'
             )
         return msg.id
 
+    def _record_notification(self, ev: EventEntry, kind: str, msg_id: int) -> None:
+        """Persist a sent ping ("reminder" or "final_call") on the event's own entry."""
+        ev.notifications[f"{kind}_id"] = msg_id
+        ev.notifications[f"{kind}_sent_at"] = int(clock.time())
+        save_config(gcfg)
+
+    async def _clear_notifications(
+        self,
+        ch: discord.TextChannel,
+        ev: EventEntry,
+        kinds: tuple = ("reminder", "final_call"),
+        extra_ids: list | None = None
+    ) -> bool:
+        """
+        Delete this event's recorded pings (plus any extra message IDs) in a
+        single batch. Sent timestamps are kept so pings aren't resent after a
+        restart. Returns True if any recorded ping was removed.
+        """
+        ping_ids = [
+            ev.notifications.pop(f"{kind}_id")
+            for kind in kinds
+            if ev.notifications.get(f"{kind}_id")
+        ]
+        ids = ping_ids + [i for i in (extra_ids or []) if i]
+        if not ids:
+            return False
+        await self._delete_messages(ch, ids)
+        if ping_ids:
+            save_config(gcfg)
+        return bool(ping_ids)
+
+    @staticmethod
+    async def _delete_messages(ch: discord.TextChannel, message_ids: list) -> None:
+        """Delete messages by ID without fetching them first."""
+        if not channel_breaker.allow(ch):
+            return
+        msgs = [ch.get_partial_message(mid) for mid in message_ids]
+        if len(msgs) > 1:
+            try:
+                await ch.delete_messages(msgs)
+                return
+            except discord.HTTPException:
+                # Bulk delete needs Manage Messages and rejects messages
+                # older than 14 days; fall back to deleting one by one
+                pass
+        for msg in msgs:
+            try:
+                await msg.delete()
+            except (discord.NotFound, discord.Forbidden):
+                pass
+
     async def _run_event_cycle(
         self,
         guild: discord.Guild,
         ev: EventEntry,
         ch: discord.TextChannel
     ):
+        tag("event_reminder", guild.id)
         try:
-            now = int(time.time())
+            now = int(clock.time())
             guild_cfg = gcfg[str(guild.id)]
             
             # Get ping settings for this guild
@@ -539,89 +654,92 @@ class EventScheduler(commands.Cog):
             reminder_time = ev.start_epoch - (ping_settings.reminder_offset * 60)
             final_call_time = ev.start_epoch - (ping_settings.final_call_offset * 60)
             
-            # Send reminder ping if enabled and not past that time
-            reminder_id = None
-            if ping_settings.reminder_enabled and now < reminder_time:
-                await asyncio.sleep(reminder_time - now)
-                reminder_id = await self._send_event_ping(ch, guild_cfg, ping_settings.reminder_offset)
-                if reminder_id:
-                    guild_cfg.setdefault("event", {})["reminder_id"] = reminder_id
-                    save_config(gcfg)
-                now = int(time.time())
-            
-            # Send final call ping if enabled and not past that time
-            if ping_settings.final_call_enabled and now < final_call_time:
-                await asyncio.sleep(final_call_time - now)
-                # Delete reminder ping if it exists
-                reminder_id = guild_cfg.get("event", {}).get("reminder_id")
-                if reminder_id:
-                    try:
-                        msg = await ch.fetch_message(reminder_id)
-                        await msg.delete()
-                        live_feed.log(
-                            "Deleted reminder ping",
-                            f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
-                            guild,
-                            ch
-                        )
-                    except (discord.NotFound, discord.Forbidden):
-                        pass
-                # Send final call ping
-                reminder_id = await self._send_event_ping(ch, guild_cfg, ping_settings.final_call_offset)
-                if reminder_id:
-                    guild_cfg.setdefault("event", {})["reminder_id"] = reminder_id
-                    save_config(gcfg)
-                now = int(time.time())
-            
-            # Wait until event start
-            if now < ev.start_epoch:
-                await asyncio.sleep(ev.start_epoch - now)
-            
-            # Delete final call ping at event start
-            reminder_id = guild_cfg.get("event", {}).get("reminder_id")
-            if reminder_id:
-                try:
-                    msg = await ch.fetch_message(reminder_id)
-                    await msg.delete()
+            # Send reminder ping if enabled, not past that time and not already sent
+            notes = ev.notifications
+            if (
+                ping_settings.reminder_enabled
+                and now < reminder_time
+                and not notes.get("reminder_sent_at")
+            ):
+                await clock.sleep(reminder_time - now)
+                msg_id = await self._send_event_ping(ch, guild_cfg, ping_settings.reminder_offset)
+                if msg_id:
+                    self._record_notification(ev, "reminder", msg_id)
+                now = int(clock.time())
+
+            # Send final call ping if enabled, not past that time and not already sent
+            if (
+                ping_settings.final_call_enabled
+                and now < final_call_time
+                and not notes.get("final_call_sent_at")
+            ):
+                await clock.sleep(final_call_time - now)
+                # Replace this event's reminder ping with the final call
+                if await self._clear_notifications(ch, ev, ("reminder",)):
                     live_feed.log(
-                        "Deleted final call ping",
-                        f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                        "Deleted reminder ping",
+                        "Guild: {} • Event: {} • ID: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, ev.title, ev.id,
+                        entity_id=ev.id, phase="final_call"
                     )
-                except (discord.NotFound, discord.Forbidden):
-                    pass
-                guild_cfg["event"]["reminder_id"] = None
-                save_config(gcfg)
+                msg_id = await self._send_event_ping(ch, guild_cfg, ping_settings.final_call_offset)
+                if msg_id:
+                    self._record_notification(ev, "final_call", msg_id)
+                now = int(clock.time())
+
+            # Wait until event start
+            if now < ev.start_epoch:
+                await clock.sleep(ev.start_epoch - now)
+
+            # Delete any remaining pings for this event at start
+            if await self._clear_notifications(ch, ev):
+                live_feed.log(
+                    "Deleted final call ping",
+                    "Guild: {} • Event: {} • ID: {}",
+                    guild,
+                    ch,
+                    guild.name, ev.title, ev.id,
+                    entity_id=ev.id, phase="start"
+                )
 
             # Send or edit embed at start
             embed = ev.make_embed()
-            if ev.message:
+            if not channel_breaker.allow(ch):
+                pass  # the channel keeps failing; skip until its next re-probe
+            elif ev.message:
                 try:
                     await ev.message.edit(embed=embed)
                     live_feed.log(
                         "Updated event embed",
-                        f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                        "Guild: {} • Event: {} • ID: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, ev.title, ev.id,
+                        entity_id=ev.id, phase="start"
                     )
                 except (discord.NotFound, discord.Forbidden):
                     ev.message = await ch.send(embed=embed)
                     ev.message_id = ev.message.id
                     live_feed.log(
                         "Created new event embed",
-                        f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                        "Guild: {} • Event: {} • ID: {}",
                         guild,
-                        ch
+                        ch,
+                        guild.name, ev.title, ev.id,
+                        entity_id=ev.id, phase="start"
                     )
             else:
                 ev.message = await ch.send(embed=embed)
                 ev.message_id = ev.message.id
                 live_feed.log(
                     "Created event embed",
-                    f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                    "Guild: {} • Event: {} • ID: {}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, ev.title, ev.id,
+                    entity_id=ev.id, phase="start"
                 )
 
             # Persist message_id
@@ -631,20 +749,18 @@ class EventScheduler(commands.Cog):
             save_config(gcfg)
 
             # 4b) Wait until event end
-            now = int(time.time())
-            await asyncio.sleep(max(ev.end_epoch - now, 0))
+            now = int(clock.time())
+            await clock.sleep(max(ev.end_epoch - now, 0))
 
-            # Delete the embed
-            try:
-                await ev.message.delete()
-                live_feed.log(
-                    "Event ended",
-                    f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
-                    guild,
-                    ch
-                )
-            except (discord.NotFound, discord.Forbidden):
-                pass
+            # Delete the embed and any leftover pings in one batch
+            await self._clear_notifications(ch, ev, extra_ids=[ev.message_id])
+            live_feed.log(
+                "Event ended",
+                "Guild: {} • Event: {} • ID: {}",
+                guild,
+                ch,
+                guild.name, ev.title, ev.id
+            )
 
             # 4c) Remove event from memory & config
             self.events.pop(ev.id, None)
@@ -654,10 +770,11 @@ class EventScheduler(commands.Cog):
             ]
             save_config(gcfg)
 
-            # Start next soonest event if any
+            # Start next soonest event if any (events loaded at startup
+            # already have a task of their own)
             ev_list = guild_cfg.get("events", [])
-            if ev_list:
-                next_entry = min(ev_list, key=lambda x: x["start_epoch"])
+            next_entry = min(ev_list, key=lambda x: x["start_epoch"]) if ev_list else None
+            if next_entry and next_entry["id"] not in self.events:
                 next_ev = EventEntry(
                     next_entry["id"],
                     next_entry["title"],
@@ -668,47 +785,52 @@ class EventScheduler(commands.Cog):
                     next_entry.get("thumbnail", ""),
                     next_entry.get("template_key")
                 )
+                next_ev.notifications = next_entry.setdefault("notifications", {})
                 self.events[next_ev.id] = next_ev
                 chan_id = guild_cfg.get("event", {}).get("channel_id")
                 if chan_id:
                     ch = guild.get_channel(chan_id)
                 else:
-                    ch = discord.utils.get(guild.text_channels, name=EVENT_CHANNEL)
+                    ch = channel_cache.by_name(guild, EVENT_CHANNEL)
                 
                 if not ch:
                     live_feed.log(
                         "Failed to find event channel for next event",
-                        f"Guild: {guild.name} • Event: {next_ev.title} • ID: {next_ev.id}",
+                        "Guild: {} • Event: {} • ID: {}",
                         guild,
-                        None
+                        None,
+                        guild.name, next_ev.title, next_ev.id
                     )
                 else:
                     next_ev.task = asyncio.create_task(self._run_event_cycle(guild, next_ev, ch))
                     live_feed.log(
                         "Started next event",
-                        f"Guild: {guild.name} • Event: {next_ev.title} • ID: {next_ev.id} • Start: <t:{next_ev.start_epoch}:F>",
+                        "Guild: {} • Event: {} • ID: {} • Start: <t:{}:F>",
                         guild,
-                        ch
+                        ch,
+                        guild.name, next_ev.title, next_ev.id, next_ev.start_epoch
                     )
 
         except asyncio.CancelledError:
             live_feed.log(
                 "Event task cancelled",
-                f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                "Guild: {} • Event: {} • ID: {}",
                 guild,
-                ch
+                ch,
+                guild.name, ev.title, ev.id
             )
             raise
 
     async def create_event(self, interaction, title, description, s_epoch, e_epoch, thumbnail, template_key=None):
         guild = interaction.guild
-        now = int(time.time())
+        now = int(clock.time())
         if s_epoch <= now:
             live_feed.log(
                 "Failed to create event",
-                f"Guild: {guild.name} • Error: Start time in past • By: {interaction.user}",
+                "Guild: {} • Error: Start time in past • By: {}",
                 guild,
-                interaction.channel
+                interaction.channel,
+                guild.name, interaction.user
             )
             return await interaction.followup.send(
                 "❌ Time must be in the future.", ephemeral=True
@@ -719,9 +841,10 @@ class EventScheduler(commands.Cog):
         if s_epoch <= now + min_buffer:
             live_feed.log(
                 "Failed to create event",
-                f"Guild: {guild.name} • Error: Start time too close (less than 5 minutes) • By: {interaction.user}",
+                "Guild: {} • Error: Start time too close (less than 5 minutes) • By: {}",
                 guild,
-                interaction.channel
+                interaction.channel,
+                guild.name, interaction.user
             )
             return await interaction.followup.send(
                 "❌ Start time must be at least 5 minutes in the future.", ephemeral=True
@@ -737,7 +860,8 @@ class EventScheduler(commands.Cog):
             "end_epoch": e_epoch,
             "thumbnail": thumbnail,
             "message_id": None,
-            "template_key": template_key
+            "template_key": template_key,
+            "notifications": {}
         }
         ev_list = guild_cfg.setdefault("events", [])
         ev_list.append(entry)
@@ -746,9 +870,10 @@ class EventScheduler(commands.Cog):
 
         live_feed.log(
             "Created new event",
-            f"Guild: {guild.name} • Event: {title} • ID: {new_id} • Start: <t:{s_epoch}:F> • By: {interaction.user}",
+            "Guild: {} • Event: {} • ID: {} • Start: <t:{}:F> • By: {}",
             guild,
-            interaction.channel
+            interaction.channel,
+            guild.name, title, new_id, s_epoch, interaction.user
         )
 
         # Determine the channel
@@ -756,13 +881,14 @@ class EventScheduler(commands.Cog):
         if chan_id:
             ch = guild.get_channel(chan_id)
         else:
-            ch = discord.utils.get(guild.text_channels, name=EVENT_CHANNEL)
+            ch = channel_cache.by_name(guild, EVENT_CHANNEL)
             if not ch:
                 live_feed.log(
                     "Failed to find event channel",
-                    f"Guild: {guild.name} • Channel ID: {chan_id}",
+                    "Guild: {} • Channel ID: {}",
                     guild,
-                    None
+                    None,
+                    guild.name, chan_id
                 )
                 return await interaction.followup.send(
                     "❌ Could not find event channel. Please contact an administrator.",
@@ -772,9 +898,10 @@ class EventScheduler(commands.Cog):
         if not ch:
             live_feed.log(
                 "Failed to find event channel",
-                f"Guild: {guild.name} • Channel ID: {chan_id}",
+                "Guild: {} • Channel ID: {}",
                 guild,
-                None
+                None,
+                guild.name, chan_id
             )
             return await interaction.followup.send(
                 "❌ Could not find event channel. Please contact an administrator.",
@@ -792,18 +919,16 @@ class EventScheduler(commands.Cog):
                         await ev.task
                     except asyncio.CancelledError:
                         pass
-                    # Delete the old event's embed message if it exists
+                    # Delete the old event's embed and pings in one batch
+                    await self._clear_notifications(ch, ev, extra_ids=[ev.message_id])
                     if ev.message:
-                        try:
-                            await ev.message.delete()
-                            live_feed.log(
-                                "Deleted old event message",
-                                f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
-                                guild,
-                                ch
-                            )
-                        except (discord.NotFound, discord.Forbidden):
-                            pass
+                        live_feed.log(
+                            "Deleted old event message",
+                            "Guild: {} • Event: {} • ID: {}",
+                            guild,
+                            ch,
+                            guild.name, ev.title, ev.id
+                        )
 
             # Start the new soonest event
             ev = EventEntry(
@@ -816,6 +941,7 @@ class EventScheduler(commands.Cog):
                 thumbnail=thumbnail or "",  # Ensure thumbnail is never None
                 template_key=template_key
             )
+            ev.notifications = entry["notifications"]
             self.events[new_id] = ev
 
             try:
@@ -831,29 +957,28 @@ class EventScheduler(commands.Cog):
                 ev.task = asyncio.create_task(self._run_event_cycle(guild, ev, ch))
 
                 # If the event is already within the reminder or final call window, send the appropriate notification immediately
-                now = int(time.time())
+                now = int(clock.time())
                 ping_settings = get_event_ping_settings(str(guild.id))
                 
                 reminder_time = s_epoch - (ping_settings.reminder_offset * 60)
                 final_call_time = s_epoch - (ping_settings.final_call_offset * 60)
                 
                 if now >= reminder_time and now < final_call_time and ping_settings.reminder_enabled:
-                    reminder_id = await self._send_event_ping(ch, guild_cfg, ping_settings.reminder_offset)
-                    if reminder_id:
-                        guild_cfg.setdefault("event", {})["reminder_id"] = reminder_id
-                        save_config(gcfg)
+                    msg_id = await self._send_event_ping(ch, guild_cfg, ping_settings.reminder_offset)
+                    if msg_id:
+                        self._record_notification(ev, "reminder", msg_id)
                 elif now >= final_call_time and now < s_epoch and ping_settings.final_call_enabled:
-                    reminder_id = await self._send_event_ping(ch, guild_cfg, ping_settings.final_call_offset)
-                    if reminder_id:
-                        guild_cfg.setdefault("event", {})["reminder_id"] = reminder_id
-                        save_config(gcfg)
+                    msg_id = await self._send_event_ping(ch, guild_cfg, ping_settings.final_call_offset)
+                    if msg_id:
+                        self._record_notification(ev, "final_call", msg_id)
 
             except discord.Forbidden:
                 live_feed.log(
                     "Failed to send event message",
-                    f"Guild: {guild.name} • Event: {title} • Error: Missing permissions",
+                    "Guild: {} • Event: {} • Error: Missing permissions",
                     guild,
-                    ch
+                    ch,
+                    guild.name, title
                 )
                 return await interaction.followup.send(
                     "❌ Bot lacks permissions to send messages in the event channel.",
@@ -862,9 +987,10 @@ class EventScheduler(commands.Cog):
             except Exception as e:
                 live_feed.log(
                     "Failed to send event message",
-                    f"Guild: {guild.name} • Event: {title} • Error: {str(e)}",
+                    "Guild: {} • Event: {} • Error: {}",
                     guild,
-                    ch
+                    ch,
+                    guild.name, title, e
                 )
                 return await interaction.followup.send(
                     "❌ An error occurred while creating the event. Please try again.",
@@ -880,9 +1006,10 @@ class EventScheduler(commands.Cog):
     async def addevent(self, interaction: discord.Interaction):
         live_feed.log(
             "Event creation started",
-            f"Guild: {interaction.guild.name} • By: {interaction.user}",
+            "Guild: {} • By: {}",
             interaction.guild,
-            interaction.channel
+            interaction.channel,
+            interaction.guild.name, interaction.user
         )
         view = AddEventView(self.bot, self)
         await interaction.response.send_message(
@@ -912,9 +1039,10 @@ class EventScheduler(commands.Cog):
         if not ev and not event_entry:
             live_feed.log(
                 "Failed to cancel event",
-                f"Guild: {guild.name} • Event ID: {event_id} • Error: Not found • By: {interaction.user}",
+                "Guild: {} • Event ID: {} • Error: Not found • By: {}",
                 guild,
-                interaction.channel
+                interaction.channel,
+                guild.name, event_id, interaction.user
             )
             return await interaction.followup.send("⚠️ Unknown event ID", ephemeral=True)
         # Cancel and cleanup
@@ -924,25 +1052,30 @@ class EventScheduler(commands.Cog):
                 await ev.task
             except asyncio.CancelledError:
                 pass
-        if ev and ev.message:
-            try:
-                await ev.message.delete()
+        if ev:
+            # Delete the embed and this event's pings in one batch
+            ch = ev.message.channel if ev.message else guild.get_channel(
+                guild_cfg.get("event", {}).get("channel_id") or 0
+            )
+            if ch:
+                await self._clear_notifications(ch, ev, extra_ids=[ev.message_id])
+            if ev.message:
                 live_feed.log(
                     "Deleted event message",
-                    f"Guild: {guild.name} • Event: {ev.title} • ID: {ev.id}",
+                    "Guild: {} • Event: {} • ID: {}",
                     guild,
-                    interaction.channel
+                    interaction.channel,
+                    guild.name, ev.title, ev.id
                 )
-            except:
-                pass
         # Remove from config
         guild_cfg["events"] = [e for e in ev_list if e["id"] != event_id]
         save_config(gcfg)
         live_feed.log(
             "Cancelled event",
-            f"Guild: {guild.name} • Event: {ev.title if ev else event_entry['title']} • ID: {event_id} • By: {interaction.user}",
+            "Guild: {} • Event: {} • ID: {} • By: {}",
             guild,
-            interaction.channel
+            interaction.channel,
+            guild.name, ev.title if ev else event_entry['title'], event_id, interaction.user
         )
         await interaction.followup.send(f"🗑️ Event `{event_id}` cancelled.", ephemeral=True)
 
@@ -950,13 +1083,14 @@ class EventScheduler(commands.Cog):
     async def listevents(self, interaction: discord.Interaction):
         live_feed.log(
             "Listing events",
-            f"Guild: {interaction.guild.name} • By: {interaction.user}",
+            "Guild: {} • By: {}",
             interaction.guild,
-            interaction.channel
+            interaction.channel,
+            interaction.guild.name, interaction.user
         )
         await interaction.response.defer(ephemeral=True)
         guild_id = str(interaction.guild.id)
-        now = int(time.time())
+        now = int(clock.time())
         # Always list from config for consistency
         all_events = gcfg.get(guild_id, {}).get("events", [])
         upcoming = [
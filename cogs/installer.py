@@ -27,6 +27,8 @@ from welcome_embeds import (
     WELCOME_EMBED_VERSION,
 )
 from cogs.reaction import ReactionRole
+from rest_accounting import tag
+from welcome_migration import WelcomeMigration
 
 
 def locked_channel_perms(bot_member: discord.Member, restrict_reactions=False):
@@ -193,6 +195,7 @@ class SimpleChannelSelector:
         """Complete the installation process"""
         guild_id = str(self.interaction.guild.id)
         guild_cfg = gcfg.setdefault(guild_id, {})
+        tag("installer", self.interaction.guild.id)
 
         # Move selected channels to the category
         category = await ensure_category(self.interaction.guild)
@@ -204,9 +207,10 @@ class SimpleChannelSelector:
                     except discord.Forbidden:
                         live_feed.log(
                             "Failed to move channel to category",
-                            f"Guild: {self.interaction.guild.name} • Channel: {channel.name} • Error: No permission",
+                            "Guild: {} • Channel: {} • Error: No permission",
                             self.interaction.guild,
                             self.interaction.channel,
+                            self.interaction.guild.name, channel.name,
                         )
 
         # Save channel IDs
@@ -367,140 +371,22 @@ async def ensure_category(guild: discord.Guild) -> discord.CategoryChannel:
 class Installer(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Start welcome message update task
-        self._update_task = asyncio.create_task(self._update_welcome_messages())
+        # Bring welcome embeds up to WELCOME_EMBED_VERSION in the background
+        self.welcome_migration = WelcomeMigration(bot)
+        self._update_task = asyncio.create_task(self.welcome_migration.run())
 
     def cog_unload(self):
         # Cancel the update task
         if hasattr(self, "_update_task"):
             self._update_task.cancel()
 
-    async def _update_welcome_messages(self):
-        """Update welcome messages on startup with new formatting"""
-        await self.bot.wait_until_ready()
-
-        for guild in self.bot.guilds:
-            guild_id = str(guild.id)
-            guild_cfg = gcfg.get(guild_id, {})
-
-            if not guild_cfg.get("mode"):
-                continue  # Not installed
-
-            # Check if welcome messages need updating
-            current_version = guild_cfg.get("welcome_embed_version", "1.0")
-            if current_version == WELCOME_EMBED_VERSION:
-                # Already up to date, skip
-                continue
-
-            live_feed.log(
-                "Updating welcome messages",
-                f"Guild: {guild.name} • Version: {current_version} → {WELCOME_EMBED_VERSION}",
-                guild,
-                None,
-            )
-
-            updated_count = 0
-
-            # Update bear welcome message
-            bear_cfg = guild_cfg.get("bear", {})
-            if bear_cfg.get("welcome_message_id") and bear_cfg.get("channel_id"):
-                bear_ch = guild.get_channel(bear_cfg["channel_id"])
-                if bear_ch:
-                    try:
-                        msg = await bear_ch.fetch_message(
-                            bear_cfg["welcome_message_id"]
-                        )
-                        new_embed = make_bear_welcome_embed(guild_id)
-                        await msg.edit(embed=new_embed)
-                        updated_count += 1
-                        live_feed.log(
-                            "Updated bear welcome message",
-                            f"Guild: {guild.name} • Channel: #{bear_ch.name}",
-                            guild,
-                            bear_ch,
-                        )
-                    except (discord.NotFound, discord.Forbidden):
-                        live_feed.log(
-                            "Failed to update bear welcome message",
-                            f"Guild: {guild.name} • Message not found or no permission",
-                            guild,
-                            None,
-                        )
-
-            # Update arena welcome message
-            arena_cfg = guild_cfg.get("arena", {})
-            if arena_cfg.get("welcome_message_id") and arena_cfg.get("channel_id"):
-                arena_ch = guild.get_channel(arena_cfg["channel_id"])
-                if arena_ch:
-                    try:
-                        msg = await arena_ch.fetch_message(
-                            arena_cfg["welcome_message_id"]
-                        )
-                        new_embed = make_arena_welcome_embed(guild_id)
-                        await msg.edit(embed=new_embed)
-                        updated_count += 1
-                        live_feed.log(
-                            "Updated arena welcome message",
-                            f"Guild: {guild.name} • Channel: #{arena_ch.name}",
-                            guild,
-                            arena_ch,
-                        )
-                    except (discord.NotFound, discord.Forbidden):
-                        live_feed.log(
-                            "Failed to update arena welcome message",
-                            f"Guild: {guild.name} • Message not found or no permission",
-                            guild,
-                            None,
-                        )
-
-            # Update event welcome message
-            event_cfg = guild_cfg.get("event", {})
-            if event_cfg.get("message_id") and event_cfg.get("channel_id"):
-                event_ch = guild.get_channel(event_cfg["channel_id"])
-                if event_ch:
-                    try:
-                        msg = await event_ch.fetch_message(event_cfg["message_id"])
-                        new_embed = make_event_welcome_embed(guild_id)
-                        await msg.edit(embed=new_embed)
-                        updated_count += 1
-                        live_feed.log(
-                            "Updated event welcome message",
-                            f"Guild: {guild.name} • Channel: #{event_ch.name}",
-                            guild,
-                            event_ch,
-                        )
-                    except (discord.NotFound, discord.Forbidden):
-                        live_feed.log(
-                            "Failed to update event welcome message",
-                            f"Guild: {guild.name} • Message not found or no permission",
-                            guild,
-                            None,
-                        )
-
-            # Update version in config if any messages were updated
-            if updated_count > 0:
-                guild_cfg["welcome_embed_version"] = WELCOME_EMBED_VERSION
-                save_config(gcfg)
-                live_feed.log(
-                    "Welcome messages updated",
-                    f"Guild: {guild.name} • Updated: {updated_count} messages • Version: {WELCOME_EMBED_VERSION}",
-                    guild,
-                    None,
-                )
-            else:
-                live_feed.log(
-                    "No welcome messages to update",
-                    f"Guild: {guild.name} • Version: {WELCOME_EMBED_VERSION}",
-                    guild,
-                    None,
-                )
-
     @app_commands.command(
         name="install", description="⚙️ Set up the bot (auto or manual mode)"
     )
     @app_commands.describe(mode="Choose 'auto' or 'manual'")
     async def install(self, interaction: discord.Interaction, mode: str):
         guild = interaction.guild
+        tag("installer", guild.id if guild else None)
         if not guild or not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message(
                 "❌ Admins only.", ephemeral=True
@@ -515,9 +401,10 @@ class Installer(commands.Cog):
             current_mode = cfg.get("mode")
             live_feed.log(
                 "Install attempt (already installed)",
-                f"Guild: {guild.name} • Current mode: {current_mode} • Attempted mode: {mode} • By: {interaction.user}",
+                "Guild: {} • Current mode: {} • Attempted mode: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, current_mode, mode, interaction.user,
             )
             return await interaction.followup.send(
                 f"❌ Already installed in {current_mode} mode. Use `/uninstall` first to change modes.",
@@ -527,9 +414,10 @@ class Installer(commands.Cog):
         if mode not in ("auto", "manual"):
             live_feed.log(
                 "Invalid install mode attempted",
-                f"Guild: {guild.name} • Mode: {mode} • By: {interaction.user}",
+                "Guild: {} • Mode: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, mode, interaction.user,
             )
             return await interaction.followup.send(
                 "❌ Unknown mode. Use `auto` or `manual`.", ephemeral=True
@@ -542,9 +430,10 @@ class Installer(commands.Cog):
         if mode == "auto":
             live_feed.log(
                 "Starting auto-install",
-                f"Guild: {guild.name} • By: {interaction.user}",
+                "Guild: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, interaction.user,
             )
             await interaction.followup.send("⚙️ Auto-installing...", ephemeral=True)
             bot_member = guild.get_member(self.bot.user.id)
@@ -586,9 +475,10 @@ class Installer(commands.Cog):
 
             live_feed.log(
                 "Created channels",
-                f"Guild: {guild.name} • Category: {CATEGORY_NAME} • Channels: Bear, Bear Log, Arena, Event, Reaction",
+                "Guild: {} • Category: {} • Channels: Bear, Bear Log, Arena, Event, Reaction",
                 guild,
                 interaction.channel,
+                guild.name, CATEGORY_NAME,
             )
 
             # Persist IDs
@@ -607,9 +497,10 @@ class Installer(commands.Cog):
 
             live_feed.log(
                 "Created roles",
-                f"Guild: {guild.name} • Roles: Bear, Arena, Event",
+                "Guild: {} • Roles: Bear, Arena, Event",
                 guild,
                 interaction.channel,
+                guild.name,
             )
 
             # Send welcome messages
@@ -625,9 +516,10 @@ class Installer(commands.Cog):
 
             live_feed.log(
                 "Sent welcome messages",
-                f"Guild: {guild.name} • Channels: Bear, Arena, Event",
+                "Guild: {} • Channels: Bear, Arena, Event",
                 guild,
                 interaction.channel,
+                guild.name,
             )
 
             if a := self.bot.get_cog("ArenaScheduler"):
@@ -638,18 +530,20 @@ class Installer(commands.Cog):
             save_config(gcfg)
             live_feed.log(
                 "Auto-install complete",
-                f"Guild: {guild.name} • By: {interaction.user}",
+                "Guild: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, interaction.user,
             )
             await interaction.followup.send("✅ Installation complete.", ephemeral=True)
 
         else:  # manual mode
             live_feed.log(
                 "Starting manual install",
-                f"Guild: {guild.name} • By: {interaction.user}",
+                "Guild: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, interaction.user,
             )
             selector = SimpleChannelSelector(self.bot, interaction, gcfg)
             await selector.start_selection()
@@ -660,6 +554,7 @@ class Installer(commands.Cog):
     async def uninstall(self, interaction: discord.Interaction):
         try:
             guild = interaction.guild
+            tag("installer", guild.id if guild else None)
             if not guild or not interaction.user.guild_permissions.administrator:
                 return await interaction.response.send_message(
                     "❌ Admins only.", ephemeral=True
@@ -668,9 +563,10 @@ class Installer(commands.Cog):
 
             live_feed.log(
                 "Starting uninstall",
-                f"Guild: {guild.name} • By: {interaction.user}",
+                "Guild: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, interaction.user,
             )
 
             guild_id = str(guild.id)
@@ -686,16 +582,18 @@ class Installer(commands.Cog):
                         deleted_roles += 1
                         live_feed.log(
                             f"Deleted {role_key} role",
-                            f"Guild: {guild.name} • Role: {role.name}",
+                            "Guild: {} • Role: {}",
                             guild,
                             interaction.channel,
+                            guild.name, role.name,
                         )
                     except discord.Forbidden:
                         live_feed.log(
                             f"Failed to delete {role_key} role",
-                            f"Guild: {guild.name} • Role: {role.name} • Error: No permission",
+                            "Guild: {} • Role: {} • Error: No permission",
                             guild,
                             interaction.channel,
+                            guild.name, role.name,
                         )
 
             # Auto mode: delete channels & category
@@ -725,23 +623,26 @@ class Installer(commands.Cog):
                         deleted_channels += 1
                         live_feed.log(
                             "Deleted channel",
-                            f"Guild: {guild.name} • Channel: {channel.name}",
+                            "Guild: {} • Channel: {}",
                             guild,
                             interaction.channel,
+                            guild.name, channel.name,
                         )
                     except discord.Forbidden:
                         live_feed.log(
                             "Failed to delete channel",
-                            f"Guild: {guild.name} • Channel: {channel.name} • Error: No permission",
+                            "Guild: {} • Channel: {} • Error: No permission",
                             guild,
                             interaction.channel,
+                            guild.name, channel.name,
                         )
                     except discord.NotFound:
                         live_feed.log(
                             "Channel already deleted",
-                            f"Guild: {guild.name} • Channel ID: {channel.id}",
+                            "Guild: {} • Channel ID: {}",
                             guild,
                             interaction.channel,
+                            guild.name, channel.id,
                         )
 
                 # Try to delete the category regardless of whether it's empty
@@ -760,31 +661,35 @@ class Installer(commands.Cog):
                         deleted_categories += 1
                         live_feed.log(
                             "Deleted category",
-                            f"Guild: {guild.name} • Category: {category.name}",
+                            "Guild: {} • Category: {}",
                             guild,
                             interaction.channel,
+                            guild.name, category.name,
                         )
                     except discord.Forbidden:
                         live_feed.log(
                             "Failed to delete category",
-                            f"Guild: {guild.name} • Category: {category.name} • Error: No permission",
+                            "Guild: {} • Category: {} • Error: No permission",
                             guild,
                             interaction.channel,
+                            guild.name, category.name,
                         )
                     except discord.NotFound:
                         live_feed.log(
                             "Category already deleted",
-                            f"Guild: {guild.name} • Category: {category.name}",
+                            "Guild: {} • Category: {}",
                             guild,
                             interaction.channel,
+                            guild.name, category.name,
                         )
             else:
                 # Manual mode: only purge bot messages, DO NOT delete channels
                 live_feed.log(
                     "Manual mode uninstall - preserving channels",
-                    f"Guild: {guild.name} • Mode: manual",
+                    "Guild: {} • Mode: manual",
                     guild,
                     interaction.channel,
+                    guild.name,
                 )
 
                 # Only purge bot messages from the selected channels
@@ -803,16 +708,18 @@ class Installer(commands.Cog):
                             if purged_count > 0:
                                 live_feed.log(
                                     "Purged bot messages",
-                                    f"Guild: {guild.name} • Channel: {channel.name} • Count: {purged_count}",
+                                    "Guild: {} • Channel: {} • Count: {}",
                                     guild,
                                     interaction.channel,
+                                    guild.name, channel.name, purged_count,
                                 )
                         except discord.Forbidden:
                             live_feed.log(
                                 "Failed to purge messages",
-                                f"Guild: {guild.name} • Channel: {channel.name} • Error: No permission",
+                                "Guild: {} • Channel: {} • Error: No permission",
                                 guild,
                                 interaction.channel,
+                                guild.name, channel.name,
                             )
 
             # Cancel any running BearScheduler tasks for this guild
@@ -854,9 +761,10 @@ class Installer(commands.Cog):
 
             live_feed.log(
                 "Uninstall complete",
-                f"Guild: {guild.name} • Deleted: {deleted_roles} roles, {deleted_channels} channels, {deleted_categories} categories, {purged} messages • By: {interaction.user}",
+                "Guild: {} • Deleted: {} roles, {} channels, {} categories, {} messages • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, deleted_roles, deleted_channels, deleted_categories, purged, interaction.user,
             )
 
             await interaction.followup.send(
@@ -867,9 +775,10 @@ class Installer(commands.Cog):
         except Exception as e:
             live_feed.log(
                 "Uninstall failed",
-                f"Guild: {guild.name} • Error: {str(e)} • By: {interaction.user}",
+                "Guild: {} • Error: {} • By: {}",
                 guild,
                 interaction.channel,
+                guild.name, e, interaction.user,
             )
             await interaction.followup.send(
                 f"❌ Uninstall failed: {str(e)}", ephemeral=True
@@ -880,6 +789,7 @@ class Installer(commands.Cog):
     )
     async def updateembeds(self, interaction: discord.Interaction):
         """Manually update welcome embeds to the latest format"""
+        tag("installer", interaction.guild_id)
         if not interaction.user.guild_permissions.administrator:
             return await interaction.response.send_message(
                 "❌ Admins only.", ephemeral=True
@@ -904,88 +814,13 @@ class Installer(commands.Cog):
 
         live_feed.log(
             "Manual welcome embed update",
-            f"Guild: {guild.name} • Version: {current_version} → {WELCOME_EMBED_VERSION} • By: {interaction.user}",
+            "Guild: {} • Version: {} → {} • By: {}",
             guild,
             interaction.channel,
+            guild.name, current_version, WELCOME_EMBED_VERSION, interaction.user,
         )
 
-        updated_count = 0
-
-        # Update bear welcome message
-        bear_cfg = guild_cfg.get("bear", {})
-        if bear_cfg.get("welcome_message_id") and bear_cfg.get("channel_id"):
-            bear_ch = guild.get_channel(bear_cfg["channel_id"])
-            if bear_ch:
-                try:
-                    msg = await bear_ch.fetch_message(bear_cfg["welcome_message_id"])
-                    new_embed = make_bear_welcome_embed(guild_id)
-                    await msg.edit(embed=new_embed)
-                    updated_count += 1
-                    live_feed.log(
-                        "Updated bear welcome message",
-                        f"Guild: {guild.name} • Channel: #{bear_ch.name}",
-                        guild,
-                        bear_ch,
-                    )
-                except (discord.NotFound, discord.Forbidden):
-                    live_feed.log(
-                        "Failed to update bear welcome message",
-                        f"Guild: {guild.name} • Message not found or no permission",
-                        guild,
-                        None,
-                    )
-
-        # Update arena welcome message
-        arena_cfg = guild_cfg.get("arena", {})
-        if arena_cfg.get("welcome_message_id") and arena_cfg.get("channel_id"):
-            arena_ch = guild.get_channel(arena_cfg["channel_id"])
-            if arena_ch:
-                try:
-                    msg = await arena_ch.fetch_message(arena_cfg["welcome_message_id"])
-                    new_embed = make_arena_welcome_embed(guild_id)
-                    await msg.edit(embed=new_embed)
-                    updated_count += 1
-                    live_feed.log(
-                        "Updated arena welcome message",
-                        f"Guild: {guild.name} • Channel: #{arena_ch.name}",
-                        guild,
-                        arena_ch,
-                    )
-                except (discord.NotFound, discord.Forbidden):
-                    live_feed.log(
-                        "Failed to update arena welcome message",
-                        f"Guild: {guild.name} • Message not found or no permission",
-                        guild,
-                        None,
-                    )
-
-        # Update event welcome message
-        event_cfg = guild_cfg.get("event", {})
-        if event_cfg.get("message_id") and event_cfg.get("channel_id"):
-            event_ch = guild.get_channel(event_cfg["channel_id"])
-            if event_ch:
-                try:
-                    msg = await event_ch.fetch_message(event_cfg["message_id"])
-                    new_embed = make_event_welcome_embed(guild_id)
-                    await msg.edit(embed=new_embed)
-                    updated_count += 1
-                    live_feed.log(
-                        "Updated event welcome message",
-                        f"Guild: {guild.name} • Channel: #{event_ch.name}",
-                        guild,
-                        event_ch,
-                    )
-                except (discord.NotFound, discord.Forbidden):
-                    live_feed.log(
-                        "Failed to update event welcome message",
-                        f"Guild: {guild.name} • Message not found or no permission",
-                        guild,
-                        None,
-                    )
-
-        # Update version in config
-        guild_cfg["welcome_embed_version"] = WELCOME_EMBED_VERSION
-        save_config(gcfg)
+        updated_count = await self.welcome_migration.migrate_guild(guild)
 
         await interaction.followup.send(
             f"✅ Updated {updated_count} welcome embed(s) to version {WELCOME_EMBED_VERSION}.",
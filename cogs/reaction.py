@@ -1,11 +1,25 @@
 # cogs/reaction.py
+import asyncio
+import time
+
 import discord
 from discord.ext import commands
 
 import logging
-from helpers import save_config
-from config import ROLE_EMOJIS, gcfg
+from helpers import save_config, role_counter, resolve_member
+from config import (
+    ROLE_EMOJIS,
+    ROLE_EMOJI_KEYS,
+    RECONCILE_CONCURRENCY,
+    RECONCILE_CHECKPOINT_TTL_SEC,
+    WARM_RECONCILE_MAX_AGE_SEC,
+    gcfg,
+)
 from admin_tools import live_feed
+from rest_accounting import tag
+from role_queue import RoleUpdateQueue
+from startup_trace import startup_tracer
+from warm_state import restored
 
 log = logging.getLogger("kingshot")
 
@@ -15,6 +29,17 @@ class ReactionRole(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # guild_id -> {emoji: role_id}, built lazily and dropped on role changes
+        self.role_map: dict[int, dict[str, int]] = {}
+        # Coalesces bursts of reaction toggles into net role edits
+        self.role_queue = RoleUpdateQueue(self._apply_role_changes)
+        self._reconcile_task: asyncio.Task | None = None
+        # Reaction add/remove events turned into role intents (metrics)
+        self.reactions_handled = 0
+        # guild_id -> wall time of the last completed reconcile
+        self.reconciled_at: dict[int, float] = {}
+        # Reconciles completed before a clean restart, keyed by str(guild_id)
+        self._warm: dict = restored(type(self).__name__)
         # Load persisted message IDs from unified config
         for guild_id, guild_cfg in gcfg.items():
             rr = guild_cfg.get("reaction", {})
@@ -22,15 +47,77 @@ class ReactionRole(commands.Cog):
             if msg_id:
                 self.bot.role_message_ids[int(guild_id)] = msg_id
 
+    async def cog_load(self):
+        # Cogs are loaded after the gateway is ready, so on_ready has
+        # already fired for the first connection; reconcile now instead
+        if self.bot.is_ready():
+            self._start_reconcile()
+
+    def snapshot_state(self) -> dict:
+        """Completed reconciles, for warm_state.save_snapshot."""
+        return {
+            str(gid): {"message_id": self.bot.role_message_ids.get(gid), "reconciled_at": ts}
+            for gid, ts in self.reconciled_at.items()
+        }
+
+    def cog_unload(self):
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+        self.role_queue.cancel()
+
+    # ────────────── Role Map ──────────────
+
+    def _build_role_map(self, guild: discord.Guild) -> dict[str, int]:
+        """Map each reaction emoji to its configured role ID for a guild."""
+        guild_cfg = gcfg.get(str(guild.id), {})
+        mapping = {}
+        for emoji, key in ROLE_EMOJI_KEYS.items():
+            role_id = guild_cfg.get(key, {}).get("role_id")
+            if not role_id:
+                # Older installs may not have persisted the role ID
+                role = discord.utils.get(guild.roles, name=ROLE_EMOJIS[emoji])
+                role_id = role.id if role else None
+            if role_id:
+                mapping[emoji] = int(role_id)
+        self.role_map[guild.id] = mapping
+        return mapping
+
+    def _get_role(
+        self, guild: discord.Guild, emoji: discord.PartialEmoji | str
+    ) -> discord.Role | None:
+        """Resolve the reaction role for an emoji with a dict lookup."""
+        mapping = self.role_map.get(guild.id)
+        if mapping is None:
+            mapping = self._build_role_map(guild)
+        role_id = mapping.get(str(emoji))
+        return guild.get_role(role_id) if role_id else None
+
+    def invalidate_role_map(self, guild_id: int) -> None:
+        """Drop a guild's cached emoji → role map; it is rebuilt on next use."""
+        self.role_map.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        self.invalidate_role_map(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self.invalidate_role_map(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self.invalidate_role_map(role.guild.id)
+
     async def setup_reactions(
         self, guild: discord.Guild, channel: discord.TextChannel
     ) -> discord.Message:
         """Send the embed, add reactions, and persist."""
         live_feed.log(
             "Setting up reaction roles",
-            f"Guild: {guild.name} • Channel: #{channel.name}",
+            "Guild: {} • Channel: #{}",
             guild,
             channel,
+            guild.name, channel.name,
         )
         embed = discord.Embed(
             title="📜 Choose Your Adventure!",
@@ -56,12 +143,14 @@ class ReactionRole(commands.Cog):
 
         # Also keep in memory
         self.bot.role_message_ids[guild.id] = msg.id
+        self.invalidate_role_map(guild.id)
 
         live_feed.log(
             "Reaction role message created",
-            f"Guild: {guild.name} • Channel: #{channel.name} • Message ID: {msg.id}",
+            "Guild: {} • Channel: #{} • Message ID: {}",
             guild,
             channel,
+            guild.name, channel.name, msg.id,
         )
 
         # 🔁 Process existing reactions and apply roles immediately
@@ -69,7 +158,7 @@ class ReactionRole(commands.Cog):
             async for user in reaction.users():
                 if user.bot:
                     continue
-                member = guild.get_member(user.id)
+                member = await resolve_member(guild, user.id)
                 if not member:
                     continue
                 await self.handle_reaction_logic(member, reaction.emoji, msg)
@@ -83,37 +172,39 @@ class ReactionRole(commands.Cog):
         """
         Add the role corresponding to this emoji on setup or on_existing.
         """
-        role_name = ROLE_EMOJIS.get(str(emoji))
-        if not role_name or member.bot:
+        if member.bot:
             return
 
-        role = discord.utils.get(member.guild.roles, name=role_name)
+        role = self._get_role(member.guild, emoji)
         if role and role not in member.roles:
             try:
                 # Track roles before applying the new one
                 before_roles = set(member.roles)
                 await member.add_roles(role)
                 # Determine which reaction roles were newly added
+                role_ids = set(self.role_map.get(member.guild.id, {}).values())
                 new_roles = [
                     r
                     for r in member.roles
-                    if r.name in ROLE_EMOJIS.values() and r not in before_roles
+                    if r.id in role_ids and r not in before_roles
                 ]
                 if new_roles:
                     role_names = ", ".join(r.name for r in new_roles)
                     live_feed.log(
                         "Roles added via reaction",
-                        f"Guild: {member.guild.name} • User: {member} • Roles: {role_names}",
+                        "Guild: {} • User: {} • Roles: {}",
                         member.guild,
                         msg.channel,
+                        member.guild.name, member, role_names,
                     )
             except discord.Forbidden:
                 log.warning(f"Cannot add role {role.name} to {member}.")
                 live_feed.log(
                     "Failed to add role via reaction",
-                    f"Guild: {member.guild.name} • User: {member} • Role: {role.name} • Error: No permission",
+                    "Guild: {} • User: {} • Role: {} • Error: No permission",
                     member.guild,
                     msg.channel,
+                    member.guild.name, member, role.name,
                 )
 
         return msg
@@ -133,39 +224,13 @@ class ReactionRole(commands.Cog):
         if not guild:
             return
 
-        role_name = ROLE_EMOJIS.get(str(payload.emoji))
-        if not role_name:
+        role = self._get_role(guild, payload.emoji)
+        if not role:
             return
 
-        role = discord.utils.get(guild.roles, name=role_name)
-        member = guild.get_member(payload.user_id)
-        if role and member and not member.bot:
-            try:
-                # Track roles before adding the reaction role
-                before_roles = set(member.roles)
-                await member.add_roles(role)
-                # Determine which reaction roles were newly added
-                new_roles = [
-                    r
-                    for r in member.roles
-                    if r.name in ROLE_EMOJIS.values() and r not in before_roles
-                ]
-                if new_roles:
-                    role_names = ", ".join(r.name for r in new_roles)
-                    live_feed.log(
-                        "Roles added via reaction",
-                        f"Guild: {guild.name} • User: {member} • Roles: {role_names}",
-                        guild,
-                        None,
-                    )
-            except discord.Forbidden:
-                log.warning(f"Cannot add role {role.name} to {member}.")
-                live_feed.log(
-                    "Failed to add role via reaction",
-                    f"Guild: {guild.name} • User: {member} • Role: {role.name} • Error: No permission",
-                    guild,
-                    None,
-                )
+        if not (payload.member and payload.member.bot):
+            self.reactions_handled += 1
+            self.role_queue.enqueue(guild, payload.user_id, role.id, add=True)
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
@@ -181,114 +246,261 @@ class ReactionRole(commands.Cog):
         if not guild:
             return
 
-        role_name = ROLE_EMOJIS.get(str(payload.emoji))
-        if not role_name:
+        role = self._get_role(guild, payload.emoji)
+        if not role:
             return
 
-        role = discord.utils.get(guild.roles, name=role_name)
+        # Removal payloads carry no member; bots are filtered when the queue flushes
         member = guild.get_member(payload.user_id)
-        if role and member and not member.bot:
-            try:
-                # Get current roles before removing
-                current_roles = set(member.roles)
-                await member.remove_roles(role)
-                # Get all roles that were removed
-                removed_roles = [
-                    r
-                    for r in current_roles
-                    if r.name in ROLE_EMOJIS.values() and r not in member.roles
-                ]
-                if removed_roles:
-                    role_names = ", ".join(r.name for r in removed_roles)
-                    live_feed.log(
-                        "Roles removed via reaction",
-                        f"Guild: {guild.name} • User: {member} • Roles: {role_names}",
-                        guild,
-                        None,
-                    )
-            except discord.Forbidden:
-                log.warning(f"Cannot remove role {role.name} from {member}.")
-                live_feed.log(
-                    "Failed to remove role via reaction",
-                    f"Guild: {guild.name} • User: {member} • Role: {role.name} • Error: No permission",
-                    guild,
-                    None,
-                )
+        if not member or not member.bot:
+            self.reactions_handled += 1
+            self.role_queue.enqueue(guild, payload.user_id, role.id, add=False)
+
+    async def _apply_role_changes(
+        self,
+        guild: discord.Guild,
+        member: discord.Member,
+        to_add: list[discord.Role],
+        to_remove: list[discord.Role],
+    ) -> bool:
+        """Apply the net reaction-role change for one member from the queue."""
+        try:
+            # Per-role PUT/DELETE rather than a full role-list PATCH, so roles
+            # changed elsewhere meanwhile (or missing from a stale member
+            # cache) aren't overwritten
+            if to_add:
+                await member.add_roles(*to_add)
+            if to_remove:
+                await member.remove_roles(*to_remove)
+        except discord.Forbidden:
+            role_names = ", ".join(r.name for r in to_add + to_remove)
+            log.warning(f"Cannot update roles {role_names} for {member}.")
+            live_feed.log(
+                "Failed to update roles via reaction",
+                "Guild: {} • User: {} • Roles: {} • Error: No permission",
+                guild,
+                None,
+                guild.name, member, role_names,
+            )
+            return False
+
+        for role in to_add:
+            role_counter.add(guild.id, role.id, member.id)
+        for role in to_remove:
+            role_counter.remove(guild.id, role.id, member.id)
+
+        if to_add:
+            live_feed.log(
+                "Roles added via reaction",
+                "Guild: {} • User: {} • Roles: {}",
+                guild,
+                None,
+                guild.name, member, ', '.join((r.name for r in to_add)),
+            )
+        if to_remove:
+            live_feed.log(
+                "Roles removed via reaction",
+                "Guild: {} • User: {} • Roles: {}",
+                guild,
+                None,
+                guild.name, member, ', '.join((r.name for r in to_remove)),
+            )
+        return True
 
     @commands.Cog.listener()
     async def on_ready(self):
-        # Load existing reaction-role messages on startup
-        for guild in self.bot.guilds:
-            guild_cfg = gcfg.get(str(guild.id), {})
-            rr = guild_cfg.get("reaction", {})
-            chan_id = rr.get("channel_id")
-            msg_id = rr.get("message_id")
+        # Reconcile reaction roles once per (re)identify, not concurrently
+        self._start_reconcile()
 
-            if not chan_id or not msg_id:
-                continue
+    def _start_reconcile(self):
+        if self._reconcile_task and not self._reconcile_task.done():
+            return
+        self._reconcile_task = asyncio.create_task(
+            startup_tracer.track("reaction.reconcile", self._reconcile_all())
+        )
 
-            ch = guild.get_channel(chan_id)
-            if not isinstance(ch, discord.TextChannel):
-                continue
+    # ────────────── Startup Reconciliation ──────────────
 
-            try:
-                msg = await ch.fetch_message(msg_id)
-                live_feed.log(
-                    "Loaded reaction role message",
-                    f"Guild: {guild.name} • Channel: #{ch.name} • Message ID: {msg_id}",
-                    guild,
-                    ch,
-                )
-            except (discord.NotFound, discord.Forbidden):
-                live_feed.log(
-                    "Failed to load reaction role message",
-                    f"Guild: {guild.name} • Channel ID: {chan_id} • Message ID: {msg_id} • Error: Message not found",
-                    guild,
-                    None,
+    async def _reconcile_all(self):
+        """Reconcile every guild's reaction message under a shared REST limit."""
+        self.role_map.clear()
+        started = time.monotonic()
+        limiter = asyncio.Semaphore(RECONCILE_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._reconcile_guild(guild, limiter) for guild in self.bot.guilds),
+            return_exceptions=True,
+        )
+        for guild, result in zip(self.bot.guilds, results):
+            if isinstance(result, Exception):
+                log.error(
+                    f"Reaction reconcile failed in {guild.name}: {result}",
+                    extra={"guild_id": guild.id, "phase": "reconcile"},
                 )
-                continue
+        duration = round(time.monotonic() - started, 3)
+        log.info(
+            f"Reaction roles reconciled in {duration}s across {len(self.bot.guilds)} guild(s)",
+            extra={"phase": "reconcile", "duration": duration},
+        )
+
+    def _load_checkpoint(self, rr: dict, msg_id: int) -> tuple[dict, bool]:
+        """Return the persisted reconcile checkpoint, or a fresh one if stale."""
+        cp = rr.get("reconcile")
+        if (
+            cp
+            and cp.get("message_id") == msg_id
+            and time.time() - cp.get("started_at", 0) < RECONCILE_CHECKPOINT_TTL_SEC
+        ):
+            return cp, True
+        cp = {
+            "message_id": msg_id,
+            "started_at": int(time.time()),
+            "done": [],  # emojis fully paged
+            "emoji": None,  # emoji being paged
+            "after": None,  # last user ID seen for that emoji
+        }
+        rr["reconcile"] = cp
+        return cp, False
+
+    async def _reconcile_guild(self, guild: discord.Guild, limiter: asyncio.Semaphore):
+        """
+        Page reactors for each emoji and grant only the roles they are missing.
+        Progress is checkpointed after every page so an interrupted run resumes.
+        """
+        tag("reaction_role", guild.id)
+        self._build_role_map(guild)
+        guild_cfg = gcfg.get(str(guild.id), {})
+        rr = guild_cfg.get("reaction", {})
+        chan_id = rr.get("channel_id")
+        msg_id = rr.get("message_id")
+
+        if not chan_id or not msg_id:
+            return
 
-            self.bot.role_message_ids[guild.id] = msg.id
+        ch = guild.get_channel(chan_id)
+        if not isinstance(ch, discord.TextChannel):
+            return
 
-            # 🔁 Process reactions and apply roles
-            # Track roles added per member to avoid duplicate logs
-            member_roles_added = {}
-            for reaction in msg.reactions:
-                async for user in reaction.users():
-                    if user.bot:
-                        continue
-                    member = guild.get_member(user.id)
-                    if not member:
+        warm = self._warm.pop(str(guild.id), None)
+        if (
+            warm
+            and warm["message_id"] == msg_id
+            and "reconcile" not in rr
+            and time.time() - warm["reconciled_at"] < WARM_RECONCILE_MAX_AGE_SEC
+        ):
+            # Reconciled shortly before a clean restart: skip re-paging reactors
+            self.bot.role_message_ids[guild.id] = msg_id
+            if not guild.chunked:
+                async with limiter:
+                    await guild.chunk()
+                role_counter.recount_guild(guild)
+            self.reconciled_at[guild.id] = warm["reconciled_at"]
+            live_feed.log(
+                "Skipped reaction role reconcile (warm restart)",
+                "Guild: {} • Message ID: {} • Reconciled: <t:{}:R>",
+                guild,
+                ch,
+                guild.name, msg_id, int(warm["reconciled_at"]),
+                phase="reconcile",
+            )
+            return
+
+        try:
+            async with limiter:
+                msg = await ch.fetch_message(msg_id)
+            live_feed.log(
+                "Loaded reaction role message",
+                "Guild: {} • Channel: #{} • Message ID: {}",
+                guild,
+                ch,
+                guild.name, ch.name, msg_id,
+            )
+        except (discord.NotFound, discord.Forbidden):
+            live_feed.log(
+                "Failed to load reaction role message",
+                "Guild: {} • Channel ID: {} • Message ID: {} • Error: Message not found",
+                guild,
+                None,
+                guild.name, chan_id, msg_id,
+            )
+            return
+
+        self.bot.role_message_ids[guild.id] = msg.id
+
+        # Lazy member mode: only guilds with a reaction message get chunked,
+        # since the holder diff below needs their full member list
+        if not guild.chunked:
+            async with limiter:
+                await guild.chunk()
+            role_counter.recount_guild(guild)
+
+        cp, resumed = self._load_checkpoint(rr, msg.id)
+        if resumed:
+            live_feed.log(
+                "Resuming reaction role reconcile",
+                "Guild: {} • Done: {} • After: {}",
+                guild,
+                ch,
+                guild.name, ', '.join(cp['done']) or 'none', cp['after'],
+            )
+
+        granted = 0
+        for reaction in msg.reactions:
+            emoji = str(reaction.emoji)
+            if emoji in cp["done"]:
+                continue
+            role = self._get_role(guild, reaction.emoji)
+            if not role:
+                continue
+
+            holders = {m.id for m in role.members}
+            after = cp["after"] if cp["emoji"] == emoji else None
+            cp["emoji"], cp["after"] = emoji, after
+            users = reaction.users(
+                limit=None, after=discord.Object(id=after) if after else None
+            )
+
+            exhausted = False
+            while not exhausted:
+                # One page (one REST call) per limiter slot
+                page = []
+                async with limiter:
+                    try:
+                        while len(page) < 100:
+                            page.append(await anext(users))
+                    except StopAsyncIteration:
+                        exhausted = True
+
+                queued = 0
+                for user in page:
+                    if user.bot or user.id in holders:
                         continue
-                    role_name = ROLE_EMOJIS.get(str(reaction.emoji))
-                    if role_name:
-                        role = discord.utils.get(guild.roles, name=role_name)
-                        if role and role not in member.roles:
-                            try:
-                                await member.add_roles(role)
-                                if member.id not in member_roles_added:
-                                    member_roles_added[member.id] = set()
-                                member_roles_added[member.id].add(role)
-                            except discord.Forbidden:
-                                log.warning(f"Cannot add role {role.name} to {member}.")
-                                live_feed.log(
-                                    "Failed to add role via reaction",
-                                    f"Guild: {guild.name} • User: {member} • Role: {role.name} • Error: No permission",
-                                    guild,
-                                    ch,
-                                )
-
-            # Log all roles added per member
-            for member_id, roles in member_roles_added.items():
-                member = guild.get_member(member_id)
-                if member and roles:
-                    role_names = ", ".join(r.name for r in roles)
-                    live_feed.log(
-                        "Roles added via reaction (startup)",
-                        f"Guild: {guild.name} • User: {member} • Roles: {role_names}",
-                        guild,
-                        ch,
-                    )
+                    self.role_queue.enqueue(guild, user.id, role.id, add=True)
+                    queued += 1
+                granted += queued
+
+                if page:
+                    if queued:
+                        # The checkpoint may only pass grants that have landed;
+                        # a restart would never revisit ones still queued
+                        await self.role_queue.drain(guild.id)
+                    cp["after"] = page[-1].id
+                    save_config(gcfg)
+
+            cp["done"].append(emoji)
+            cp["emoji"], cp["after"] = None, None
+            save_config(gcfg)
+
+        rr.pop("reconcile", None)
+        save_config(gcfg)
+        self.reconciled_at[guild.id] = time.time()
+        if granted:
+            live_feed.log(
+                "Roles queued via reaction (startup)",
+                "Guild: {} • Missing grants: {}",
+                guild,
+                ch,
+                guild.name, granted,
+            )
 
 
 async def setup(bot: commands.Bot):
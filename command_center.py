@@ -1,77 +1,203 @@
 import threading
 import asyncio
+import contextvars
+import functools
+import io
+import json
 import os
 import sys
 import time
+import random
 import discord
+from collections import deque
 from datetime import datetime, timezone
-from config import gcfg
+from config import (
+    gcfg,
+    LIVE_FEED_RECORD,
+    LIVE_FEED_BUFFER_SIZE,
+    LIVE_FEED_AGGREGATE_SEC,
+    LIVE_FEED_SAMPLE_RATES,
+    CONTROL_SOCKET_PATH,
+    CONTROL_PORT,
+    CLUSTER_ID,
+    SHARD_COUNT,
+    SHARD_IDS,
+)
+from command_sync import sync_stats
+import event_log
+from loop_monitor import loop_monitor
+import profiler
+from rest_accounting import rest_accounting
+from circuit_breaker import channel_breaker
+from channel_cache import channel_cache
 
 # ────────────────────────────────────────────────────────────
 # Live Feed Manager
 # ────────────────────────────────────────────────────────────
 
 class LiveFeed:
+    """
+    Recent-activity feed backed by a bounded ring buffer.
+
+    Repeats of the same action within LIVE_FEED_AGGREGATE_SEC are merged
+    into one entry with a count, actions can be sampled per prefix, and the
+    oldest entries are dropped once the buffer is full. `enabled` controls
+    recording; `tail` additionally prints entries as they are flushed. An
+    attached sink (see event_log.py) receives every entry as it is logged,
+    before sampling and aggregation.
+    """
+
     def __init__(self):
-        self.enabled = False
-        self._queue = asyncio.Queue()
+        self.enabled = LIVE_FEED_RECORD
+        self.tail = False
+        self.buffer = deque(maxlen=LIVE_FEED_BUFFER_SIZE)
+        self.sample_rates = dict(LIVE_FEED_SAMPLE_RATES)
+        self._pending: dict[str, dict] = {}
+        self._record = LIVE_FEED_RECORD
+        self._sink = None
         self._task = None
         self._lock = threading.Lock()
         self._shutdown = False
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def log(
+        self,
+        action: str,
+        details: str = "",
+        guild: discord.Guild = None,
+        channel: discord.TextChannel = None,
+        *args,
+        entity_id=None,
+        phase: str = None,
+        duration: float = None,
+    ):
+        """
+        Record a feed entry. Does nothing while the feed is off.
+
+        `details` may be a str.format template filled from `args`, so the
+        message is only built when someone is watching:
 
-    def log(self, action: str, details: str = "", guild: discord.Guild = None, channel: discord.TextChannel = None):
+            live_feed.log("Sent ping", "Bear ID: {} • Phase: {}", guild, ch, ev.id, phase)
+
+        For anything costlier than the arguments themselves, check
+        `live_feed.enabled` first. entity_id/phase/duration are carried into
+        the structured event log.
+        """
         if not self.enabled or self._shutdown:
             return
-        timestamp = datetime.now(timezone.utc).strftime("%H:%M:%S")
+        if self._sink is None and self._thinned(action, guild):
+            # Nothing else needs this entry, so skip building it
+            return
+
+        if args:
+            details = details.format(*args)
         entry = {
-            "timestamp": timestamp,
+            "time": time.time(),
             "action": action,
             "details": details,
             "guild": guild.name if guild else None,
-            "channel": f"#{channel.name}" if channel else None
+            "channel": f"#{channel.name}" if channel else None,
+            "guild_id": guild.id if guild else None,
+            "channel_id": channel.id if channel else None,
+            "entity_id": entity_id,
+            "phase": phase,
+            "duration": duration,
+            "count": 1,
+            "guilds": {guild.id} if guild else set(),
         }
-        try:
-            asyncio.run_coroutine_threadsafe(self._queue.put(entry), asyncio.get_event_loop())
-        except:
-            pass
+        if self._sink is not None:
+            # The sink gets every entry as logged; sampling and aggregation
+            # only thin out the console tail and the ring buffer
+            self._sink(entry)
+            if self._thinned(action, guild):
+                return
+        self._pending[action] = entry
+
+    def _thinned(self, action: str, guild: discord.Guild | None) -> bool:
+        """Sample out or merge an entry for the tail and buffer; True if it was."""
+        if self.sample_rates and random.random() >= self._sample_rate(action):
+            self.sampled_out += 1
+            return True
+        entry = self._pending.get(action)
+        if entry:
+            # Merge into the open aggregate; keep the first entry's details
+            entry["count"] += 1
+            if guild:
+                entry["guilds"].add(guild.id)
+            return True
+        return False
+
+    def _sample_rate(self, action: str) -> float:
+        for prefix, rate in self.sample_rates.items():
+            if action.startswith(prefix):
+                return rate
+        return 1.0
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for entry in pending.values():
+            entry["guilds"] = len(entry["guilds"])
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(entry)
+            if self.tail:
+                print(self.format_entry(entry))
 
-    async def _process_queue(self):
+    @staticmethod
+    def format_entry(entry: dict) -> str:
+        timestamp = datetime.fromtimestamp(entry["time"], tz=timezone.utc).strftime("%H:%M:%S")
+        header = f"\n[{timestamp}]"
+        action = entry["action"]
+        if entry["count"] > 1:
+            action += f" ×{entry['count']}"
+            if entry["guilds"] > 1:
+                action += f" ({entry['guilds']} guilds)"
+        elif entry["guild"]:
+            header += f" [{entry['guild']}]"
+        if entry["channel"] and entry["count"] == 1:
+            header += f" {entry['channel']}"
+        line = f"{header}\n• {action}"
+        if entry["details"]:
+            line += f"\n  → {entry['details']}"
+        return line
+
+    def recent(self, limit: int = 20, match: str = None) -> list[dict]:
+        """Newest entries last, optionally filtered by a substring of action/details/guild."""
+        self._flush()
+        entries = list(self.buffer)
+        if match:
+            match = match.lower()
+            entries = [
+                e for e in entries
+                if match in e["action"].lower()
+                or match in (e["details"] or "").lower()
+                or match in (e["guild"] or "").lower()
+            ]
+        return entries[-limit:]
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self.buffer),
+            "capacity": self.buffer.maxlen,
+            "pending": len(self._pending),
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+        }
+
+    async def _flush_loop(self):
         while not self._shutdown:
+            await asyncio.sleep(LIVE_FEED_AGGREGATE_SEC)
             try:
-                entry = await self._queue.get()
-                if not self.enabled or self._shutdown:
-                    self._queue.task_done()
-                    continue
-                print(f"\n[{entry['timestamp']}]", end="")
-                if entry['guild']:
-                    print(f" [{entry['guild']}]", end="")
-                if entry['channel']:
-                    print(f" {entry['channel']}", end="")
-                print(f"\n• {entry['action']}")
-                if entry['details']:
-                    print(f"  → {entry['details']}")
-            except asyncio.CancelledError:
-                self._shutdown = True
-                while not self._queue.empty():
-                    try:
-                        self._queue.get_nowait()
-                        self._queue.task_done()
-                    except:
-                        pass
-                raise
+                self._flush()
             except Exception as e:
                 print(f"❌ Live feed error: {e}")
-                if not self._queue.empty():
-                    self._queue.task_done()
-            else:
-                if not self._queue.empty():
-                    self._queue.task_done()
 
     def start(self, loop: asyncio.AbstractEventLoop):
         with self._lock:
             if self._task is None:
                 self._shutdown = False
-                self._task = loop.create_task(self._process_queue())
+                self._task = loop.create_task(self._flush_loop())
 
     def stop(self):
         with self._lock:
@@ -79,17 +205,21 @@ class LiveFeed:
                 self._shutdown = True
                 self._task.cancel()
                 self._task = None
-                while not self._queue.empty():
-                    try:
-                        self._queue.get_nowait()
-                        self._queue.task_done()
-                    except:
-                        pass
+                self._pending.clear()
+
+    def attach_sink(self, sink):
+        """Send every logged entry to `sink(entry)`; keeps recording on."""
+        with self._lock:
+            self._sink = sink
+            self._record = True
+            self.enabled = True
 
     def toggle(self, enabled: bool = None) -> bool:
+        """Switch the live tail; recording follows it unless something else needs it."""
         with self._lock:
-            self.enabled = not self.enabled if enabled is None else enabled
-            return self.enabled
+            self.tail = not self.tail if enabled is None else enabled
+            self.enabled = self.tail or self._record
+            return self.tail
 
 live_feed = LiveFeed()
 
@@ -97,73 +227,239 @@ live_feed = LiveFeed()
 # Command Center Entry
 # ────────────────────────────────────────────────────────────
 
+class _Capture:
+    def __init__(self):
+        self.buf = io.StringIO()
+        self.active = True
+        # Run by the control server once the reply has been sent
+        self.after_reply = None
+
+
+# Output of the control-socket command running in the current task
+_capture: contextvars.ContextVar[_Capture | None] = contextvars.ContextVar("cc_capture", default=None)
+
+
+class _TaskStdout:
+    """
+    stdout proxy that sends print() from a control-socket command back to
+    its client. Tasks spawned by a command inherit the capture, so writes
+    fall back to the real stdout once the command has returned.
+    """
+
+    def __init__(self, real):
+        self._real = real
+
+    def write(self, s):
+        cap = _capture.get()
+        if cap and cap.active:
+            return cap.buf.write(s)
+        return self._real.write(s)
+
+    def flush(self):
+        self._real.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._real, name)
+
+
+_control_server = None
+
+
 def start_command_center(bot):
     live_feed.start(bot.loop)
+    if _control_server is None:
+        bot.loop.create_task(serve_control(bot))
 
-    def file_input_loop():
-        print("\n🧠 Command Center (File Mode) Started\nType commands into 'command_center_input.txt' (one per line). File will be cleared after reading.")
-        input_file = "command_center_input.txt"
-        while True:
+
+async def serve_control(bot):
+    """
+    Serve admin commands on a local socket (CONTROL_SOCKET_PATH, or
+    127.0.0.1:CONTROL_PORT where Unix sockets are unavailable).
+
+    Clients send one command per line, either as plain text or as
+    {"command": "..."}; each gets a JSON line back with the command's
+    output. Clients are served concurrently. See kingshotctl.py.
+    """
+    global _control_server
+    if _control_server is not None:
+        return
+    if not isinstance(sys.stdout, _TaskStdout):
+        sys.stdout = _TaskStdout(sys.stdout)
+
+    handler = functools.partial(_serve_client, bot)
+    try:
+        if hasattr(asyncio, "start_unix_server"):
+            CONTROL_SOCKET_PATH.unlink(missing_ok=True)
+            _control_server = await asyncio.start_unix_server(handler, path=str(CONTROL_SOCKET_PATH))
+            os.chmod(CONTROL_SOCKET_PATH, 0o600)
+            where = CONTROL_SOCKET_PATH
+        else:
+            _control_server = await asyncio.start_server(handler, "127.0.0.1", CONTROL_PORT)
+            where = f"127.0.0.1:{CONTROL_PORT}"
+    except OSError as e:
+        print(f"❌ Command Center failed to listen: {e}")
+        return
+    print(f"\n🧠 Command Center listening on {where} (python kingshotctl.py /help)")
+
+
+async def _serve_client(bot, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while line := await reader.readline():
+            text = line.decode("utf-8", errors="replace").strip()
+            if not text:
+                continue
             try:
-                if os.path.exists(input_file):
-                    with open(input_file, "r+") as f:
-                        lines = [line.strip() for line in f if line.strip()]
-                        if lines:
-                            for raw in lines:
-                                print(f"\n🧠 (file) >> {raw}")
-                                args = raw.split()
-                                cmd = args[0].lower()
-                                handle_command(bot, cmd, args)
-                            f.seek(0)
-                            f.truncate()
-                time.sleep(2)
-            except Exception as e:
-                print(f"❌ File input error: {e}")
-                time.sleep(2)
+                raw = json.loads(text).get("command", "") if text.startswith("{") else text
+            except (json.JSONDecodeError, AttributeError):
+                raw = ""
+            cap = _Capture()
+            response = await run_captured(bot, str(raw), cap)
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            await writer.drain()
+            if cap.after_reply:
+                await cap.after_reply()
+    except (ConnectionResetError, BrokenPipeError):
+        pass
+    finally:
+        writer.close()
 
-    threading.Thread(target=file_input_loop, daemon=True).start()
+
+async def run_captured(bot, raw: str, cap: _Capture | None = None) -> dict:
+    """Run one command line and return its printed output as a response dict."""
+    cap = cap or _Capture()
+    token = _capture.set(cap)
+    start = time.perf_counter()
+    try:
+        args = raw.split()
+        if not args:
+            print("❌ Empty command")
+            ok = False
+        else:
+            ok = await execute_command(bot, args[0].lower(), args)
+    except Exception as e:
+        print(f"❌ Command failed: {e}")
+        ok = False
+    finally:
+        cap.active = False
+        _capture.reset(token)
+    return {
+        "ok": ok,
+        "command": raw,
+        "output": cap.buf.getvalue().strip("\n"),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
 
 # ────────────────────────────────────────────────────────────
 # Command Dispatcher
 # ────────────────────────────────────────────────────────────
 
 def handle_command(bot, cmd, args):
-    loop = bot.loop
+    """Schedule a command on the bot's loop (safe to call from any thread)."""
+    return asyncio.run_coroutine_threadsafe(execute_command(bot, cmd, args), bot.loop)
+
+
+async def execute_command(bot, cmd, args) -> bool:
+    """Run a command on the bot's loop. Returns False for unknown commands."""
     dispatch = {
-        "/showservers": lambda: asyncio.run_coroutine_threadsafe(show_servers(bot), loop),
-        "/showbears": lambda: asyncio.run_coroutine_threadsafe(show_bears(bot), loop),
-        "/showevents": lambda: asyncio.run_coroutine_threadsafe(show_events(bot), loop),
-        "/reloadcogs": lambda: asyncio.run_coroutine_threadsafe(reload_all_cogs(bot), loop),
-        "/status": lambda: asyncio.run_coroutine_threadsafe(bot_status(bot), loop),
-        "/ping": lambda: asyncio.run_coroutine_threadsafe(show_ping(bot), loop),
-        "/auditroles": lambda: asyncio.run_coroutine_threadsafe(audit_roles(bot), loop),
+        "/showservers": lambda: show_servers(bot),
+        "/showbears": lambda: show_bears(bot),
+        "/showevents": lambda: show_events(bot),
+        "/reloadcogs": lambda: reload_all_cogs(bot),
+        "/status": lambda: bot_status(bot),
+        "/ping": lambda: show_ping(bot),
+        "/auditroles": lambda: audit_roles(bot),
         "/livefeedon": lambda: print(f"🔊 Live feed {'already ' if live_feed.toggle(True) else ''}ENABLED"),
         "/livefeedoff": lambda: print(f"🔇 Live feed {'already ' if not live_feed.toggle(False) else ''}DISABLED"),
         "/help": print_help
     }
 
     if cmd == "/reload" and len(args) >= 2:
-        asyncio.run_coroutine_threadsafe(reload_cog(bot, args[1]), loop)
+        await reload_cog(bot, args[1])
     elif cmd == "/serverdetails" and len(args) >= 2:
         print(gcfg.get(args[1], "⚠️ Not found."))
     elif cmd == "/send" and len(args) >= 4:
-        asyncio.run_coroutine_threadsafe(send_message(bot, args[1], args[2], " ".join(args[3:])), loop)
+        await send_message(bot, args[1], args[2], " ".join(args[3:]))
+    elif cmd == "/feed":
+        limit = int(args[1]) if len(args) >= 2 and args[1].isdigit() else 20
+        match = " ".join(args[2:] if len(args) >= 2 and args[1].isdigit() else args[1:]) or None
+        await show_feed(limit, match)
+    elif cmd == "/feedsample" and len(args) >= 3:
+        try:
+            rate = float(args[1])
+        except ValueError:
+            print("❌ Rate must be a number between 0 and 1")
+            return True
+        prefix = " ".join(args[2:])
+        live_feed.sample_rates[prefix] = max(0.0, min(1.0, rate))
+        print(f"🎲 Sampling '{prefix}' at {live_feed.sample_rates[prefix]:.0%}")
+    elif cmd == "/profile" and len(args) >= 2:
+        try:
+            seconds = float(args[1])
+        except ValueError:
+            print("❌ Usage: /profile <seconds> [top]")
+            return True
+        print(f"🔬 Profiling for {seconds:g}s...")
+        top = int(args[2]) if len(args) >= 3 and args[2].isdigit() else 15
+        print(await profiler.profile(seconds, top))
+    elif cmd == "/looplag":
+        print(loop_monitor.report(int(args[1]) if len(args) >= 2 and args[1].isdigit() else 10))
+    elif cmd == "/rest":
+        print(rest_accounting.report(int(args[1]) if len(args) >= 2 and args[1].isdigit() else 5))
+    elif cmd == "/restbudget" and len(args) >= 3:
+        feature = args[1]
+        if args[2].lower() == "off":
+            rest_accounting.set_budget(feature, None)
+            print(f"📡 REST budget for {feature} removed")
+            return True
+        action = args[3].lower() if len(args) >= 4 else "log"
+        try:
+            share = float(args[2])
+        except ValueError:
+            share = None
+        if share is None or not 0 < share <= 1 or action not in ("log", "throttle"):
+            print("❌ Usage: /restbudget <feature> <share 0-1|off> [log|throttle]")
+            return True
+        rest_accounting.set_budget(feature, share, action)
+        print(
+            f"📡 {feature}: {share:.0%} of the REST rate, {rest_accounting.limit(feature)} call(s) "
+            f"per {rest_accounting.window:g}s ({action})"
+        )
+    elif cmd == "/breakers":
+        if len(args) >= 2 and args[1].isdigit():
+            channel_breaker.reset_channel(int(args[1]), "reset by admin")
+            print(f"🔌 Breaker for channel {args[1]} reset")
+        print(channel_breaker.report())
+    elif cmd == "/migration":
+        if installer := bot.get_cog("Installer"):
+            print(f"\n🧩 Welcome embed migration {installer.welcome_migration.summary()}")
+        else:
+            print("❌ Installer cog not loaded")
     elif cmd == "/channels" and len(args) >= 2:
-        asyncio.run_coroutine_threadsafe(show_channels(bot, args[1]), loop)
+        await show_channels(bot, args[1])
     elif cmd == "/stop":
         print("\n🛑 Stopping bot...")
-        asyncio.run_coroutine_threadsafe(bot.close(), loop)
-        return
+        cap = _capture.get()
+        if cap is not None:
+            # Reply to the control client before the loop shuts down
+            cap.after_reply = bot.close
+        else:
+            await bot.close()
     elif cmd == "/restart":
         print("\n🔁 Restarting bot...")
-        live_feed.stop()
-        asyncio.run_coroutine_threadsafe(bot.close(), loop)
-        time.sleep(2)
-        os._exit(0)
+        cap = _capture.get()
+        if cap is not None:
+            # Reply to the control client first; the server restarts after
+            cap.after_reply = functools.partial(restart_bot, bot)
+        else:
+            await restart_bot(bot)
     elif cmd in dispatch:
-        dispatch[cmd]()
+        result = dispatch[cmd]()
+        if asyncio.iscoroutine(result):
+            await result
     else:
         print("❌ Unknown command. Type /help for available commands")
+        return False
+    return True
 
 def print_help():
     print("\nAvailable commands:")
@@ -180,11 +476,28 @@ def print_help():
     print("  /ping             Show bot latency")
     print("  /livefeedon       Enable live feed")
     print("  /livefeedoff      Disable live feed")
+    print("  /feed [n] [text]  Show recent feed entries, optionally filtered")
+    print("  /feedsample <rate> <action>  Keep only a share of an action's entries")
     print("  /send <gid> <channel> <msg> Send message")
     print("  /auditroles       Audit Bear/Arena roles")
+    print("  /looplag [n]      Show event loop lag and the top blocking call sites")
+    print("  /profile <sec> [n] Sample the running bot and show the hottest functions")
+    print("  /rest [n]         Show REST calls by feature and the n busiest guilds")
+    print("  /breakers [channel_id]  Show open channel breakers, or reset one")
+    print("  /migration        Show welcome embed migration progress and ETA")
+    print("  /restbudget <feature> <share|off> [log|throttle]  Set a feature's REST budget")
 
 # ────────────────────────────────────────────────────────────
 # Async Helpers
+async def restart_bot(bot):
+    """Close the bot and exit so the watchdog starts a fresh process."""
+    live_feed.stop()
+    await bot.close()
+    # os._exit skips atexit, so flush the event log here
+    if event_log.event_writer:
+        event_log.event_writer.close()
+    os._exit(0)
+
 # ────────────────────────────────────────────────────────────
 
 async def show_servers(bot):
@@ -231,8 +544,64 @@ async def bot_status(bot):
     print(f"\n👑 Bot Status:")
     print(f"• Name: {bot.user} ({bot.user.id})")
     print(f"• Guilds: {len(bot.guilds)}")
+    if CLUSTER_ID is not None:
+        print(f"• Cluster: {CLUSTER_ID} • Shards: {', '.join(map(str, SHARD_IDS))} of {SHARD_COUNT}")
     print(f"• Latency: {round(bot.latency * 1000)}ms")
-    print(f"• Live Feed: {'🔊 ON' if live_feed.enabled else '🔇 OFF'}")
+    print(f"• Live Feed: {'🔊 ON' if live_feed.tail else '🔇 OFF'}")
+    print(
+        f"• Loop Lag: {loop_monitor.last_lag * 1000:.0f}ms now • {loop_monitor.max_lag * 1000:.0f}ms max • "
+        f"{loop_monitor.stalls} stall(s)"
+    )
+    f = live_feed.stats()
+    print(
+        f"• Feed Buffer: {f['buffered']}/{f['capacity']} • "
+        f"{f['dropped']} dropped • {f['sampled_out']} sampled out"
+    )
+    print(
+        f"• Command Sync: {sync_stats['synced']} synced • "
+        f"{sync_stats['skipped']} skipped • {sync_stats['failed']} failed"
+    )
+    rest_calls = sum(s["count"] for s in rest_accounting.features.values())
+    if rest_calls:
+        busiest = max(rest_accounting.features.items(), key=lambda kv: kv[1]["count"])
+        print(
+            f"• REST: {rest_calls} call(s) • busiest {busiest[0]} "
+            f"({busiest[1]['count'] / rest_calls:.0%}) • /rest for details"
+        )
+    c = channel_cache.stats()
+    print(
+        f"• Channel Cache: {c['guilds']} guild(s) • {c['channels']} channel permission set(s) • "
+        f"{c['hits']} hits • {c['builds']} builds"
+    )
+    if channel_breaker.channels:
+        print(
+            f"• Channel Breakers: {channel_breaker.open_count()} open • "
+            f"{channel_breaker.skipped} attempt(s) skipped • /breakers for details"
+        )
+    if (installer := bot.get_cog("Installer")) and installer.welcome_migration.total:
+        print(f"• Welcome Migration: {installer.welcome_migration.summary()}")
+    if event_log.event_writer:
+        e = event_log.event_writer.stats()
+        print(
+            f"• Event Log: {e['written']} written • {e['queued']} queued • "
+            f"{e['dropped']} dropped • {e['rotations']} rotation(s)"
+        )
+    if rr := bot.get_cog("ReactionRole"):
+        q = rr.role_queue.stats()
+        print(
+            f"• Role Queue: {q['depth']} pending in {q['guilds']} guild(s) • "
+            f"{q['edits']} edits from {q['intents']} intents ({q['coalescing_ratio']:.0%} coalesced) • "
+            f"{q['edits_failed']} failed"
+        )
+
+async def show_feed(limit, match=None):
+    entries = live_feed.recent(limit, match)
+    if not entries:
+        state = "" if live_feed.enabled else " (recording is off — /livefeedon or KINGSHOT_LIVE_FEED_RECORD=1)"
+        return print(f"📭 No feed entries{state}")
+    print(f"\n📜 Last {len(entries)} feed entries{f' matching {match!r}' if match else ''}:")
+    for entry in entries:
+        print(live_feed.format_entry(entry))
 
 async def show_ping(bot):
     print(f"🏓 Ping: {round(bot.latency * 1000)}ms")
@@ -242,7 +611,7 @@ async def send_message(bot, gid, channel_name, msg):
         guild = bot.get_guild(int(gid))
         if not guild:
             return print("❌ Guild not found")
-        ch = discord.utils.get(guild.text_channels, name=channel_name)
+        ch = channel_cache.by_name(guild, channel_name)
         if not ch:
             return print("❌ Channel not found")
         await ch.send(msg)
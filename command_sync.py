@@ -0,0 +1,101 @@
+# command_sync.py
+
+import hashlib
+import json
+import logging
+import os
+
+import discord
+from discord.ext import commands
+
+from config import COMMAND_SYNC_STATE_PATH
+
+log = logging.getLogger("kingshot")
+
+# Counters reported by the command center
+sync_stats = {"synced": 0, "skipped": 0, "failed": 0}
+
+
+def _command_payload(tree: discord.app_commands.CommandTree, guild=None) -> list:
+    payload = []
+    for cmd in tree.get_commands(guild=guild):
+        try:
+            payload.append(cmd.to_dict(tree))
+        except TypeError:
+            # discord.py < 2.4 builds the payload without the tree
+            payload.append(cmd.to_dict())
+    return sorted(payload, key=lambda c: (c.get("type", 1), c["name"]))
+
+
+def tree_hash(tree: discord.app_commands.CommandTree, guild=None) -> str:
+    """Stable hash of the payload that tree.sync() would upload."""
+    data = json.dumps(_command_payload(tree, guild), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _load_state() -> dict:
+    try:
+        return json.loads(COMMAND_SYNC_STATE_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_state(state: dict) -> None:
+    COMMAND_SYNC_STATE_PATH.write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
+async def sync_commands(
+    bot: commands.Bot, force: bool = False, sync_global: bool = True
+) -> None:
+    """
+    Sync application commands only when their definitions changed.
+
+    Hashes are persisted per application so restarts with an unchanged tree
+    make no sync calls. Guilds are only synced when the tree holds
+    guild-scoped commands for them. Global commands are app-wide, so in a
+    cluster only one process passes sync_global.
+    """
+    force = force or os.getenv("KINGSHOT_FORCE_SYNC") == "1"
+    state = _load_state()
+    app_state = state.setdefault(str(bot.application_id), {})
+    guild_hashes = app_state.setdefault("guilds", {})
+
+    digest = tree_hash(bot.tree)
+    if not sync_global:
+        pass
+    elif not force and app_state.get("global") == digest:
+        sync_stats["skipped"] += 1
+        log.info("⏭️ Global commands unchanged, skipping sync.")
+    else:
+        synced = await bot.tree.sync()
+        app_state["global"] = digest
+        sync_stats["synced"] += 1
+        log.info(f"✅ Globally synced {len(synced)} commands.")
+
+    for guild in bot.guilds:
+        gid = str(guild.id)
+        if not bot.tree.get_commands(guild=guild):
+            # Nothing guild-scoped; only sync once to clear what we uploaded before
+            if gid not in guild_hashes:
+                sync_stats["skipped"] += 1
+                continue
+            digest = None
+        else:
+            digest = tree_hash(bot.tree, guild)
+        if not force and guild_hashes.get(gid) == digest:
+            sync_stats["skipped"] += 1
+            continue
+        try:
+            await bot.tree.sync(guild=guild)
+            sync_stats["synced"] += 1
+            log.info(f"🔁 Synced commands in {guild.name}")
+        except Exception as e:
+            sync_stats["failed"] += 1
+            log.error(f"Failed to sync commands in {guild.name}: {e}")
+            continue
+        if digest is None:
+            guild_hashes.pop(gid, None)
+        else:
+            guild_hashes[gid] = digest
+
+    _save_state(state)
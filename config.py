@@ -6,6 +6,8 @@ from pathlib import Path
 
 import discord
 
+from startup_trace import startup_tracer
+
 #  ─── Game-Wide Constants ───────────────────────────────────
 
 GAME_TIMEZONE = "UTC"
@@ -74,6 +76,8 @@ BEAR_LOG_CHANNEL = "🐾｜bear-log"
 ARENA_CHANNEL = "⚔｜arena"
 EVENT_CHANNEL = "🏆｜events"
 ROLE_EMOJIS = {"🐻": "Bear 🐻", "⚔️": "Arena ⚔️", "🏆": "Event 🏆"}
+# Config section holding each reaction role's persisted role_id
+ROLE_EMOJI_KEYS = {"🐻": "bear", "⚔️": "arena", "🏆": "event"}
 
 # ─── Guild Tracking ─────────────────────────────────────────
 MASTER_GUILD_ID = 1376296437448708206
@@ -81,6 +85,124 @@ SERVER_COUNT_CHANNEL_ID = 1381478611537760329
 
 # ─── Scheduler ─────────────────────────────────────────────────────
 SCHEDULER_INTERVAL_SEC = 60
+ROLE_COUNT_RECOUNT_SEC = 6 * 60 * 60  # full role watcher recount (consistency check)
+
+# ─── Reaction Role Updates ─────────────────────────────────────────
+ROLE_UPDATE_WINDOW_SEC = 2.0  # coalesce add/remove toggles within this window
+ROLE_UPDATE_MIN_INTERVAL_SEC = 0.5  # per-guild spacing between member edits
+RECONCILE_CONCURRENCY = 4  # reaction pages fetched at once across all guilds
+RECONCILE_CHECKPOINT_TTL_SEC = 3600  # resume an interrupted reconcile within this window
+
+# ─── Member Cache ──────────────────────────────────────────────────
+# KINGSHOT_LAZY_MEMBERS=1 skips member chunking at startup; members are then
+# fetched on demand and only guilds with reaction-role messages are chunked.
+LAZY_MEMBERS = os.getenv("KINGSHOT_LAZY_MEMBERS") == "1"
+MEMBER_LRU_SIZE = 5000  # members fetched on demand kept in memory
+MEMBER_LRU_TTL_SEC = 300  # fetched members go stale (no gateway updates)
+
+# ─── Clustering (cluster.py) ───────────────────────────────────────
+# Set by cluster.py for each child process. Unset, one process runs every
+# shard. A cluster owns the guilds on its shards, (guild_id >> 22) % count.
+CLUSTER_ID = int(os.getenv("KINGSHOT_CLUSTER_ID")) if os.getenv("KINGSHOT_CLUSTER_ID") else None
+SHARD_COUNT = int(os.getenv("KINGSHOT_SHARD_COUNT", "0"))
+SHARD_IDS = [int(s) for s in os.getenv("KINGSHOT_SHARD_IDS", "").split(",") if s.strip()] or None
+# Fleet-wide totals written by cluster.py from every cluster's heartbeat
+CLUSTER_STATUS_PATH = os.getenv("KINGSHOT_CLUSTER_STATUS_FILE")
+# Per-process files get this suffix so clusters don't share them
+CLUSTER_SUFFIX = f".{CLUSTER_ID}" if CLUSTER_ID is not None else ""
+
+
+def owns_guild(guild_id: int | str) -> bool:
+    """True if this process's shards receive the guild (always, unclustered)."""
+    if not SHARD_IDS:
+        return True
+    return (int(guild_id) >> 22) % SHARD_COUNT in SHARD_IDS
+
+
+# ─── Live Feed ─────────────────────────────────────────────────────
+# KINGSHOT_LIVE_FEED_RECORD=1 keeps recent entries for /feed queries even
+# while the live tail is off.
+LIVE_FEED_RECORD = os.getenv("KINGSHOT_LIVE_FEED_RECORD") == "1"
+LIVE_FEED_BUFFER_SIZE = 2000  # entries kept; the oldest are dropped first
+LIVE_FEED_AGGREGATE_SEC = 2.0  # repeats of an action within this window are merged
+# Share of entries kept per action prefix, e.g. {"Checking event welcome": 0.1}
+LIVE_FEED_SAMPLE_RATES: dict[str, float] = {}
+
+# ─── Structured Event Log ──────────────────────────────────────────
+# KINGSHOT_EVENT_LOG=logs/events.jsonl writes kingshot log records and live
+# feed entries as JSON lines from a background thread (see event_log.py).
+EVENT_LOG_PATH = os.getenv("KINGSHOT_EVENT_LOG")
+if EVENT_LOG_PATH and CLUSTER_SUFFIX:
+    _p = Path(EVENT_LOG_PATH)
+    EVENT_LOG_PATH = str(_p.with_name(_p.stem + CLUSTER_SUFFIX + _p.suffix))
+EVENT_LOG_MAX_BYTES = 20 * 1024 * 1024  # rotate (and gzip) past this size
+EVENT_LOG_BACKUPS = 5  # compressed archives kept
+EVENT_LOG_BATCH_SIZE = 500  # records per write
+EVENT_LOG_FLUSH_SEC = 1.0  # max wait before a partial batch is written
+EVENT_LOG_QUEUE_SIZE = 50_000  # records buffered before new ones are dropped
+
+# ─── Control Socket ────────────────────────────────────────────────
+# Local admin commands (command_center.py, kingshotctl.py). Where Unix
+# sockets are unavailable the server listens on 127.0.0.1:CONTROL_PORT.
+# Cluster N uses kingshot.N.sock / CONTROL_PORT + N.
+CONTROL_SOCKET_PATH = Path(
+    os.getenv("KINGSHOT_CONTROL_SOCKET", Path(__file__).parent / f"kingshot{CLUSTER_SUFFIX}.sock")
+)
+CONTROL_PORT = int(os.getenv("KINGSHOT_CONTROL_PORT", "8765")) + (CLUSTER_ID or 0)
+
+# ─── Metrics ───────────────────────────────────────────────────────
+# KINGSHOT_METRICS_PORT=9464 serves Prometheus metrics at /metrics
+# (cluster N on 9464 + N)
+METRICS_PORT = int(os.getenv("KINGSHOT_METRICS_PORT", "0"))
+if METRICS_PORT:
+    METRICS_PORT += CLUSTER_ID or 0
+METRICS_HOST = os.getenv("KINGSHOT_METRICS_HOST", "127.0.0.1")
+
+# ─── REST Budgets (rest_accounting.py) ─────────────────────────────
+# Budgets are shares of Discord's global REST rate over a sliding window.
+# Past its share a feature is logged ("log") or held back ("throttle").
+# Change them at runtime with /restbudget.
+REST_GLOBAL_RATE_PER_SEC = 50
+REST_BUDGET_WINDOW_SEC = 10
+REST_BUDGETS: dict[str, tuple[float, str]] = {
+    "welcome_migration": (0.2, "throttle"),
+    "role_count_rename": (0.05, "throttle"),
+    "bear_cleanup": (0.25, "log"),
+}
+
+# ─── Welcome Embed Migration (welcome_migration.py) ────────────────
+# When WELCOME_EMBED_VERSION changes, welcome embeds are re-rendered in the
+# background after boot; progress is kept per guild in bot_config.json
+WELCOME_MIGRATION_CONCURRENCY = 4  # guilds migrated at once
+WELCOME_MIGRATION_START_DELAY_SEC = 30  # let startup syncs go first
+WELCOME_MIGRATION_YIELD_SEC = 0.5  # recheck interval while pings are in flight
+
+# ─── Channel Circuit Breaker (circuit_breaker.py) ──────────────────
+# Channels that keep failing with Forbidden / Unknown Channel are skipped,
+# with one re-probe per backoff period (doubling up to the max)
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before opening
+BREAKER_PROBE_BASE_SEC = 5 * 60
+BREAKER_PROBE_MAX_SEC = 6 * 60 * 60
+
+# ─── Load Testing ──────────────────────────────────────────────────
+# KINGSHOT_DISCORD_URL=http://127.0.0.1:8790 sends REST and gateway traffic
+# to fake_discord.py instead of discord.com (see loadtest.py)
+DISCORD_URL = os.getenv("KINGSHOT_DISCORD_URL")
+
+# ─── Event Loop Monitor ────────────────────────────────────────────
+LOOP_MONITOR_INTERVAL_SEC = 0.1  # probe sleep; lag is how late it wakes
+LOOP_STALL_THRESHOLD_SEC = 0.1  # lag at which a stall is sampled and attributed
+LOOP_STALL_WARN_SEC = 1.0  # stalls this long are also logged
+
+# ─── Profiler (/profile <seconds>) ─────────────────────────────────
+PROFILE_DIR = Path(os.getenv("KINGSHOT_PROFILE_DIR", Path(__file__).parent / "profiles"))
+PROFILE_SAMPLE_HZ = 100
+PROFILE_MAX_SECONDS = 300
+
+# ─── Heartbeat (watchdog.py) ───────────────────────────────────────
+# Set by the watchdog for its child; the bot rewrites the file from its loop
+HEARTBEAT_PATH = os.getenv("KINGSHOT_HEARTBEAT_FILE")
+HEARTBEAT_INTERVAL_SEC = 5
 
 #  ─── Load per-guild channels & IDs ─────────────────────────
 CONFIG_PATH = (
@@ -95,9 +217,19 @@ CONFIG_PATH = (
         )
     )
 )
+# Hashes of the last synced application command payloads (see command_sync.py)
+COMMAND_SYNC_STATE_PATH = CONFIG_PATH.with_name(f"command_sync_state{CLUSTER_SUFFIX}.json")
+# Runtime state written on clean shutdown and trusted on the next boot (see warm_state.py)
+STATE_SNAPSHOT_PATH = CONFIG_PATH.with_name(f"state_snapshot{CLUSTER_SUFFIX}.json")
+WARM_SNAPSHOT_MAX_AGE_SEC = 600  # older snapshots are ignored
+WARM_RECONCILE_MAX_AGE_SEC = 6 * 60 * 60  # a reaction reconcile is trusted this long
+
 if CONFIG_PATH.exists():
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+    with startup_tracer.span("config.load"), open(CONFIG_PATH, "r", encoding="utf-8") as f:
         gcfg = json.load(f)
 else:
     print(f"⚠️ Config file {CONFIG_PATH} not found — using empty config.")
     gcfg = {}
+if SHARD_IDS:
+    # Other clusters own (and write) the rest of the file
+    gcfg = {gid: cfg for gid, cfg in gcfg.items() if owns_guild(gid)}
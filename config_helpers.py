@@ -1,9 +1,8 @@
-import json
 from typing import Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
-from config import CONFIG_PATH  # Import CONFIG_PATH from config.py
+from config import CONFIG_PATH, gcfg
 import helpers
 
 # Configure logging
@@ -45,16 +44,12 @@ class ConfigValidationError(Exception):
 
 
 def _load_config() -> Dict[str, Any]:
-    """Load the bot config file"""
-    try:
-        with open(CONFIG_PATH, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        logger.error(f"Config file not found at {CONFIG_PATH}")
-        raise
-    except json.JSONDecodeError:
-        logger.error(f"Invalid JSON in config file at {CONFIG_PATH}")
-        raise
+    """
+    Return the live bot config. Reading bot_config.json here instead would
+    re-parse every guild on each scheduler tick, and saving that copy would
+    drop changes made to gcfg since the last write.
+    """
+    return gcfg
 
 
 def _save_config(config: Dict[str, Any]) -> None:
@@ -98,6 +93,15 @@ def _validate_chronological_order(
                 )
 
 
+def _get_ping_settings(guild_id: str, notification_type: NotificationType) -> Dict[str, Any]:
+    """A guild's stored ping settings for one system, without creating them"""
+    return (
+        gcfg.get(str(guild_id), {})
+        .get(notification_type.value, {})
+        .get("ping_settings", {})
+    )
+
+
 def _ensure_notification_settings(
     config: Dict[str, Any], guild_id: str, notification_type: NotificationType
 ) -> None:
@@ -134,10 +138,7 @@ def _ensure_notification_settings(
 # Bear notification helpers
 def get_bear_ping_settings(guild_id: str) -> BearPingSettings:
     """Get bear notification settings for a guild"""
-    config = _load_config()
-    _ensure_notification_settings(config, guild_id, NotificationType.BEAR)
-
-    settings = config[guild_id]["bear"]["ping_settings"]
+    settings = _get_ping_settings(guild_id, NotificationType.BEAR)
     return BearPingSettings(
         incoming_enabled=settings.get("incoming_enabled", True),
         pre_attack_enabled=settings.get("pre_attack_enabled", True),
@@ -157,11 +158,11 @@ def update_bear_ping_setting(guild_id: str, key: str, value: Any) -> None:
     elif key not in ["incoming_enabled", "pre_attack_enabled"]:
         raise ConfigValidationError(f"Invalid setting key: {key}")
 
+    # Validate a copy: config is the live gcfg, so a rejected value must
+    # never reach it
+    _validate_chronological_order({**settings, key: value}, NotificationType.BEAR)
     settings[key] = value
 
-    # Validate chronological order after update
-    _validate_chronological_order(settings, NotificationType.BEAR)
-
     _save_config(config)
     logger.info(f"Updated bear ping setting for guild {guild_id}: {key}={value}")
 
@@ -169,10 +170,7 @@ def update_bear_ping_setting(guild_id: str, key: str, value: Any) -> None:
 # Arena notification helpers
 def get_arena_ping_settings(guild_id: str) -> ArenaPingSettings:
     """Get arena notification settings for a guild"""
-    config = _load_config()
-    _ensure_notification_settings(config, guild_id, NotificationType.ARENA)
-
-    settings = config[guild_id]["arena"]["ping_settings"]
+    settings = _get_ping_settings(guild_id, NotificationType.ARENA)
     return ArenaPingSettings(
         ping_enabled=settings.get("ping_enabled", True),
         ping_offset=settings.get("ping_offset", 10),
@@ -199,10 +197,7 @@ def update_arena_ping_setting(guild_id: str, key: str, value: Any) -> None:
 # Event notification helpers
 def get_event_ping_settings(guild_id: str) -> EventPingSettings:
     """Get event notification settings for a guild"""
-    config = _load_config()
-    _ensure_notification_settings(config, guild_id, NotificationType.EVENT)
-
-    settings = config[guild_id]["event"]["ping_settings"]
+    settings = _get_ping_settings(guild_id, NotificationType.EVENT)
     return EventPingSettings(
         reminder_enabled=settings.get("reminder_enabled", True),
         reminder_offset=settings.get("reminder_offset", 60),
@@ -223,11 +218,11 @@ def update_event_ping_setting(guild_id: str, key: str, value: Any) -> None:
     elif key not in ["reminder_enabled", "final_call_enabled"]:
         raise ConfigValidationError(f"Invalid setting key: {key}")
 
+    # Validate a copy: config is the live gcfg, so a rejected value must
+    # never reach it
+    _validate_chronological_order({**settings, key: value}, NotificationType.EVENT)
     settings[key] = value
 
-    # Validate chronological order after update
-    _validate_chronological_order(settings, NotificationType.EVENT)
-
     _save_config(config)
     logger.info(f"Updated event ping setting for guild {guild_id}: {key}={value}")
 
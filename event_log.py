@@ -0,0 +1,216 @@
+# event_log.py
+
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from config import (
+    EVENT_LOG_PATH,
+    EVENT_LOG_MAX_BYTES,
+    EVENT_LOG_BACKUPS,
+    EVENT_LOG_BATCH_SIZE,
+    EVENT_LOG_FLUSH_SEC,
+    EVENT_LOG_QUEUE_SIZE,
+)
+
+log = logging.getLogger("kingshot")
+
+# Structured fields callers may pass via `extra=` on the kingshot logger
+RECORD_FIELDS = ("guild_id", "channel_id", "entity_id", "phase", "duration")
+
+
+class JsonLinesWriter:
+    """
+    Append JSON lines to a file from a background thread.
+
+    write() only enqueues, so callers on the event loop never touch the
+    disk. The thread writes in batches of up to `batch_size` records, and
+    once the file passes `max_bytes` it is gzipped to `<name>.1.gz`, with
+    older archives shifted up to `backups`. If the queue is full, records
+    are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = EVENT_LOG_MAX_BYTES,
+        backups: int = EVENT_LOG_BACKUPS,
+        batch_size: int = EVENT_LOG_BATCH_SIZE,
+        flush_interval: float = EVENT_LOG_FLUSH_SEC,
+        queue_size: int = EVENT_LOG_QUEUE_SIZE,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def write(self, record: dict) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush what is queued and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        f = open(self.path, "a", encoding="utf-8")
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    for record in batch:
+                        f.write(json.dumps(record, ensure_ascii=False, default=str))
+                        f.write("\n")
+                    f.flush()
+                    self.written += len(batch)
+                    if f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.path, "a", encoding="utf-8")
+                if stop:
+                    return
+        except Exception as e:
+            # Never let logging take the bot down; report once on stderr
+            print(f"❌ Event log writer stopped: {e}")
+        finally:
+            f.close()
+
+    def _next_batch(self) -> tuple[list[dict], bool]:
+        """Block for the first record, then drain up to batch_size more."""
+        batch = []
+        try:
+            first = self._queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return batch, False
+        if first is None:
+            return batch, True
+        batch.append(first)
+        while len(batch) < self.batch_size:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is None:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def _archive(self, n: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{n}.gz")
+
+    def _rotate(self):
+        for n in range(self.backups - 1, 0, -1):
+            if self._archive(n).exists():
+                os.replace(self._archive(n), self._archive(n + 1))
+        with open(self.path, "rb") as src, gzip.open(self._archive(1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        self.path.unlink()
+        self.rotations += 1
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+        }
+
+
+class JsonLinesHandler(logging.Handler):
+    """Logging handler that hands records to a JsonLinesWriter."""
+
+    def __init__(self, writer: JsonLinesWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            entry = {
+                "ts": round(record.created, 3),
+                "type": "log",
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+            }
+            for field in RECORD_FIELDS:
+                value = getattr(record, field, None)
+                if value is not None:
+                    entry[field] = value
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            self.writer.write(entry)
+        except Exception:
+            self.handleError(record)
+
+
+def feed_record(entry: dict) -> dict:
+    """Turn a live feed entry, as logged, into an event log record."""
+    record = {
+        "ts": round(entry["time"], 3),
+        "type": "feed",
+        "action": entry["action"],
+        "details": entry["details"],
+        "guild_id": entry["guild_id"],
+        "channel_id": entry["channel_id"],
+    }
+    for field in ("entity_id", "phase", "duration"):
+        if entry.get(field) is not None:
+            record[field] = entry[field]
+    return record
+
+
+event_writer: JsonLinesWriter | None = None
+
+
+def setup_logging(live_feed) -> None:
+    """
+    Move log output off the event loop.
+
+    Console handlers installed by basicConfig are served from a
+    QueueListener thread. When KINGSHOT_EVENT_LOG is set, kingshot log
+    records and live feed entries are also written there as JSON lines.
+    """
+    global event_writer
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    if handlers and not any(isinstance(h, logging.handlers.QueueHandler) for h in handlers):
+        log_queue: queue.Queue = queue.Queue(-1)
+        for h in handlers:
+            root.removeHandler(h)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+
+    if not EVENT_LOG_PATH or event_writer:
+        return
+    event_writer = JsonLinesWriter(EVENT_LOG_PATH)
+    log.addHandler(JsonLinesHandler(event_writer))
+    live_feed.attach_sink(lambda entry: event_writer.write(feed_record(entry)))
+    atexit.register(event_writer.close)
+    log.info(f"Structured event log: {EVENT_LOG_PATH}")
@@ -0,0 +1,637 @@
+"""
+Local stand-in for the Discord API and gateway, for load testing bot.py.
+
+Serves just enough of REST (messages, reactions, channels, roles, members,
+command sync) and the JSON gateway (HELLO, READY, GUILD_CREATE, member
+chunks, heartbeats) for the cogs to run unmodified against a generated set
+of guilds. Every REST response carries X-RateLimit-* headers from a simple
+per-bucket limiter and can be delayed to mimic network latency.
+
+    python fake_discord.py --world world.json [--port 8790] [--latency-ms 50]
+
+Point the bot at it with KINGSHOT_DISCORD_URL=http://127.0.0.1:8790. Test
+drivers (see loadtest.py) use the /_fake/* endpoints to inject reactions and
+read request statistics.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+DISCORD_EPOCH_MS = 1420070400000
+API = "/api/v10"
+HEARTBEAT_INTERVAL_MS = 41250
+MEMBER_CHUNK_SIZE = 1000
+
+
+def snowflake(ms: float | None = None, seq: int = 0) -> int:
+    ms = int(ms if ms is not None else time.time() * 1000)
+    return ((ms - DISCORD_EPOCH_MS) << 22) | (seq & 0x3FFFFF)
+
+
+def iso_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def json_response(data, status: int = 200) -> web.Response:
+    # discord.py only decodes bodies whose content type is exactly
+    # application/json; aiohttp's json_response appends a charset
+    return web.Response(body=json.dumps(data).encode(), status=status, content_type="application/json")
+
+
+class NotFound(Exception):
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.payload = {"message": message, "code": code}
+
+
+class RateLimiter:
+    """Fixed-window limit per bucket, reported the way Discord reports it."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        # bucket -> (window reset time, remaining)
+        self._buckets: dict[str, tuple[float, int]] = {}
+
+    def take(self, bucket: str) -> tuple[bool, dict]:
+        now = time.time()
+        reset, remaining = self._buckets.get(bucket, (0.0, self.limit))
+        if now >= reset:
+            reset, remaining = now + self.window, self.limit
+        allowed = remaining > 0
+        if allowed:
+            remaining -= 1
+        self._buckets[bucket] = (reset, remaining)
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": f"{reset:.3f}",
+            "X-RateLimit-Reset-After": f"{max(reset - now, 0):.3f}",
+            "X-RateLimit-Bucket": str(abs(hash(bucket)) % 10**12),
+        }
+        if not allowed:
+            headers["Retry-After"] = f"{max(reset - now, 0):.3f}"
+            headers["X-RateLimit-Scope"] = "user"
+        return allowed, headers
+
+
+class FakeDiscord:
+    """
+    In-memory Discord for one bot user.
+
+    `world` is {"bot": user, "application_id": id, "guilds": [guild, ...]}
+    where each guild holds Discord-shaped "roles", "channels" and "members"
+    lists; loadtest.build_world() generates one.
+    """
+
+    def __init__(
+        self,
+        world: dict,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        rate_limit: int = 50,
+        rate_window: float = 1.0,
+    ):
+        self.bot = world["bot"]
+        self.application_id = world["application_id"]
+        self.guilds = {int(g["id"]): g for g in world["guilds"]}
+        self.channels: dict[int, dict] = {}
+        self.members: dict[tuple[int, int], dict] = {}
+        for g in self.guilds.values():
+            for ch in g["channels"]:
+                self.channels[int(ch["id"])] = ch
+            for m in g["members"]:
+                self.members[(int(g["id"]), int(m["user"]["id"]))] = m
+        # channel_id -> {message_id: message}
+        self.messages: dict[int, dict[int, dict]] = defaultdict(dict)
+        # message_id -> {emoji: [user_id, ...]}
+        self.reactions: dict[int, dict[str, list[int]]] = defaultdict(dict)
+        for msg in world.get("messages", []):
+            self._store_message(msg)
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.limiter = RateLimiter(rate_limit, rate_window)
+        self._seq = 0
+
+        # shard_id -> websocket, and the shard count the bot identified with
+        self.shards: dict[int, web.WebSocketResponse] = {}
+        self.shard_count = 1
+        self.identified_at: dict[int, float] = {}
+        self._sequences: dict[web.WebSocketResponse, int] = {}
+
+        # Statistics read by the test driver
+        self.rest_calls: Counter = Counter()
+        self.rest_seconds: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.gateway_events: Counter = Counter()
+        self.last_request_at = 0.0
+        # (guild, user, role) -> when the reaction that should cause it was sent
+        self.expected_roles: dict[tuple[int, int, int], float] = {}
+        self.role_latencies: list[float] = []
+
+    # ─── Helpers ───────────────────────────────────────────────
+    def next_id(self) -> int:
+        self._seq += 1
+        return snowflake(seq=self._seq)
+
+    def shard_for(self, guild_id: int) -> int:
+        return (guild_id >> 22) % self.shard_count
+
+    def _store_message(self, msg: dict):
+        self.messages[int(msg["channel_id"])][int(msg["id"])] = msg
+        for r in msg.pop("_reactions", []):
+            self.reactions[int(msg["id"])][r["emoji"]] = list(r["users"])
+
+    def _message_view(self, msg: dict) -> dict:
+        mid = int(msg["id"])
+        bot_id = int(self.bot["id"])
+        msg = dict(msg)
+        msg["reactions"] = [
+            {
+                "emoji": {"id": None, "name": emoji},
+                "count": len(users),
+                "count_details": {"burst": 0, "normal": len(users)},
+                "me": bot_id in users,
+                "me_burst": False,
+                "burst_colors": [],
+            }
+            for emoji, users in self.reactions.get(mid, {}).items()
+            if users
+        ]
+        return msg
+
+    def _user(self, user_id: int) -> dict:
+        if user_id == int(self.bot["id"]):
+            return self.bot
+        return {"id": str(user_id), "username": f"user{user_id % 100000}", "discriminator": "0", "avatar": None, "global_name": None}
+
+    async def _send(self, ws: web.WebSocketResponse, event: str, data: dict):
+        self._sequences[ws] = seq = self._sequences.get(ws, 0) + 1
+        self.gateway_events[event] += 1
+        await ws.send_str(json.dumps({"op": 0, "t": event, "s": seq, "d": data}))
+
+    async def dispatch(self, guild_id: int, event: str, data: dict):
+        """Send a DISPATCH to the shard that owns the guild."""
+        ws = self.shards.get(self.shard_for(guild_id))
+        if ws is not None and not ws.closed:
+            await self._send(ws, event, data)
+
+    # ─── REST middleware: latency, rate limits, accounting ───────
+    @web.middleware
+    async def middleware(self, request: web.Request, handler):
+        if not request.path.startswith(API):
+            return await handler(request)
+        route = request.match_info.route.resource.canonical if request.match_info.route.resource else request.path
+        key = f"{request.method} {route.removeprefix(API)}"
+        major = request.match_info.get("channel_id") or request.match_info.get("guild_id") or ""
+        start = time.perf_counter()
+        self.last_request_at = time.monotonic()
+        if self.latency:
+            await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+        allowed, headers = self.limiter.take(f"{key}:{major}")
+        self.rest_calls[key] += 1
+        if not allowed:
+            self.rate_limited[key] += 1
+            retry = float(headers["Retry-After"])
+            response = json_response(
+                {"message": "You are being rate limited.", "retry_after": retry, "global": False},
+                status=429,
+            )
+        else:
+            try:
+                response = await handler(request)
+            except NotFound as e:
+                response = json_response(e.payload, status=404)
+        response.headers.update(headers)
+        self.rest_seconds[key] += time.perf_counter() - start
+        return response
+
+    # ─── Gateway ───────────────────────────────────────────────
+    async def gateway(self, request: web.Request):
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL_MS}}))
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            op, d = payload.get("op"), payload.get("d")
+            if op == 1:
+                await ws.send_str(json.dumps({"op": 11}))
+            elif op == 2:
+                await self._identify(ws, d, f"ws://{request.host}/gateway")
+            elif op == 6:
+                # No resume support; the client re-identifies
+                await ws.send_str(json.dumps({"op": 9, "d": False}))
+            elif op == 8:
+                await self._send_member_chunks(ws, d)
+        for shard_id, sock in list(self.shards.items()):
+            if sock is ws:
+                del self.shards[shard_id]
+        self._sequences.pop(ws, None)
+        return ws
+
+    async def _identify(self, ws, d: dict, url: str):
+        shard_id, shard_count = d.get("shard", [0, 1])
+        self.shard_count = shard_count
+        self.shards[shard_id] = ws
+        self.identified_at[shard_id] = time.time()
+        guilds = [g for gid, g in self.guilds.items() if self.shard_for(gid) == shard_id]
+        await self._send(ws, "READY", {
+            "v": 10,
+            "user": self.bot,
+            "guilds": [{"id": g["id"], "unavailable": True} for g in guilds],
+            "session_id": f"fake-{shard_id}-{int(time.time())}",
+            "resume_gateway_url": url,
+            "application": {"id": str(self.application_id), "flags": 0},
+            "shard": [shard_id, shard_count],
+        })
+        for g in guilds:
+            await self._send(ws, "GUILD_CREATE", self._guild_create(g))
+            await asyncio.sleep(0)
+
+    def _guild_create(self, g: dict) -> dict:
+        return {
+            "id": g["id"],
+            "name": g["name"],
+            "owner_id": g["owner_id"],
+            "icon": None,
+            "features": [],
+            "emojis": [],
+            "stickers": [],
+            "roles": g["roles"],
+            "channels": g["channels"],
+            "threads": [],
+            "members": [m for m in g["members"] if m["user"]["id"] == self.bot["id"]],
+            "member_count": len(g["members"]),
+            "large": len(g["members"]) > 250,
+            "unavailable": False,
+            "joined_at": iso_now(),
+            "presences": [],
+            "voice_states": [],
+            "stage_instances": [],
+            "guild_scheduled_events": [],
+            "premium_tier": 0,
+            "preferred_locale": "en-US",
+        }
+
+    async def _send_member_chunks(self, ws, d: dict):
+        guild_ids = d["guild_id"] if isinstance(d["guild_id"], list) else [d["guild_id"]]
+        for gid in guild_ids:
+            members = self.guilds[int(gid)]["members"]
+            chunks = [members[i:i + MEMBER_CHUNK_SIZE] for i in range(0, len(members), MEMBER_CHUNK_SIZE)] or [[]]
+            for i, chunk in enumerate(chunks):
+                await self._send(ws, "GUILD_MEMBERS_CHUNK", {
+                    "guild_id": str(gid),
+                    "members": chunk,
+                    "chunk_index": i,
+                    "chunk_count": len(chunks),
+                    "nonce": d.get("nonce"),
+                })
+
+    # ─── REST: session & commands ──────────────────────────────
+    async def get_me(self, request):
+        return json_response(self.bot)
+
+    async def get_application(self, request):
+        return json_response({
+            "id": str(self.application_id),
+            "name": self.bot["username"],
+            "icon": None,
+            "description": "",
+            "bot_public": False,
+            "bot_require_code_grant": False,
+            "owner": self.bot,
+            "verify_key": "0" * 64,
+            "flags": 0,
+        })
+
+    async def get_gateway(self, request):
+        return json_response({
+            "url": f"ws://{request.host}/gateway",
+            "shards": 1,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+        })
+
+    async def put_commands(self, request):
+        body = await request.json()
+        for cmd in body:
+            cmd.setdefault("id", str(self.next_id()))
+            cmd.setdefault("application_id", str(self.application_id))
+            cmd.setdefault("version", "1")
+        return json_response(body)
+
+    # ─── REST: messages & reactions ────────────────────────────
+    def _channel(self, request) -> dict:
+        ch = self.channels.get(int(request.match_info["channel_id"]))
+        if ch is None:
+            raise NotFound("Unknown Channel", 10003)
+        return ch
+
+    def _message(self, request) -> dict:
+        ch = self._channel(request)
+        msg = self.messages[int(ch["id"])].get(int(request.match_info["message_id"]))
+        if msg is None:
+            raise NotFound("Unknown Message", 10008)
+        return msg
+
+    async def create_message(self, request):
+        ch = self._channel(request)
+        if request.content_type.startswith("multipart"):
+            form = await request.post()
+            body = json.loads(form.get("payload_json", "{}"))
+        else:
+            body = await request.json()
+        msg = {
+            "id": str(self.next_id()),
+            "channel_id": ch["id"],
+            "guild_id": ch["guild_id"],
+            "author": self.bot,
+            "content": body.get("content") or "",
+            "embeds": body.get("embeds") or [],
+            "timestamp": iso_now(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "components": [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+        }
+        self._store_message(msg)
+        return json_response(self._message_view(msg))
+
+    async def get_message(self, request):
+        return json_response(self._message_view(self._message(request)))
+
+    async def edit_message(self, request):
+        msg = self._message(request)
+        body = await request.json() if request.can_read_body else {}
+        for key in ("content", "embeds", "components"):
+            if key in body:
+                msg[key] = body[key]
+        msg["edited_timestamp"] = iso_now()
+        return json_response(self._message_view(msg))
+
+    async def delete_message(self, request):
+        msg = self._message(request)
+        del self.messages[int(msg["channel_id"])][int(msg["id"])]
+        self.reactions.pop(int(msg["id"]), None)
+        return web.Response(status=204)
+
+    async def bulk_delete(self, request):
+        ch = self._channel(request)
+        for mid in (await request.json()).get("messages", []):
+            self.messages[int(ch["id"])].pop(int(mid), None)
+        return web.Response(status=204)
+
+    async def history(self, request):
+        ch = self._channel(request)
+        limit = int(request.query.get("limit", 50))
+        before = int(request.query.get("before", 0)) or None
+        msgs = sorted(self.messages[int(ch["id"])].values(), key=lambda m: int(m["id"]), reverse=True)
+        if before:
+            msgs = [m for m in msgs if int(m["id"]) < before]
+        return json_response([self._message_view(m) for m in msgs[:limit]])
+
+    async def add_own_reaction(self, request):
+        msg = self._message(request)
+        users = self.reactions[int(msg["id"])].setdefault(request.match_info["emoji"], [])
+        if int(self.bot["id"]) not in users:
+            users.append(int(self.bot["id"]))
+        return web.Response(status=204)
+
+    async def get_reactions(self, request):
+        msg = self._message(request)
+        users = sorted(self.reactions[int(msg["id"])].get(request.match_info["emoji"], []))
+        after = int(request.query.get("after", 0))
+        limit = int(request.query.get("limit", 25))
+        page = [u for u in users if u > after][:limit]
+        return json_response([self._user(u) for u in page])
+
+    # ─── REST: guilds, members, roles, channels ───────────────
+    def _member(self, request) -> tuple[int, dict]:
+        gid = int(request.match_info["guild_id"])
+        member = self.members.get((gid, int(request.match_info["user_id"])))
+        if member is None:
+            raise NotFound("Unknown Member", 10007)
+        return gid, member
+
+    async def _member_changed(self, gid: int, member: dict, old_roles: set[str]):
+        uid = int(member["user"]["id"])
+        now = time.monotonic()
+        for rid in old_roles.symmetric_difference(member["roles"]):
+            sent = self.expected_roles.pop((gid, uid, int(rid)), None)
+            if sent is not None:
+                self.role_latencies.append(now - sent)
+        await self.dispatch(gid, "GUILD_MEMBER_UPDATE", {"guild_id": str(gid), **member})
+
+    async def get_member(self, request):
+        return json_response(self._member(request)[1])
+
+    async def edit_member(self, request):
+        gid, member = self._member(request)
+        body = await request.json()
+        old = set(member["roles"])
+        if "roles" in body:
+            member["roles"] = [str(r) for r in body["roles"]]
+        await self._member_changed(gid, member, old)
+        return json_response(member)
+
+    async def add_member_role(self, request):
+        gid, member = self._member(request)
+        old = set(member["roles"])
+        rid = request.match_info["role_id"]
+        if rid not in member["roles"]:
+            member["roles"].append(rid)
+        await self._member_changed(gid, member, old)
+        return web.Response(status=204)
+
+    async def remove_member_role(self, request):
+        gid, member = self._member(request)
+        old = set(member["roles"])
+        member["roles"] = [r for r in member["roles"] if r != request.match_info["role_id"]]
+        await self._member_changed(gid, member, old)
+        return web.Response(status=204)
+
+    async def create_channel(self, request):
+        gid = int(request.match_info["guild_id"])
+        body = await request.json()
+        ch = {
+            "id": str(self.next_id()),
+            "guild_id": str(gid),
+            "type": body.get("type", 0),
+            "name": body["name"],
+            "position": len(self.guilds[gid]["channels"]),
+            "parent_id": body.get("parent_id"),
+            "permission_overwrites": body.get("permission_overwrites", []),
+        }
+        self.guilds[gid]["channels"].append(ch)
+        self.channels[int(ch["id"])] = ch
+        await self.dispatch(gid, "CHANNEL_CREATE", ch)
+        return json_response(ch)
+
+    async def edit_channel(self, request):
+        ch = self._channel(request)
+        ch.update({k: v for k, v in (await request.json()).items() if k in ("name", "topic", "permission_overwrites")})
+        await self.dispatch(int(ch["guild_id"]), "CHANNEL_UPDATE", ch)
+        return json_response(ch)
+
+    async def create_role(self, request):
+        gid = int(request.match_info["guild_id"])
+        body = await request.json()
+        role = {
+            "id": str(self.next_id()),
+            "name": body.get("name", "new role"),
+            "color": body.get("color", 0),
+            "hoist": False,
+            "position": 1,
+            "permissions": "0",
+            "managed": False,
+            "mentionable": bool(body.get("mentionable")),
+            "flags": 0,
+        }
+        self.guilds[gid]["roles"].append(role)
+        await self.dispatch(gid, "GUILD_ROLE_CREATE", {"guild_id": str(gid), "role": role})
+        return json_response(role)
+
+    async def edit_role_positions(self, request):
+        gid = int(request.match_info["guild_id"])
+        return json_response(self.guilds[gid]["roles"])
+
+    async def unhandled(self, request):
+        # Anything the cogs call that is not modelled still succeeds
+        return json_response({})
+
+    # ─── Control endpoints for test drivers ────────────────────
+    async def react(self, reactions: list[dict]):
+        """
+        Apply and dispatch reactions, each {guild_id, channel_id, message_id,
+        emoji, user_id, add}. A role_id marks the role change the bot should
+        make in response; its delay is recorded in role_latencies.
+        """
+        now = time.monotonic()
+        for r in reactions:
+            gid, uid, mid = int(r["guild_id"]), int(r["user_id"]), int(r["message_id"])
+            users = self.reactions[mid].setdefault(r["emoji"], [])
+            if r["add"]:
+                if uid not in users:
+                    users.append(uid)
+            elif uid in users:
+                users.remove(uid)
+            if r.get("role_id"):
+                self.expected_roles[(gid, uid, int(r["role_id"]))] = now
+            data = {
+                "user_id": str(uid),
+                "channel_id": str(r["channel_id"]),
+                "message_id": str(mid),
+                "guild_id": str(gid),
+                "emoji": {"id": None, "name": r["emoji"]},
+                "burst": False,
+                "type": 0,
+            }
+            if r["add"]:
+                data["member"] = self.members[(gid, uid)]
+                data["message_author_id"] = self.bot["id"]
+            await self.dispatch(gid, "MESSAGE_REACTION_ADD" if r["add"] else "MESSAGE_REACTION_REMOVE", data)
+
+    async def inject_reactions(self, request):
+        await self.react(await request.json())
+        return json_response({"ok": True})
+
+    def stats(self) -> dict:
+        return {
+            "rest_calls": dict(self.rest_calls),
+            "rest_seconds": {k: round(v, 4) for k, v in self.rest_seconds.items()},
+            "rate_limited": dict(self.rate_limited),
+            "gateway_events": dict(self.gateway_events),
+            "shards_identified": sorted(self.identified_at),
+            "role_latencies": list(self.role_latencies),
+            "roles_pending": len(self.expected_roles),
+            "idle_sec": round(time.monotonic() - self.last_request_at, 3) if self.last_request_at else None,
+        }
+
+    async def get_stats(self, request):
+        return json_response(self.stats())
+
+    # ─── App ───────────────────────────────────────────────────
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self.middleware], client_max_size=16 * 1024 * 1024)
+        c, m = f"{API}/channels/{{channel_id}}", f"{API}/channels/{{channel_id}}/messages/{{message_id}}"
+        g = f"{API}/guilds/{{guild_id}}"
+        app.add_routes([
+            web.get("/gateway", self.gateway),
+            web.post("/_fake/reactions", self.inject_reactions),
+            web.get("/_fake/stats", self.get_stats),
+            web.get(f"{API}/users/@me", self.get_me),
+            web.get(f"{API}/oauth2/applications/@me", self.get_application),
+            web.get(f"{API}/gateway", self.get_gateway),
+            web.get(f"{API}/gateway/bot", self.get_gateway),
+            web.put(f"{API}/applications/{{app_id}}/commands", self.put_commands),
+            web.put(f"{API}/applications/{{app_id}}/guilds/{{guild_id}}/commands", self.put_commands),
+            web.post(f"{c}/messages", self.create_message),
+            web.get(f"{c}/messages", self.history),
+            web.post(f"{c}/messages/bulk-delete", self.bulk_delete),
+            web.get(m, self.get_message),
+            web.patch(m, self.edit_message),
+            web.delete(m, self.delete_message),
+            web.put(f"{m}/reactions/{{emoji}}/@me", self.add_own_reaction),
+            web.get(f"{m}/reactions/{{emoji}}", self.get_reactions),
+            web.patch(c, self.edit_channel),
+            web.get(f"{g}/members/{{user_id}}", self.get_member),
+            web.patch(f"{g}/members/{{user_id}}", self.edit_member),
+            web.put(f"{g}/members/{{user_id}}/roles/{{role_id}}", self.add_member_role),
+            web.delete(f"{g}/members/{{user_id}}/roles/{{role_id}}", self.remove_member_role),
+            web.post(f"{g}/channels", self.create_channel),
+            web.post(f"{g}/roles", self.create_role),
+            web.patch(f"{g}/roles", self.edit_role_positions),
+            web.route("*", f"{API}/{{tail:.*}}", self.unhandled),
+        ])
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8790) -> web.AppRunner:
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--world", required=True, help="world JSON (see loadtest.py --save-world)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--rate-limit", type=int, default=50, help="requests per bucket per window")
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with open(args.world, encoding="utf-8") as f:
+        world = json.load(f)
+    fake = FakeDiscord(world, args.latency_ms, args.jitter_ms, args.rate_limit, args.rate_window)
+
+    async def serve():
+        await fake.start(args.host, args.port)
+        print(f"🧪 Fake Discord on http://{args.host}:{args.port} ({len(fake.guilds)} guilds)")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# heartbeat.py
+
+import asyncio
+import faulthandler
+import json
+import logging
+import math
+import os
+import signal
+import time
+from pathlib import Path
+
+from discord.ext import commands
+
+from config import HEARTBEAT_PATH, HEARTBEAT_INTERVAL_SEC, CLUSTER_ID, SHARD_IDS
+from helpers import role_counter
+from loop_monitor import loop_monitor
+
+log = logging.getLogger("kingshot")
+
+
+async def _beat(bot: commands.Bot, path: Path):
+    tmp = path.with_name(path.name + ".tmp")
+    while True:
+        latency = bot.latency
+        data = {
+            "pid": os.getpid(),
+            "ts": time.time(),
+            "ready": bot.is_ready(),
+            "latency": round(latency, 4) if math.isfinite(latency) else None,
+            "loop_lag": round(loop_monitor.last_lag, 4),
+            # Aggregated across clusters by cluster.py
+            "cluster": CLUSTER_ID,
+            "shards": SHARD_IDS,
+            "guilds": len(bot.guilds),
+            "role_counts": dict(role_counter.totals),
+        }
+        try:
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            log.error(f"Failed to write heartbeat: {e}")
+        await asyncio.sleep(HEARTBEAT_INTERVAL_SEC)
+
+
+def start_heartbeat(bot: commands.Bot) -> None:
+    """
+    Write a heartbeat file from the event loop for watchdog.py.
+
+    The file is only rewritten while the loop is running callbacks, so a
+    stale timestamp means the loop is wedged even if the process is alive.
+    On POSIX, SIGUSR1 dumps every thread's stack to stderr so the watchdog
+    can record where a hung bot was stuck before killing it.
+    """
+    if not HEARTBEAT_PATH:
+        return
+    if hasattr(signal, "SIGUSR1"):
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+    path = Path(HEARTBEAT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    asyncio.create_task(_beat(bot, path))
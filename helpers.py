@@ -2,11 +2,28 @@
 
 import asyncio
 import json
+import os
+import time
+from collections import OrderedDict
 from pathlib import Path
 import discord
 from discord.ext import commands
 
-from config import gcfg, CONFIG_PATH  # unify the path with config.py
+from channel_cache import channel_cache
+from config import (
+    gcfg,
+    CONFIG_PATH,
+    MEMBER_LRU_SIZE,
+    MEMBER_LRU_TTL_SEC,
+    SHARD_IDS,
+    CLUSTER_STATUS_PATH,
+    owns_guild,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: clusters are POSIX-only
+    fcntl = None
 
 # ─── Constants ──────────────────────────────────────────────
 CATEGORY_NAME = "👑 Kingshot Bot"
@@ -15,6 +32,8 @@ CATEGORY_NAME = "👑 Kingshot Bot"
 # A queue to batch up config writes
 _write_queue: asyncio.Queue[dict] = asyncio.Queue()
 _config_writer_task = None
+# Counters exported by metrics.py
+config_write_stats = {"requested": 0, "written": 0, "bytes": 0, "seconds": 0.0}
 
 
 async def _config_writer():
@@ -23,10 +42,39 @@ async def _config_writer():
         # drain any extra queued writes so we only write the most recent state
         while not _write_queue.empty():
             data = await _write_queue.get()
-        CONFIG_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        start = time.perf_counter()
+        if SHARD_IDS:
+            # The lock can wait on other clusters, so it runs off the loop;
+            # serializing first keeps the thread off dicts the loop mutates
+            text = await asyncio.to_thread(_write_cluster_config, json.dumps(data))
+        else:
+            text = json.dumps(data, indent=2)
+            CONFIG_PATH.write_text(text, encoding="utf-8")
+        config_write_stats["written"] += 1
+        config_write_stats["bytes"] += len(text)
+        config_write_stats["seconds"] += time.perf_counter() - start
         _write_queue.task_done()
 
 
+def _write_cluster_config(own: str) -> str:
+    """
+    Replace only this cluster's guilds (`own`, as JSON) in the shared config file.
+
+    Every cluster rewrites the same file, so the read-merge-write runs under
+    an exclusive lock and the result is swapped in atomically.
+    """
+    with open(CONFIG_PATH.with_name(CONFIG_PATH.name + ".lock"), "w") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        merged = {gid: cfg for gid, cfg in load_config().items() if not owns_guild(gid)}
+        merged.update(json.loads(own))
+        text = json.dumps(merged, indent=2)
+        tmp = CONFIG_PATH.with_name(CONFIG_PATH.name + f".{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, CONFIG_PATH)
+    return text
+
+
 def start_config_writer():
     """Start the config writer task. Call this when the bot is running."""
     global _config_writer_task
@@ -47,6 +95,7 @@ def save_config(cfg: dict) -> None:
     """
     # make a shallow copy to avoid mutation issues
     _write_queue.put_nowait(cfg.copy())
+    config_write_stats["requested"] += 1
 
 
 def is_installed(guild_id: int) -> bool:
@@ -58,6 +107,67 @@ def is_installed(guild_id: int) -> bool:
     )
 
 
+# ─── Member Resolution ─────────────────────────────────────
+class MemberLRU:
+    """
+    Bounded cache of members fetched over REST for guilds that were not
+    chunked at startup. Entries expire after a TTL because fetched members
+    are not kept up to date by gateway events.
+    """
+
+    def __init__(self, maxsize: int = MEMBER_LRU_SIZE, ttl: float = MEMBER_LRU_TTL_SEC):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[int, int], tuple[float, discord.Member]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id: int, user_id: int) -> discord.Member | None:
+        key = (guild_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, member: discord.Member) -> None:
+        key = (member.guild.id, member.id)
+        self._entries[key] = (time.monotonic(), member)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict(self, guild_id: int, user_id: int) -> None:
+        self._entries.pop((guild_id, user_id), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+member_lru = MemberLRU()
+
+
+async def resolve_member(guild: discord.Guild, user_id: int) -> discord.Member | None:
+    """Return a member from the gateway cache, the LRU, or a REST fetch."""
+    member = guild.get_member(user_id)
+    if member or guild.chunked:
+        return member
+    member = member_lru.get(guild.id, user_id)
+    if member:
+        return member
+    try:
+        member = await guild.fetch_member(user_id)
+    except (discord.NotFound, discord.Forbidden):
+        return None
+    member_lru.put(member)
+    return member
+
+
 # ─── Discord Setup Helpers ─────────────────────────────────
 async def ensure_category(guild: discord.Guild) -> discord.CategoryChannel:
     if not is_installed(guild.id):
@@ -81,7 +191,7 @@ async def ensure_channel(
     locked: bool = False,
     category: discord.CategoryChannel | None = None,
 ) -> discord.TextChannel | None:
-    ch = discord.utils.get(guild.text_channels, name=name)
+    ch = channel_cache.by_name(guild, name)
     if ch:
         return ch
 
@@ -144,6 +254,20 @@ async def ensure_role(
 
 
 # ─── Guild Tracking ─────────────────────────────────────────
+def fleet_totals() -> dict | None:
+    """
+    Guild and role-watcher totals across all clusters, from the status file
+    cluster.py aggregates. None when not clustered or not yet written.
+    """
+    if not CLUSTER_STATUS_PATH:
+        return None
+    try:
+        with open(CLUSTER_STATUS_PATH, encoding="utf-8") as f:
+            return json.load(f)["totals"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
 async def update_guild_count(bot: commands.Bot) -> None:
     """Update master guild voice channel name with current server count."""
     from config import MASTER_GUILD_ID, SERVER_COUNT_CHANNEL_ID
@@ -156,54 +280,136 @@ async def update_guild_count(bot: commands.Bot) -> None:
     if not isinstance(channel, discord.VoiceChannel):
         return
 
-    new_name = f"{len(bot.guilds)} 👑 servers!"
+    totals = fleet_totals()
+    new_name = f"{totals['guilds'] if totals else len(bot.guilds)} 👑 servers!"
     if channel.name != new_name:
         try:
             await channel.edit(name=new_name)
         except discord.Forbidden:
             pass
 
+# ─── Role Watcher Counts ────────────────────────────────────
+# Role count channel IDs
+BEAR_COUNT_CHANNEL_ID = 1382954693034246235
+ARENA_COUNT_CHANNEL_ID = 1382954743206510633
+EVENT_COUNT_CHANNEL_ID = 1382954792468353056
+
+WATCHED_ROLE_KINDS = ("bear", "arena", "event")
+
+
+class RoleWatchCounter:
+    """
+    Fleet-wide bear/arena/event role holder counts, kept up to date from
+    gateway events instead of walking every role's member list.
+
+    Holders are tracked as member-ID sets per (guild, kind) so that the same
+    grant reported twice (e.g. by the reaction cog and on_member_update) is
+    only counted once; totals are updated alongside so reads are O(1).
+    """
+
+    def __init__(self):
+        self._holders: dict[tuple[int, str], set[int]] = {}
+        self.totals: dict[str, int] = {kind: 0 for kind in WATCHED_ROLE_KINDS}
+        self.last_recount: float = 0.0
+
+    @staticmethod
+    def kind_for_role(guild_id: int, role_id: int) -> str | None:
+        """Return which watched role (bear/arena/event) a role ID is, if any."""
+        guild_cfg = gcfg.get(str(guild_id), {})
+        for kind in WATCHED_ROLE_KINDS:
+            if guild_cfg.get(kind, {}).get("role_id") == role_id:
+                return kind
+        return None
+
+    def _set(self, guild_id: int, kind: str, members: set[int]) -> None:
+        old = self._holders.pop((guild_id, kind), set())
+        self.totals[kind] += len(members) - len(old)
+        if members:
+            self._holders[(guild_id, kind)] = members
+
+    def add(self, guild_id: int, role_id: int, member_id: int) -> None:
+        kind = self.kind_for_role(guild_id, role_id)
+        if not kind:
+            return
+        holders = self._holders.setdefault((guild_id, kind), set())
+        if member_id not in holders:
+            holders.add(member_id)
+            self.totals[kind] += 1
+
+    def remove(self, guild_id: int, role_id: int, member_id: int) -> None:
+        kind = self.kind_for_role(guild_id, role_id)
+        holders = self._holders.get((guild_id, kind)) if kind else None
+        if holders and member_id in holders:
+            holders.discard(member_id)
+            self.totals[kind] -= 1
+
+    def member_left(self, guild_id: int, member_id: int) -> None:
+        for kind in WATCHED_ROLE_KINDS:
+            holders = self._holders.get((guild_id, kind))
+            if holders and member_id in holders:
+                holders.discard(member_id)
+                self.totals[kind] -= 1
+
+    def role_deleted(self, guild_id: int, role_id: int) -> None:
+        kind = self.kind_for_role(guild_id, role_id)
+        if kind:
+            self._set(guild_id, kind, set())
+
+    def recount_guild(self, guild: discord.Guild) -> None:
+        """
+        Rebuild one guild's holder sets from the member cache.
+
+        An unchunked guild (lazy members) only caches members seen so far,
+        so there the cache is merged into the incremental set instead of
+        replacing it: cached members are corrected, the rest are kept.
+        """
+        guild_cfg = gcfg.get(str(guild.id), {})
+        for kind in WATCHED_ROLE_KINDS:
+            role_id = guild_cfg.get(kind, {}).get("role_id")
+            role = guild.get_role(role_id) if role_id else None
+            if not role:
+                self._set(guild.id, kind, set())
+            elif guild.chunked:
+                self._set(guild.id, kind, {m.id for m in role.members})
+            else:
+                holders = set(self._holders.get((guild.id, kind), ()))
+                for m in guild.members:
+                    if m.get_role(role.id):
+                        holders.add(m.id)
+                    else:
+                        holders.discard(m.id)
+                self._set(guild.id, kind, holders)
+
+    def forget_guild(self, guild_id: int) -> None:
+        for kind in WATCHED_ROLE_KINDS:
+            self._set(guild_id, kind, set())
+
+    def recount(self, bot: commands.Bot) -> None:
+        """Full O(total members) recount; only used as a slow consistency check."""
+        present = {guild.id for guild in bot.guilds}
+        for guild_id, kind in list(self._holders):
+            if guild_id not in present:
+                self._set(guild_id, kind, set())
+        for guild in bot.guilds:
+            self.recount_guild(guild)
+        self.last_recount = time.monotonic()
+
+
+role_counter = RoleWatchCounter()
+
+
 async def update_role_counts(bot: commands.Bot) -> None:
     """Update master guild voice channels with role counts."""
     from config import MASTER_GUILD_ID
-    
-    # Role count channel IDs
-    BEAR_COUNT_CHANNEL_ID = 1382954693034246235
-    ARENA_COUNT_CHANNEL_ID = 1382954743206510633
-    EVENT_COUNT_CHANNEL_ID = 1382954792468353056
 
     guild = bot.get_guild(MASTER_GUILD_ID)
     if not guild:
         return
 
-    # Count members with each role across all guilds
-    bear_count = 0
-    arena_count = 0
-    event_count = 0
-
-    for bot_guild in bot.guilds:
-        guild_cfg = gcfg.get(str(bot_guild.id), {})
-        
-        # Count bear role members
-        bear_role_id = guild_cfg.get("bear", {}).get("role_id")
-        if bear_role_id:
-            bear_role = bot_guild.get_role(bear_role_id)
-            if bear_role:
-                bear_count += len(bear_role.members)
-        
-        # Count arena role members
-        arena_role_id = guild_cfg.get("arena", {}).get("role_id")
-        if arena_role_id:
-            arena_role = bot_guild.get_role(arena_role_id)
-            if arena_role:
-                arena_count += len(arena_role.members)
-        
-        # Count event role members
-        event_role_id = guild_cfg.get("event", {}).get("role_id")
-        if event_role_id:
-            event_role = bot_guild.get_role(event_role_id)
-            if event_role:
-                event_count += len(event_role.members)
+    counts = fleet_totals() or role_counter.totals
+    bear_count = counts["bear"]
+    arena_count = counts["arena"]
+    event_count = counts["event"]
 
     # Update bear count channel
     bear_channel = guild.get_channel(BEAR_COUNT_CHANNEL_ID)
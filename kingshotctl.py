@@ -0,0 +1,132 @@
+"""
+Command-line client for the bot's local control socket.
+
+    python kingshotctl.py /status            run one command
+    python kingshotctl.py --json /feed 50    print the raw JSON response
+    python kingshotctl.py                    interactive prompt
+    python kingshotctl.py --cluster 2 /status   one process under cluster.py
+    python kingshotctl.py --cluster all /status every process under cluster.py
+
+Connects to KINGSHOT_CONTROL_SOCKET (default: kingshot.sock next to this
+file, kingshot.N.sock for cluster N), or to 127.0.0.1:KINGSHOT_CONTROL_PORT
+(+ N) where Unix sockets are not available. Keep these defaults in step
+with config.py.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PORT = int(os.getenv("KINGSHOT_CONTROL_PORT", "8765"))
+CLUSTER_STATUS_FILE = os.getenv(
+    "KINGSHOT_CLUSTER_STATUS_FILE", Path(__file__).parent / "cluster_status.json"
+)
+
+
+def socket_path(cluster=None) -> Path:
+    suffix = f".{cluster}" if cluster is not None else ""
+    return Path(os.getenv("KINGSHOT_CONTROL_SOCKET", Path(__file__).parent / f"kingshot{suffix}.sock"))
+
+
+def connect(timeout: float, cluster=None) -> socket.socket:
+    if hasattr(socket, "AF_UNIX") and sys.platform != "win32":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path(cluster)))
+    else:
+        sock = socket.create_connection(("127.0.0.1", PORT + (cluster or 0)), timeout=timeout)
+    return sock
+
+
+def all_clusters() -> list[int]:
+    """Cluster IDs from the status file cluster.py keeps up to date."""
+    try:
+        with open(CLUSTER_STATUS_FILE, encoding="utf-8") as f:
+            return sorted(int(cid) for cid in json.load(f)["clusters"])
+    except (OSError, ValueError, KeyError):
+        sys.exit(f"❌ No cluster status at {CLUSTER_STATUS_FILE}; is cluster.py running?")
+
+
+def run_on_clusters(clusters: list[int], command: str, args) -> bool:
+    ok = True
+    for cluster in clusters:
+        try:
+            sock = connect(args.timeout, cluster)
+        except OSError as e:
+            print(f"❌ Cluster {cluster}: cannot reach its control socket: {e}")
+            ok = False
+            continue
+        with sock, sock.makefile("rw", encoding="utf-8") as f:
+            response = send(f, command)
+        if not args.json:
+            print(f"── Cluster {cluster} ──")
+        show(response, args.json)
+        ok = ok and response["ok"]
+    return ok
+
+
+def send(f, command: str) -> dict:
+    f.write(json.dumps({"command": command}) + "\n")
+    f.flush()
+    line = f.readline()
+    if not line:
+        raise ConnectionError("control socket closed the connection")
+    return json.loads(line)
+
+
+def show(response: dict, as_json: bool):
+    if as_json:
+        print(json.dumps(response, ensure_ascii=False))
+    elif response["output"]:
+        print(response["output"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("command", nargs=argparse.REMAINDER, help="e.g. /status")
+    parser.add_argument("--json", action="store_true", help="print raw JSON responses")
+    # Long enough for /profile's maximum window
+    parser.add_argument("--timeout", type=float, default=330)
+    parser.add_argument("--cluster", help="cluster ID under cluster.py, or 'all'")
+    args = parser.parse_args()
+
+    cluster = None
+    if args.cluster == "all":
+        if not args.command:
+            sys.exit("❌ --cluster all needs a command")
+        ok = run_on_clusters(all_clusters(), " ".join(args.command), args)
+        sys.exit(0 if ok else 1)
+    elif args.cluster is not None:
+        cluster = int(args.cluster)
+
+    try:
+        sock = connect(args.timeout, cluster)
+    except OSError as e:
+        sys.exit(f"❌ Cannot reach the bot's control socket: {e}")
+
+    with sock, sock.makefile("rw", encoding="utf-8") as f:
+        if args.command:
+            response = send(f, " ".join(args.command))
+            show(response, args.json)
+            sys.exit(0 if response["ok"] else 1)
+
+        print("🧠 Connected (type /help, Ctrl+D to quit)")
+        while True:
+            try:
+                line = input("🧠 >> ").strip()
+            except (EOFError, KeyboardInterrupt):
+                print()
+                break
+            if line:
+                show(send(f, line), args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,519 @@
+"""
+Load test: run the real bot.py against fake_discord.py with thousands of guilds.
+
+Generates installed guilds (channels, roles, members, a reaction-role message
+with existing reactions, one upcoming bear and one upcoming event each),
+starts the fake Discord in this process and bot.py as a child pointed at it,
+then measures startup, fires a reaction storm and reports REST call counts,
+rate limits, reaction-to-role latency and the bot's CPU and memory.
+
+    python loadtest.py [--guilds 2000] [--members 50] [--shards N] [--lazy]
+                       [--reactions 10000] [--rate 500] [--latency-ms 50]
+
+Shards default to one per 1000 guilds, as Discord recommends. Without --lazy
+the bot chunks every guild at startup, which discord.py paces at 110 gateway
+requests per minute per shard, so ready takes minutes at this scale.
+Nothing touches discord.com or the real bot_config.json; all state lives in
+a temporary directory that is printed with the report.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+import psutil
+
+from config import (
+    BEAR_CHANNEL,
+    BEAR_LOG_CHANNEL,
+    ARENA_CHANNEL,
+    EVENT_CHANNEL,
+    REACTION_CHANNEL,
+    CATEGORY_NAME,
+    ROLE_EMOJIS,
+    ROLE_EMOJI_KEYS,
+)
+from fake_discord import FakeDiscord, snowflake, iso_now
+from welcome_embeds import WELCOME_EMBED_VERSION
+
+REPO_ROOT = Path(__file__).resolve().parent
+READY_MARKER = "Logged in as"
+# REST silence that counts as "startup finished"
+SETTLE_IDLE_SEC = 3.0
+
+
+def build_world(guilds: int, members: int, bear_lead: int, event_lead: int, seed: int = 0):
+    """
+    Return (world, bot_config, targets). `targets` lists each guild's
+    reaction-role message for the storm.
+    """
+    rng = random.Random(seed)
+    base_ms = int(time.time() * 1000) - 10**9
+    bot_id = str(snowflake(base_ms - 1))
+    bot = {"id": bot_id, "username": "Kingshot", "discriminator": "0", "avatar": None, "bot": True, "global_name": None}
+    world = {"bot": bot, "application_id": bot_id, "guilds": [], "messages": []}
+    bot_config, targets = {}, []
+    now = int(time.time())
+
+    for i in range(guilds):
+        # Consecutive millisecond timestamps spread guilds across shards
+        gid = snowflake(base_ms + i)
+        ids = iter(range(1, 10**6))
+
+        def new_id():
+            return str(snowflake(base_ms + i, next(ids)))
+
+        bot_role = new_id()
+        roles = [
+            {"id": str(gid), "name": "@everyone", "permissions": "0", "position": 0},
+            {"id": bot_role, "name": "Kingshot", "permissions": "8", "position": 10},
+        ]
+        role_ids = {}
+        for pos, (emoji, name) in enumerate(ROLE_EMOJIS.items(), start=1):
+            role_ids[emoji] = new_id()
+            roles.append({"id": role_ids[emoji], "name": name, "permissions": "0", "position": pos})
+        for r in roles:
+            r.update({"color": 0, "hoist": False, "managed": False, "mentionable": True, "flags": 0})
+
+        category = new_id()
+        channels = [{"id": category, "type": 4, "name": CATEGORY_NAME, "position": 0, "parent_id": None}]
+        chan_ids = {}
+        for pos, name in enumerate(
+            (BEAR_CHANNEL, BEAR_LOG_CHANNEL, ARENA_CHANNEL, EVENT_CHANNEL, REACTION_CHANNEL), start=1
+        ):
+            chan_ids[name] = new_id()
+            channels.append({"id": chan_ids[name], "type": 0, "name": name, "position": pos, "parent_id": category})
+        for ch in channels:
+            ch.update({"guild_id": str(gid), "permission_overwrites": []})
+
+        member_list = [{"user": bot, "roles": [bot_role], "joined_at": iso_now(), "deaf": False, "mute": False, "flags": 0}]
+        user_ids = []
+        for _ in range(members):
+            uid = new_id()
+            user_ids.append(int(uid))
+            member_list.append({
+                "user": {"id": uid, "username": f"user{uid[-6:]}", "discriminator": "0", "avatar": None, "global_name": None},
+                "roles": [],
+                "joined_at": iso_now(),
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            })
+
+        # Reaction-role message; some members reacted while the bot was away
+        msg_id = new_id()
+        world["messages"].append({
+            "id": msg_id,
+            "channel_id": chan_ids[REACTION_CHANNEL],
+            "guild_id": str(gid),
+            "author": bot,
+            "content": "",
+            "embeds": [{"title": "Reaction roles"}],
+            "timestamp": iso_now(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "components": [],
+            "pinned": False,
+            "type": 0,
+            "flags": 0,
+            "_reactions": [
+                {"emoji": e, "users": [int(bot_id)] + rng.sample(user_ids, min(len(user_ids), members // 5))}
+                for e in ROLE_EMOJIS
+            ],
+        })
+        targets.append({
+            "guild_id": gid,
+            "channel_id": chan_ids[REACTION_CHANNEL],
+            "message_id": msg_id,
+            "roles": role_ids,
+            "users": user_ids,
+        })
+
+        world["guilds"].append({
+            "id": str(gid),
+            "name": f"Loadtest {i}",
+            "owner_id": str(user_ids[0]) if user_ids else bot_id,
+            "roles": roles,
+            "channels": channels,
+            "members": member_list,
+        })
+        bot_config[str(gid)] = {
+            "mode": "auto",
+            "bear": {
+                "channel_id": int(chan_ids[BEAR_CHANNEL]),
+                "log_channel_id": int(chan_ids[BEAR_LOG_CHANNEL]),
+                "role_id": int(role_ids["🐻"]),
+            },
+            "arena": {"channel_id": int(chan_ids[ARENA_CHANNEL]), "role_id": int(role_ids["⚔️"])},
+            "event": {"channel_id": int(chan_ids[EVENT_CHANNEL]), "role_id": int(role_ids["🏆"])},
+            "reaction": {"channel_id": int(chan_ids[REACTION_CHANNEL]), "message_id": int(msg_id)},
+            "bears": [{"id": str(uuid.uuid4())[:8], "epoch": now + bear_lead}],
+            "events": [{
+                "id": str(uuid.uuid4())[:8],
+                "title": "Load test event",
+                "description": "Generated by loadtest.py",
+                "start_epoch": now + event_lead,
+                "end_epoch": now + event_lead + 3600,
+                "thumbnail": "",
+                "message_id": None,
+                "template_key": None,
+                "notifications": {},
+            }],
+            "welcome_embed_version": WELCOME_EMBED_VERSION,
+        }
+    return world, bot_config, targets
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+class BotProcess:
+    """bot.py as a child process, with its output logged and its resources sampled."""
+
+    def __init__(self, env: dict, log_path: Path):
+        self.env = env
+        self.log_path = log_path
+        self.ready = asyncio.Event()
+        self.proc = None
+        self.peak_rss_mb = 0.0
+        self.cpu_sec = 0.0
+
+    async def start(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            sys.executable, "bot.py",
+            cwd=REPO_ROOT,
+            env=self.env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        asyncio.create_task(self._read_output())
+        asyncio.create_task(self._sample())
+
+    async def _read_output(self):
+        with open(self.log_path, "wb") as f:
+            async for line in self.proc.stdout:
+                f.write(line)
+                if not self.ready.is_set() and READY_MARKER.encode() in line:
+                    self.ready.set()
+
+    async def wait_ready(self, timeout: float):
+        """Wait for the ready marker; raise if the bot exits or times out first."""
+        ready = asyncio.create_task(self.ready.wait())
+        exited = asyncio.create_task(self.proc.wait())
+        await asyncio.wait({ready, exited}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in (ready, exited):
+            task.cancel()
+        if not self.ready.is_set():
+            if self.proc.returncode is not None:
+                raise RuntimeError(f"bot exited with code {self.proc.returncode} before it was ready")
+            raise RuntimeError(f"bot not ready after {timeout}s")
+
+    async def _sample(self):
+        p = psutil.Process(self.proc.pid)
+        while self.proc.returncode is None:
+            try:
+                with p.oneshot():
+                    self.peak_rss_mb = max(self.peak_rss_mb, p.memory_info().rss / (1024 * 1024))
+                    cpu = p.cpu_times()
+                    self.cpu_sec = cpu.user + cpu.system
+            except psutil.Error:
+                return
+            await asyncio.sleep(1)
+
+    async def stop(self):
+        if self.proc.returncode is None:
+            self.proc.terminate()
+            try:
+                await asyncio.wait_for(self.proc.wait(), 15)
+            except asyncio.TimeoutError:
+                self.proc.kill()
+                await self.proc.wait()
+
+
+async def wait_settled(fake: FakeDiscord, shards: int, ready_at: float, timeout: float) -> float | None:
+    """
+    Wait until every shard has identified and REST has been quiet for
+    SETTLE_IDLE_SEC since the bot became ready; return when the last
+    startup request was made, or None on timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        last = max(fake.last_request_at, ready_at)
+        if len(fake.identified_at) >= shards and time.monotonic() - last >= SETTLE_IDLE_SEC:
+            return last
+        await asyncio.sleep(0.25)
+    return None
+
+
+async def reaction_storm(fake: FakeDiscord, targets: list[dict], total: int, rate: float, remove_share: float, seed: int):
+    """
+    Send `total` reaction events at `rate`/s; return (sent, expected role
+    changes). Adds come from members who have not reacted with that emoji
+    yet, and no member toggles a role whose last change is still pending,
+    so every expected change is one the bot must make exactly once.
+    """
+    rng = random.Random(seed)
+    reacted: list[tuple[dict, str, int]] = []
+    sent = expected = 0
+    tick = 0.1
+    per_tick = max(1, int(rate * tick))
+    while sent < total:
+        batch = []
+        for _ in range(min(per_tick, total - sent)):
+            t = rng.choice(targets)
+            emoji = rng.choice(list(t["roles"]))
+            uid = rng.choice(t["users"])
+            add = True
+            if reacted and rng.random() < remove_share:
+                i = rng.randrange(len(reacted))
+                t, emoji, uid = reacted[i]
+                add = False
+            role_id = t["roles"][emoji]
+            key = (t["guild_id"], uid, int(role_id))
+            # The bot keeps only the latest intent per (member, role), so a
+            # toggle while the previous change is in flight is never applied
+            if key in fake.expected_roles:
+                continue
+            if add and uid in fake.reactions[int(t["message_id"])].get(emoji, []):
+                continue
+            if not add:
+                reacted[i] = reacted[-1]
+                reacted.pop()
+            change = add != (role_id in fake.members[(t["guild_id"], uid)]["roles"])
+            batch.append({
+                "guild_id": t["guild_id"], "channel_id": t["channel_id"], "message_id": t["message_id"],
+                "emoji": emoji, "user_id": uid, "add": add, "role_id": role_id if change else None,
+            })
+            expected += change
+            if add:
+                reacted.append((t, emoji, uid))
+        await fake.react(batch)
+        sent += len(batch)
+        await asyncio.sleep(tick)
+    return sent, expected
+
+
+async def run(args) -> dict:
+    tmp = Path(tempfile.mkdtemp(prefix="kingshot-loadtest-"))
+    world, bot_config, targets = build_world(args.guilds, args.members, args.bear_lead, args.event_lead, args.seed)
+    (tmp / "bot_config.json").write_text(json.dumps(bot_config), encoding="utf-8")
+    if args.save_world:
+        (tmp / "world.json").write_text(json.dumps(world), encoding="utf-8")
+
+    fake = FakeDiscord(world, args.latency_ms, args.jitter_ms, args.rate_limit, args.rate_window)
+    server = await fake.start(port=args.port)
+
+    env = os.environ.copy()
+    for key in ("KINGSHOT_HEARTBEAT_FILE", "KINGSHOT_METRICS_PORT", "KINGSHOT_CLUSTER_ID", "KINGSHOT_EVENT_LOG"):
+        env.pop(key, None)
+    env.update({
+        "KINGSHOT_DISCORD_URL": f"http://127.0.0.1:{args.port}",
+        "KINGSHOT_BOT_TOKEN": "loadtest",
+        "KINGSHOT_CONFIG_PATH": str(tmp / "bot_config.json"),
+        "KINGSHOT_CONTROL_SOCKET": str(tmp / "kingshot.sock"),
+        "KINGSHOT_LAZY_MEMBERS": "1" if args.lazy else "0",
+        "DISCORD_ENABLED": "1",
+        "PYTHONUNBUFFERED": "1",
+    })
+    if args.shards > 1:
+        env["KINGSHOT_SHARD_COUNT"] = str(args.shards)
+        env["KINGSHOT_SHARD_IDS"] = ",".join(map(str, range(args.shards)))
+
+    bot = BotProcess(env, tmp / "bot.log")
+    report = {"params": vars(args), "dir": str(tmp)}
+    started = time.monotonic()
+    await bot.start()
+    try:
+        await bot.wait_ready(args.timeout)
+        ready_at = time.monotonic()
+        report["ready_sec"] = round(ready_at - started, 2)
+        settled = await wait_settled(fake, args.shards, ready_at, args.timeout)
+        report["startup_settled_sec"] = round(settled - started, 2) if settled else None
+        startup_calls = Counter(fake.rest_calls)
+        report["startup_rest_calls"] = sum(startup_calls.values())
+
+        storm_start = time.monotonic()
+        sent, expected = await reaction_storm(
+            fake, targets, args.reactions, args.rate, args.remove_share, args.seed
+        )
+        storm_sec = time.monotonic() - storm_start
+        # Let the role queue drain
+        deadline = time.monotonic() + args.drain_timeout
+        while fake.expected_roles and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+        drained_sec = time.monotonic() - storm_start
+
+        # Keep running so upcoming bears and events change phase under load
+        remaining = args.duration - (time.monotonic() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        report["rest_by_feature"] = await control(tmp / "kingshot.sock", "/rest 5")
+
+        # A /stop must leave a warm restart snapshot with every stateful cog
+        await control(tmp / "kingshot.sock", "/stop")
+        try:
+            await asyncio.wait_for(bot.proc.wait(), 30)
+        except asyncio.TimeoutError:
+            pass
+        snapshot = tmp / "state_snapshot.json"
+        cogs = json.loads(snapshot.read_text(encoding="utf-8")).get("cogs", {}) if snapshot.exists() else {}
+        report["snapshot_cogs"] = {name: bool(cogs.get(name)) for name in SNAPSHOT_COGS}
+    except RuntimeError as e:
+        report["error"] = f"{e} (see {tmp / 'bot.log'})"
+        return report
+    finally:
+        await bot.stop()
+        await server.cleanup()
+
+    latencies = fake.role_latencies
+    storm_calls = Counter(fake.rest_calls)
+    storm_calls.subtract(startup_calls)
+    report.update({
+        "reactions_sent": sent,
+        "reaction_rate": round(sent / storm_sec, 1),
+        "role_changes_expected": expected,
+        "role_changes_applied": len(latencies),
+        "role_change_throughput": round(len(latencies) / drained_sec, 1) if drained_sec else None,
+        "role_latency_sec": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3) if latencies else None,
+        },
+        "rest_calls": dict(fake.rest_calls),
+        "rest_calls_after_startup": {k: v for k, v in storm_calls.items() if v},
+        "rest_avg_ms": {
+            k: round(fake.rest_seconds[k] / n * 1000, 1) for k, n in fake.rest_calls.items()
+        },
+        "rate_limited": dict(fake.rate_limited),
+        "gateway_events": dict(fake.gateway_events),
+        "bot_cpu_sec": round(bot.cpu_sec, 2),
+        "bot_peak_rss_mb": round(bot.peak_rss_mb, 1),
+        "elapsed_sec": round(time.monotonic() - started, 1),
+    })
+    return report
+
+
+# Cogs whose state a clean shutdown must snapshot (see warm_state.py)
+SNAPSHOT_COGS = ("NewBearScheduler", "EventScheduler", "ReactionRole")
+
+
+async def control(socket_path: Path, command: str) -> str | None:
+    """Run an admin command on the bot's control socket and return its output."""
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    except OSError:
+        return None
+    try:
+        writer.write(json.dumps({"command": command}).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), 10)
+        return json.loads(line).get("output") if line else None
+    except (asyncio.TimeoutError, json.JSONDecodeError):
+        return None
+    finally:
+        writer.close()
+
+
+def print_report(r: dict):
+    p = r["params"]
+    print(
+        f"\n🧪 Load test: {p['guilds']} guilds × {p['members']} members • {p['shards']} shard(s) • "
+        f"latency {p['latency_ms']:.0f}±{p['jitter_ms']:.0f}ms • limit {p['rate_limit']}/{p['rate_window']}s per bucket"
+    )
+    if "error" in r:
+        print(f"❌ {r['error']}")
+        return
+    settled = r["startup_settled_sec"]
+    print(
+        f"⏱️ Ready after {r['ready_sec']}s • startup REST settled after "
+        f"{f'{settled}s' if settled is not None else 'timeout'} ({r['startup_rest_calls']} calls)"
+    )
+    total = sum(r["rest_calls"].values())
+    print(f"📡 REST: {total} calls • {sum(r['rate_limited'].values())} rate limited (429)")
+    print(f"  {'calls':>7} {'after start':>11} {'429s':>6} {'avg ms':>7}  route")
+    for route, n in sorted(r["rest_calls"].items(), key=lambda kv: -kv[1])[:15]:
+        print(
+            f"  {n:>7} {r['rest_calls_after_startup'].get(route, 0):>11} "
+            f"{r['rate_limited'].get(route, 0):>6} {r['rest_avg_ms'][route]:>7}  {route}"
+        )
+    if r.get("rest_by_feature"):
+        print(r["rest_by_feature"].strip("\n").replace("📡 REST calls by feature", "📡 Bot-side, by feature"))
+    missing = [name for name, ok in r["snapshot_cogs"].items() if not ok]
+    if missing:
+        print(f"❌ Warm restart snapshot after /stop is missing: {', '.join(missing)}")
+    else:
+        print(f"💾 Warm restart snapshot after /stop: {', '.join(r['snapshot_cogs'])}")
+    lat = r["role_latency_sec"]
+    print(
+        f"🔔 Reactions: {r['reactions_sent']} sent at {r['reaction_rate']}/s • "
+        f"{r['role_changes_applied']}/{r['role_changes_expected']} role changes applied "
+        f"({r['role_change_throughput']}/s)"
+    )
+    print(f"  reaction → role latency: p50 {lat['p50']}s • p95 {lat['p95']}s • p99 {lat['p99']}s • max {lat['max']}s")
+    events = ", ".join(f"{k} {v}" for k, v in sorted(r["gateway_events"].items(), key=lambda kv: -kv[1]))
+    print(f"🔌 Gateway: {sum(r['gateway_events'].values())} events ({events})")
+    print(
+        f"🧠 Bot: CPU {r['bot_cpu_sec']}s over {r['elapsed_sec']}s "
+        f"({r['bot_cpu_sec'] / r['elapsed_sec']:.0%}) • peak RSS {r['bot_peak_rss_mb']}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--members", type=int, default=50, help="members per guild")
+    parser.add_argument("--shards", type=int, help="default: one per 1000 guilds")
+    parser.add_argument("--lazy", action="store_true", help="run with KINGSHOT_LAZY_MEMBERS=1")
+    parser.add_argument("--reactions", type=int, default=10000, help="reaction events in the storm")
+    parser.add_argument("--rate", type=float, default=500, help="reaction events per second")
+    parser.add_argument("--remove-share", type=float, default=0.2, help="share of storm events that are removals")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--rate-limit", type=int, default=50, help="requests per bucket per window")
+    parser.add_argument("--rate-window", type=float, default=1.0)
+    parser.add_argument("--bear-lead", type=int, default=60, help="seconds until each bear attacks")
+    parser.add_argument("--event-lead", type=int, default=90, help="seconds until each event starts")
+    parser.add_argument("--duration", type=float, default=120, help="minimum total run time")
+    parser.add_argument("--drain-timeout", type=float, default=60)
+    parser.add_argument("--timeout", type=float, default=900, help="max wait for ready / settle")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-world", action="store_true", help="also write world.json for fake_discord.py")
+    args = parser.parse_args()
+    if args.shards is None:
+        args.shards = max(1, math.ceil(args.guilds / 1000))
+
+    # Requests cut off when the bot is stopped are expected, not errors
+    logging.getLogger("aiohttp.server").setLevel(logging.CRITICAL)
+    report = asyncio.run(run(args))
+    print_report(report)
+    path = Path(report["dir"]) / "report.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"📄 Report: {path} • bot log: {Path(report['dir']) / 'bot.log'}")
+    if "error" in report or not all(report["snapshot_cogs"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# loop_monitor.py
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from config import (
+    LOOP_MONITOR_INTERVAL_SEC,
+    LOOP_STALL_THRESHOLD_SEC,
+    LOOP_STALL_WARN_SEC,
+)
+
+log = logging.getLogger("kingshot")
+
+REPO_ROOT = Path(__file__).resolve().parent
+_SELF = Path(__file__).resolve()
+
+
+def _call_site(frame) -> tuple[str, str]:
+    """
+    Return (site, leaf) for a stack: the innermost frame in this repo, which
+    is what we can fix, and the innermost frame overall, which is what is
+    actually running (json, file I/O, ...).
+    """
+    stack = traceback.extract_stack(frame)
+    leaf = stack[-1]
+    leaf_str = f"{Path(leaf.filename).name}:{leaf.lineno} in {leaf.name}"
+    for fs in reversed(stack):
+        path = Path(fs.filename).resolve()
+        if path == _SELF or REPO_ROOT not in path.parents:
+            continue
+        return f"{path.relative_to(REPO_ROOT)}:{fs.lineno} in {fs.name}", leaf_str
+    return leaf_str, leaf_str
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling lag and attributes stalls to call sites.
+
+    A probe task sleeps LOOP_MONITOR_INTERVAL_SEC at a time and records how
+    late it wakes. A daemon thread watches the probe; while it is overdue by
+    more than LOOP_STALL_THRESHOLD_SEC the loop is blocked, so the thread
+    samples the loop thread's stack once. When the probe wakes, the stall's
+    duration is charged to the sampled call site.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_MONITOR_INTERVAL_SEC,
+        threshold: float = LOOP_STALL_THRESHOLD_SEC,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.blocked_total = 0.0
+        # site -> {"count", "total", "max", "leaf"}
+        self.offenders: dict[str, dict] = {}
+        self._tick = time.monotonic()
+        self._sampled: tuple[str, str] | None = None
+        self._sampled_tick = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+
+    def start(self) -> None:
+        if self._task:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._tick = time.monotonic()
+        self._task = asyncio.create_task(self._probe())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _probe(self):
+        while True:
+            start = self._tick = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                self._record_stall(lag, start)
+
+    def _record_stall(self, lag: float, started: float):
+        if self._sampled and self._sampled_tick == started:
+            site, leaf = self._sampled
+        else:
+            site, leaf = "(not sampled)", "?"
+        self._sampled = None
+        self.stalls += 1
+        self.blocked_total += lag
+        o = self.offenders.setdefault(site, {"count": 0, "total": 0.0, "max": 0.0, "leaf": leaf})
+        o["count"] += 1
+        o["total"] += lag
+        if lag >= o["max"]:
+            o["max"] = lag
+            o["leaf"] = leaf
+        if lag >= LOOP_STALL_WARN_SEC:
+            log.warning(
+                f"Event loop blocked for {lag:.2f}s at {site} ({leaf})",
+                extra={"phase": "loop_stall", "duration": round(lag, 3)},
+            )
+
+    def _watch(self):
+        poll = max(self.threshold / 2, 0.01)
+        while self._task is not None:
+            time.sleep(poll)
+            tick = self._tick
+            overdue = time.monotonic() - tick - self.interval
+            if overdue < self.threshold or self._sampled_tick == tick:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._sampled = _call_site(frame)
+            self._sampled_tick = tick
+            del frame
+
+    def top(self, n: int = 10) -> list[tuple[str, dict]]:
+        """Call sites ordered by total blocked time."""
+        return sorted(self.offenders.items(), key=lambda kv: kv[1]["total"], reverse=True)[:n]
+
+    def report(self, n: int = 10) -> str:
+        lines = [
+            f"\n🐢 Event loop lag: last {self.last_lag * 1000:.0f}ms • max {self.max_lag * 1000:.0f}ms • "
+            f"{self.stalls} stall(s) ≥{self.threshold * 1000:.0f}ms, {self.blocked_total:.2f}s blocked"
+        ]
+        for site, o in self.top(n):
+            lines.append(
+                f"  {o['total']:>7.2f}s total • {o['max']:>6.2f}s max • ×{o['count']:<4} {site}"
+                + (f"  ← {o['leaf']}" if o["leaf"] != site else "")
+            )
+        return "\n".join(lines)
+
+
+loop_monitor = LoopLagMonitor()
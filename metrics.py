@@ -0,0 +1,232 @@
+# metrics.py
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+from discord.ext import commands
+
+try:
+    import psutil
+except ImportError:  # optional; RSS falls back to /proc on Linux
+    psutil = None
+
+import event_log
+import helpers
+from command_center import live_feed
+from loop_monitor import loop_monitor
+from rest_accounting import rest_accounting
+from circuit_breaker import channel_breaker
+from channel_cache import channel_cache
+from config import METRICS_PORT, METRICS_HOST
+
+log = logging.getLogger("kingshot")
+
+# (method, route, outcome) -> count, filled by the HTTP trace below
+rest_requests: Counter = Counter()
+# route -> responses with status 429
+rest_rate_limited: Counter = Counter()
+
+_SNOWFLAKE = re.compile(r"/\d{15,21}")
+# Interaction/webhook tokens and reaction emoji are unbounded; collapse them
+_TOKEN = re.compile(r"/(interactions|webhooks)/:id/[^/]+")
+_EMOJI = re.compile(r"/reactions/[^/]+")
+
+
+def route_of(path: str) -> str:
+    """Turn a REST path into a low-cardinality route label."""
+    path = path.split("/api/", 1)[-1]
+    path = re.sub(r"^v\d+", "", path)
+    path = _SNOWFLAKE.sub("/:id", path)
+    path = _TOKEN.sub(r"/\1/:id/:token", path)
+    return _EMOJI.sub("/reactions/:emoji", path)
+
+
+def http_trace() -> aiohttp.TraceConfig:
+    """aiohttp trace that counts the bot's REST calls by route and outcome."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_end(session, ctx, params):
+        if "/api/" not in params.url.path:
+            return  # gateway connects share the session
+        route = route_of(params.url.path)
+        status = params.response.status
+        outcome = "429" if status == 429 else f"{status // 100}xx"
+        rest_requests[(params.method, route, outcome)] += 1
+        if status == 429:
+            rest_rate_limited[route] += 1
+
+    async def on_request_exception(session, ctx, params):
+        if "/api/" in params.url.path:
+            rest_requests[(params.method, route_of(params.url.path), "error")] += 1
+
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+
+def _rss_bytes() -> int | None:
+    if psutil:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Exposition:
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def add(self, name: str, kind: str, help_text: str, samples):
+        """samples: a number, or an iterable of (labels dict, value)."""
+        if samples is None:
+            return
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        if isinstance(samples, (int, float)):
+            samples = [({}, samples)]
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            self.lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _pending_tasks(cog) -> int:
+    if not cog:
+        return 0
+    return sum(1 for ev in cog.events.values() if ev.task and not ev.task.done())
+
+
+def render(bot: commands.Bot) -> str:
+    m = _Exposition()
+    latency = bot.latency
+    m.add("kingshot_gateway_latency_seconds", "gauge", "Gateway heartbeat latency.",
+          round(latency, 4) if math.isfinite(latency) else None)
+    m.add("kingshot_guilds", "gauge", "Guilds the bot is in.", len(bot.guilds))
+    m.add("kingshot_event_loop_lag_seconds", "gauge", "Latest event loop scheduling lag.",
+          round(loop_monitor.last_lag, 4))
+    m.add("kingshot_event_loop_lag_max_seconds", "gauge", "Largest event loop lag seen.",
+          round(loop_monitor.max_lag, 4))
+    m.add("kingshot_event_loop_stalls_total", "counter", "Loop stalls over the attribution threshold.",
+          loop_monitor.stalls)
+    m.add("kingshot_event_loop_blocked_seconds_total", "counter", "Time the loop spent in stalls.",
+          round(loop_monitor.blocked_total, 4))
+
+    m.add("kingshot_rest_requests_total", "counter", "REST calls by route and outcome.",
+          [({"method": k[0], "route": k[1], "outcome": k[2]}, v) for k, v in sorted(rest_requests.items())])
+    m.add("kingshot_rest_rate_limited_total", "counter", "REST responses with status 429.",
+          [({"route": r}, v) for r, v in sorted(rest_rate_limited.items())])
+    features = sorted(rest_accounting.features.items())
+    m.add("kingshot_rest_feature_requests_total", "counter", "REST calls by originating feature.",
+          [({"feature": f}, s["count"]) for f, s in features])
+    m.add("kingshot_rest_feature_errors_total", "counter", "REST calls by feature that raised.",
+          [({"feature": f}, s["errors"]) for f, s in features])
+    m.add("kingshot_rest_feature_seconds_total", "counter", "Time spent in REST calls by feature.",
+          [({"feature": f}, round(s["seconds"], 4)) for f, s in features])
+    m.add("kingshot_rest_feature_over_budget_total", "counter", "REST calls made past the feature's budget.",
+          [({"feature": f}, s["over_budget"]) for f, s in features])
+    m.add("kingshot_rest_feature_throttled_seconds_total", "counter", "Time calls were held by a REST budget.",
+          [({"feature": f}, round(s["throttled_seconds"], 4)) for f, s in features])
+
+    m.add("kingshot_channel_breakers_open", "gauge", "Channels skipped after repeated permission failures.",
+          channel_breaker.open_count())
+    m.add("kingshot_channel_breaker_opened_total", "counter", "Channel breakers opened.", channel_breaker.opened)
+    m.add("kingshot_channel_breaker_skipped_total", "counter", "Scheduler attempts skipped by open breakers.",
+          channel_breaker.skipped)
+
+    c = channel_cache.stats()
+    m.add("kingshot_channel_cache_hits_total", "counter", "Channel name / permission lookups served from cache.",
+          c["hits"])
+    m.add("kingshot_channel_cache_builds_total", "counter", "Channel name indexes and permission sets computed.",
+          c["builds"])
+
+    installer = bot.get_cog("Installer")
+    if installer:
+        w = installer.welcome_migration.progress()
+        m.add("kingshot_welcome_migration_guilds", "gauge", "Guilds the welcome embed migration started with.",
+              w["total"])
+        m.add("kingshot_welcome_migration_done", "gauge", "Guilds the welcome embed migration has finished.",
+              w["done"])
+        m.add("kingshot_welcome_migration_eta_seconds", "gauge", "Estimated time left in the welcome embed migration.",
+              w["eta_sec"])
+
+    rr = bot.get_cog("ReactionRole")
+    if rr:
+        q = rr.role_queue.stats()
+        m.add("kingshot_role_queue_depth", "gauge", "Role intents waiting to be flushed.", q["depth"])
+        m.add("kingshot_role_intents_total", "counter", "Role intents queued.", q["intents"])
+        m.add("kingshot_role_edits_total", "counter", "Member role edits applied.", q["edits"])
+        m.add("kingshot_role_edits_failed_total", "counter", "Member role edits that failed.", q["edits_failed"])
+        m.add("kingshot_reaction_events_total", "counter", "Reaction-role add/remove events handled.",
+              rr.reactions_handled)
+
+    m.add("kingshot_pending_bears", "gauge", "Bears with a running phase task.",
+          _pending_tasks(bot.get_cog("NewBearScheduler")))
+    m.add("kingshot_pending_events", "gauge", "Events with a running notification task.",
+          _pending_tasks(bot.get_cog("EventScheduler")))
+
+    w = helpers.config_write_stats
+    m.add("kingshot_config_write_queue_depth", "gauge", "Config snapshots waiting to be written.",
+          helpers._write_queue.qsize())
+    m.add("kingshot_config_saves_total", "counter", "save_config() calls.", w["requested"])
+    m.add("kingshot_config_writes_total", "counter", "Config file writes after coalescing.", w["written"])
+    m.add("kingshot_config_write_bytes_total", "counter", "Bytes written to the config file.", w["bytes"])
+    m.add("kingshot_config_write_seconds_total", "counter", "Time spent serialising and writing config.",
+          round(w["seconds"], 4))
+
+    f = live_feed.stats()
+    m.add("kingshot_live_feed_buffered", "gauge", "Entries in the live feed ring buffer.", f["buffered"])
+    m.add("kingshot_live_feed_pending", "gauge", "Live feed aggregates not yet flushed.", f["pending"])
+    m.add("kingshot_live_feed_dropped_total", "counter", "Live feed entries evicted from the buffer.",
+          f["dropped"])
+    m.add("kingshot_live_feed_sampled_out_total", "counter", "Live feed entries skipped by sampling.",
+          f["sampled_out"])
+    if event_log.event_writer:
+        e = event_log.event_writer.stats()
+        m.add("kingshot_event_log_queued", "gauge", "Event log records waiting for the writer.", e["queued"])
+        m.add("kingshot_event_log_dropped_total", "counter", "Event log records dropped (queue full).",
+              e["dropped"])
+
+    m.add("process_resident_memory_bytes", "gauge", "Resident set size of the bot process.", _rss_bytes())
+    return m.render()
+
+
+_runner: web.AppRunner | None = None
+
+
+async def start_metrics_server(bot: commands.Bot) -> None:
+    """Serve /metrics on METRICS_HOST:METRICS_PORT (disabled when the port is 0)."""
+    global _runner
+    if not METRICS_PORT or _runner:
+        return
+
+    async def handle(request):
+        return web.Response(
+            body=render(bot).encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    _runner = web.AppRunner(app, access_log=None)
+    await _runner.setup()
+    try:
+        await web.TCPSite(_runner, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        log.error(f"Metrics endpoint failed to start: {e}")
+        await _runner.cleanup()
+        _runner = None
+        return
+    log.info(f"Metrics available at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
@@ -0,0 +1,127 @@
+# profiler.py
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import PROFILE_DIR, PROFILE_SAMPLE_HZ, PROFILE_MAX_SECONDS
+
+REPO_ROOT = Path(__file__).resolve().parent
+# Leaf functions that mean the loop is waiting for I/O, not working
+_IDLE_LEAVES = {"select", "poll"}
+
+_running = False
+
+
+@lru_cache(maxsize=None)
+def _in_repo(filename: str) -> bool:
+    return REPO_ROOT in Path(filename).resolve().parents
+
+
+@lru_cache(maxsize=None)
+def _label(code) -> str:
+    path = Path(code.co_filename)
+    try:
+        name = str(path.resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        name = path.name
+    return f"{name}:{code.co_name}"
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's stack at a fixed rate until stopped."""
+
+    def __init__(self, thread_id: int, hz: int):
+        super().__init__(name="profiler", daemon=True)
+        self.thread_id = thread_id
+        self.period = 1 / hz
+        self.stop_event = threading.Event()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle = 0
+
+    def run(self):
+        me = threading.get_ident()
+        while not self.stop_event.wait(self.period):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self.thread_id == me:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            self.samples += 1
+            leaf = codes[0]
+            if leaf.co_name in _IDLE_LEAVES and leaf.co_filename.endswith("selectors.py"):
+                self.idle += 1
+                continue
+            self.stacks[tuple(reversed(codes))] += 1
+
+
+def _summary(sampler: _Sampler, top: int) -> list[str]:
+    busy = sampler.samples - sampler.idle
+    lines = [
+        f"• Samples: {sampler.samples} • busy {busy} ({busy / max(sampler.samples, 1):.0%}) • "
+        f"idle {sampler.idle}"
+    ]
+    inclusive: Counter = Counter()
+    own: Counter = Counter()
+    for stack, n in sampler.stacks.items():
+        own[_label(stack[-1])] += n
+        # Count each repo function once per sample, however deep it recurses
+        for label in {_label(c) for c in stack if _in_repo(c.co_filename)}:
+            inclusive[label] += n
+
+    lines.append(f"\nTop {top} bot functions (incl. callees, % of busy samples):")
+    for label, n in inclusive.most_common(top):
+        lines.append(f"  {n / max(busy, 1):>6.1%}  {label}")
+    lines.append(f"\nTop {top} leaf functions (self time):")
+    for label, n in own.most_common(top):
+        lines.append(f"  {n / max(busy, 1):>6.1%}  {label}")
+    return lines
+
+
+def _write_collapsed(sampler: _Sampler) -> Path:
+    """Write stacks in collapsed format (one 'a;b;c count' line per stack) for flame graphs."""
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"profile_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.collapsed"
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, n in sampler.stacks.most_common():
+            f.write(";".join(_label(c) for c in stack) + f" {n}\n")
+    return path
+
+
+async def profile(seconds: float, top: int = 15) -> str:
+    """
+    Sample the event loop thread for `seconds` and return a text summary.
+
+    Nothing runs between profiles. While active, a thread reads the loop
+    thread's stack PROFILE_SAMPLE_HZ times a second; the loop itself is not
+    instrumented. Stacks are saved to PROFILE_DIR in collapsed format.
+    """
+    global _running
+    if _running:
+        return "⚠️ A profile is already running"
+    seconds = max(1.0, min(float(seconds), PROFILE_MAX_SECONDS))
+    _running = True
+    sampler = _Sampler(threading.get_ident(), PROFILE_SAMPLE_HZ)
+    try:
+        started = time.perf_counter()
+        sampler.start()
+        await asyncio.sleep(seconds)
+        sampler.stop_event.set()
+        await asyncio.to_thread(sampler.join)
+        elapsed = time.perf_counter() - started
+        path = await asyncio.to_thread(_write_collapsed, sampler)
+    finally:
+        sampler.stop_event.set()
+        _running = False
+
+    lines = [f"\n🔬 Profile: {elapsed:.1f}s at {PROFILE_SAMPLE_HZ} Hz → {path}"]
+    lines += _summary(sampler, top)
+    return "\n".join(lines)
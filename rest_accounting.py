@@ -0,0 +1,215 @@
+# rest_accounting.py
+
+import asyncio
+import contextlib
+import contextvars
+import logging
+import time
+from collections import deque
+
+import discord
+
+from config import REST_BUDGETS, REST_BUDGET_WINDOW_SEC, REST_GLOBAL_RATE_PER_SEC
+
+log = logging.getLogger("kingshot")
+
+# Features REST calls are charged to; anything untagged is "other"
+FEATURES = (
+    "bear_phase",
+    "bear_cleanup",
+    "arena_edit",
+    "event_reminder",
+    "reaction_role",
+    "installer",
+    "welcome_migration",
+    "role_count_rename",
+)
+UNTAGGED = "other"
+
+# (feature, guild id) charged for REST calls made in the current task
+_current: contextvars.ContextVar[tuple[str, int | None]] = contextvars.ContextVar(
+    "rest_feature", default=(UNTAGGED, None)
+)
+
+
+def tag(feature: str, guild_id: int | None = None) -> None:
+    """
+    Charge REST calls for the rest of the current task to `feature`.
+
+    Meant for the top of a task body (a bear or event cycle, an interaction
+    handler); tasks it creates inherit the tag. Use rest_feature() for a
+    section of a task.
+    """
+    _current.set((feature, guild_id))
+
+
+@contextlib.contextmanager
+def rest_feature(feature: str, guild_id: int | None = None):
+    """Charge REST calls made inside the block to `feature`."""
+    token = _current.set((feature, guild_id))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def _new_stat() -> dict:
+    return {
+        "count": 0,
+        "errors": 0,
+        "seconds": 0.0,
+        "max": 0.0,
+        "over_budget": 0,
+        "throttled_seconds": 0.0,
+    }
+
+
+class RestAccounting:
+    """
+    Counts and times every REST call by the feature that made it.
+
+    install() wraps HTTPClient.request, so calls are charged to whatever
+    tag()/rest_feature() set in the calling task, and to the route's guild
+    when the task didn't name one. Latency includes discord.py's own
+    rate-limit waits, which is where an overused bucket shows up.
+
+    Features in REST_BUDGETS get a share of REST_GLOBAL_RATE_PER_SEC over a
+    sliding REST_BUDGET_WINDOW_SEC. Past it, "log" warns (once per window)
+    and "throttle" holds the feature's calls until the window has room.
+    """
+
+    def __init__(self, budgets: dict[str, tuple[float, str]] = REST_BUDGETS, window: float = REST_BUDGET_WINDOW_SEC):
+        self.budgets = dict(budgets)
+        self.window = window
+        self.features: dict[str, dict] = {}
+        # (feature, guild id) -> {"count", "seconds"}
+        self.guilds: dict[tuple[str, int], dict] = {}
+        self._recent: dict[str, deque] = {}
+        self._warned: dict[str, float] = {}
+        # feature -> calls awaiting a response
+        self._in_flight: dict[str, int] = {}
+
+    def install(self, http: discord.http.HTTPClient) -> None:
+        if getattr(http.request, "_rest_accounting", False):
+            return
+        original = http.request
+
+        async def request(route, *args, **kwargs):
+            feature, guild_id = _current.get()
+            if guild_id is None and route.guild_id is not None:
+                guild_id = int(route.guild_id)
+            stat = self.features.get(feature)
+            if stat is None:
+                stat = self.features[feature] = _new_stat()
+            if feature in self.budgets:
+                await self._admit(feature, stat)
+            start = time.perf_counter()
+            self._in_flight[feature] = self._in_flight.get(feature, 0) + 1
+            try:
+                return await original(route, *args, **kwargs)
+            except Exception:
+                stat["errors"] += 1
+                raise
+            finally:
+                self._in_flight[feature] -= 1
+                elapsed = time.perf_counter() - start
+                stat["count"] += 1
+                stat["seconds"] += elapsed
+                stat["max"] = max(stat["max"], elapsed)
+                if guild_id is not None:
+                    g = self.guilds.get((feature, guild_id))
+                    if g is None:
+                        g = self.guilds[(feature, guild_id)] = {"count": 0, "seconds": 0.0}
+                    g["count"] += 1
+                    g["seconds"] += elapsed
+
+        request._rest_accounting = True
+        http.request = request
+
+    def in_flight(self, features) -> int:
+        """REST calls from `features` currently awaiting a response."""
+        return sum(self._in_flight.get(f, 0) for f in features)
+
+    def limit(self, feature: str) -> int | None:
+        """Calls `feature` may make per window, or None if it has no budget."""
+        budget = self.budgets.get(feature)
+        if not budget:
+            return None
+        return max(1, int(budget[0] * REST_GLOBAL_RATE_PER_SEC * self.window))
+
+    def set_budget(self, feature: str, share: float | None, action: str = "log") -> None:
+        """Give `feature` a share of the global rate (None removes its budget)."""
+        if share is None:
+            self.budgets.pop(feature, None)
+            self._recent.pop(feature, None)
+        else:
+            self.budgets[feature] = (share, action)
+
+    async def _admit(self, feature: str, stat: dict) -> None:
+        limit = self.limit(feature)
+        action = self.budgets[feature][1]
+        recent = self._recent.setdefault(feature, deque())
+        now = time.monotonic()
+        while recent and now - recent[0] >= self.window:
+            recent.popleft()
+        if len(recent) >= limit:
+            stat["over_budget"] += 1
+            if action == "throttle":
+                waited_from = now
+                while len(recent) >= limit:
+                    await asyncio.sleep(recent[0] + self.window - now)
+                    now = time.monotonic()
+                    while recent and now - recent[0] >= self.window:
+                        recent.popleft()
+                stat["throttled_seconds"] += now - waited_from
+            elif now - self._warned.get(feature, 0.0) >= self.window:
+                self._warned[feature] = now
+                log.warning(
+                    f"REST budget exceeded by {feature}: {len(recent)} calls in {self.window:g}s "
+                    f"(budget {limit})",
+                    extra={"phase": "rest_budget"},
+                )
+        recent.append(now)
+
+    def top_guilds(self, n: int = 10, feature: str | None = None) -> list[tuple[int, dict]]:
+        """Guilds by REST calls, for one feature or all of them."""
+        totals: dict[int, dict] = {}
+        for (f, guild_id), g in self.guilds.items():
+            if feature and f != feature:
+                continue
+            t = totals.setdefault(guild_id, {"count": 0, "seconds": 0.0})
+            t["count"] += g["count"]
+            t["seconds"] += g["seconds"]
+        return sorted(totals.items(), key=lambda kv: kv[1]["count"], reverse=True)[:n]
+
+    def report(self, n: int = 5) -> str:
+        total = sum(s["count"] for s in self.features.values())
+        lines = [f"\n📡 REST calls by feature: {total} total"]
+        for feature, s in sorted(self.features.items(), key=lambda kv: kv[1]["count"], reverse=True):
+            avg = s["seconds"] / s["count"] * 1000 if s["count"] else 0.0
+            line = (
+                f"  {feature:<18} {s['count']:>7} ({s['count'] / total:>4.0%}) • "
+                f"avg {avg:>5.0f}ms • max {s['max'] * 1000:>5.0f}ms • {s['errors']} error(s)"
+            )
+            if feature in self.budgets:
+                share, action = self.budgets[feature]
+                line += f" • budget {self.limit(feature)}/{self.window:g}s ({share:.0%}, {action})"
+                if s["over_budget"]:
+                    line += f", exceeded ×{s['over_budget']}"
+                if s["throttled_seconds"]:
+                    line += f", held {s['throttled_seconds']:.1f}s"
+            lines.append(line)
+        if n and self.guilds:
+            lines.append(f"  Top {n} guild(s):")
+            for guild_id, t in self.top_guilds(n):
+                by_feature = sorted(
+                    ((f, g["count"]) for (f, gid), g in self.guilds.items() if gid == guild_id),
+                    key=lambda fc: fc[1],
+                    reverse=True,
+                )
+                detail = ", ".join(f"{f} {c}" for f, c in by_feature[:3])
+                lines.append(f"    {guild_id}: {t['count']} call(s), {t['seconds']:.1f}s • {detail}")
+        return "\n".join(lines)
+
+
+rest_accounting = RestAccounting()
@@ -0,0 +1,138 @@
+# role_queue.py
+
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import discord
+
+from config import ROLE_UPDATE_WINDOW_SEC, ROLE_UPDATE_MIN_INTERVAL_SEC
+from helpers import resolve_member, member_lru
+from rest_accounting import tag
+
+log = logging.getLogger("kingshot")
+
+# apply(guild, member, roles_to_add, roles_to_remove) -> applied?
+ApplyFn = Callable[
+    [discord.Guild, discord.Member, list[discord.Role], list[discord.Role]],
+    Awaitable[bool],
+]
+
+
+class RoleUpdateQueue:
+    """
+    Per-guild queue that coalesces reaction-role intents.
+
+    Add/remove intents are keyed by (member_id, role_id); the latest intent
+    wins. After a short window each guild's batch is flushed, comparing the
+    wanted state with the member's current roles so only the net change is
+    sent, one member edit at a time and paced for the member-edit rate limit.
+    """
+
+    def __init__(
+        self,
+        apply: ApplyFn,
+        window: float = ROLE_UPDATE_WINDOW_SEC,
+        min_interval: float = ROLE_UPDATE_MIN_INTERVAL_SEC,
+    ):
+        self._apply = apply
+        self.window = window
+        self.min_interval = min_interval
+        # guild_id -> {(member_id, role_id): add?}
+        self._pending: dict[int, dict[tuple[int, int], bool]] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        self.intents_received = 0
+        self.edits_applied = 0
+        self.edits_failed = 0
+
+    def enqueue(self, guild: discord.Guild, member_id: int, role_id: int, add: bool):
+        """Record that a member should (add=True) or shouldn't have a role."""
+        self._pending.setdefault(guild.id, {})[(member_id, role_id)] = add
+        self.intents_received += 1
+
+        task = self._tasks.get(guild.id)
+        if task is None or task.done():
+            self._tasks[guild.id] = asyncio.create_task(self._flush_later(guild))
+
+    async def _flush_later(self, guild: discord.Guild):
+        tag("reaction_role", guild.id)
+        await asyncio.sleep(self.window)
+        # Keep draining: intents that arrive mid-flush join the next batch
+        while self._pending.get(guild.id):
+            batch = self._pending.pop(guild.id)
+            await self._flush(guild, batch)
+        self._tasks.pop(guild.id, None)
+
+    async def _flush(self, guild: discord.Guild, batch: dict[tuple[int, int], bool]):
+        wanted: dict[int, dict[int, bool]] = {}
+        for (member_id, role_id), add in batch.items():
+            wanted.setdefault(member_id, {})[role_id] = add
+
+        for member_id, roles in wanted.items():
+            member = None
+            try:
+                member = await resolve_member(guild, member_id)
+                if not member or member.bot:
+                    continue
+                current = {r.id for r in member.roles}
+                to_add, to_remove = [], []
+                for role_id, add in roles.items():
+                    if add == (role_id in current):
+                        continue  # already in the wanted state
+                    role = guild.get_role(role_id)
+                    if role:
+                        (to_add if add else to_remove).append(role)
+                if not to_add and not to_remove:
+                    # Toggled back to where it started
+                    continue
+                applied = await self._apply(guild, member, to_add, to_remove)
+            except Exception as e:
+                # One member's failure (a 5xx or network error resolving or
+                # editing them) must not drop the rest of the batch
+                log.error(f"Role update failed for {member or member_id} in {guild.name}: {e}")
+                if member is None:
+                    continue  # never resolved, so nothing was sent
+                applied = False
+            if applied:
+                self.edits_applied += 1
+            else:
+                self.edits_failed += 1
+            # A fetched copy no longer reflects the member's roles
+            member_lru.evict(guild.id, member.id)
+            await asyncio.sleep(self.min_interval)
+
+    async def drain(self, guild_id: int) -> None:
+        """Wait until every intent queued for the guild so far has been applied."""
+        task = self._tasks.get(guild_id)
+        if task and not task.done():
+            # Shielded so a cancelled caller doesn't cancel the guild's flush
+            await asyncio.shield(task)
+
+    @property
+    def depth(self) -> int:
+        """Number of intents waiting to be flushed across all guilds."""
+        return sum(len(p) for p in self._pending.values())
+
+    @property
+    def coalescing_ratio(self) -> float:
+        """Share of received intents that never turned into a member edit."""
+        if not self.intents_received:
+            return 0.0
+        return 1 - self.edits_applied / self.intents_received
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "guilds": len(self._pending),
+            "intents": self.intents_received,
+            "edits": self.edits_applied,
+            "edits_failed": self.edits_failed,
+            "coalescing_ratio": self.coalescing_ratio,
+        }
+
+    def cancel(self):
+        """Stop all pending flushes (used on cog unload)."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+        self._pending.clear()
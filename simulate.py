@@ -0,0 +1,490 @@
+"""
+Scheduler simulation: a week of bears, arenas and events in virtual time.
+
+Runs the real bear, arena and event cogs on a VirtualTimeLoop (clock.py)
+against in-memory guilds, so simulated days pass in seconds. Every message
+the schedulers send, edit or delete is recorded as a transition and checked
+against the schedule: transitions must arrive in order and on time.
+
+    python simulate.py [--guilds 2000] [--days 7] [--rest-ms 50]
+
+Each in-memory REST call takes --rest-ms of virtual time, so lateness shows
+where a scheduler works through guilds serially. Scheduler CPU is real
+process time, so it is the overhead of the cogs themselves.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import discord
+
+from clock import VirtualTimeLoop, clock
+
+PERMISSIONS = discord.Permissions.all()
+
+
+class _Response:
+    """Enough of an aiohttp response for discord.NotFound."""
+
+    status = 404
+    reason = "Not Found"
+
+
+def _not_found() -> discord.NotFound:
+    return discord.NotFound(_Response(), {"message": "Unknown Message", "code": 10008})
+
+
+# ─── In-memory Discord ─────────────────────────────────────
+class SimRole:
+    def __init__(self, role_id: int, name: str):
+        self.id = role_id
+        self.name = name
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+
+class SimUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.bot = True
+        self.name = "Kingshot"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SimMessage:
+    def __init__(self, channel: "SimChannel", message_id: int, content: str = "", embed=None):
+        self.channel = channel
+        self.guild = channel.guild
+        self.id = message_id
+        self.content = content or ""
+        self.embed = embed
+        self.author = channel.guild.me
+
+    async def edit(self, *, content=None, embed=None):
+        await self.channel.sim.rest()
+        if self.id not in self.channel.messages:
+            raise _not_found()
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embed = embed
+        self.channel.sim.record(self.channel, "edit", self)
+
+    async def delete(self):
+        await self.channel.sim.rest()
+        if self.channel.messages.pop(self.id, None) is None:
+            raise _not_found()
+        self.channel.sim.record(self.channel, "delete", self)
+
+
+class SimChannel:
+    def __init__(self, sim: "Simulation", guild: "SimGuild", channel_id: int, name: str, system: str):
+        self.sim = sim
+        self.guild = guild
+        self.id = channel_id
+        self.name = name
+        self.system = system
+        self.messages: dict[int, SimMessage] = {}
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    def permissions_for(self, member) -> discord.Permissions:
+        return PERMISSIONS
+
+    async def send(self, content: str = None, *, embed=None, **kwargs) -> SimMessage:
+        await self.sim.rest()
+        msg = SimMessage(self, self.sim.next_id(), content, embed)
+        self.messages[msg.id] = msg
+        self.sim.record(self, "send", msg)
+        return msg
+
+    async def fetch_message(self, message_id: int) -> SimMessage:
+        await self.sim.rest()
+        msg = self.messages.get(message_id)
+        if msg is None:
+            raise _not_found()
+        return msg
+
+    def get_partial_message(self, message_id: int) -> SimMessage:
+        return self.messages.get(message_id) or SimMessage(self, message_id)
+
+    async def delete_messages(self, messages):
+        await self.sim.rest()
+        for msg in messages:
+            if self.messages.pop(msg.id, None) is not None:
+                self.sim.record(self, "delete", msg)
+
+    async def history(self, limit: int = 100):
+        await self.sim.rest()
+        for msg in list(reversed(self.messages.values()))[:limit]:
+            yield msg
+
+
+class SimGuild:
+    def __init__(self, guild_id: int, name: str, me: SimUser):
+        self.id = guild_id
+        self.name = name
+        self.me = me
+        self.roles: list[SimRole] = [SimRole(guild_id, "@everyone")]
+        self.channels: dict[int, SimChannel] = {}
+
+    @property
+    def default_role(self) -> SimRole:
+        return self.roles[0]
+
+    @property
+    def text_channels(self) -> list[SimChannel]:
+        return list(self.channels.values())
+
+    def get_channel(self, channel_id: int) -> SimChannel | None:
+        return self.channels.get(channel_id)
+
+    def get_role(self, role_id: int) -> SimRole | None:
+        return next((r for r in self.roles if r.id == role_id), None)
+
+
+class SimBot:
+    def __init__(self, user: SimUser, guilds: list[SimGuild]):
+        self.user = user
+        self.guilds = guilds
+        self._guilds = {g.id: g for g in guilds}
+        self.closed = False
+
+    def get_guild(self, guild_id: int) -> SimGuild | None:
+        return self._guilds.get(guild_id)
+
+    def get_channel(self, channel_id: int) -> SimChannel | None:
+        for guild in self.guilds:
+            if channel_id in guild.channels:
+                return guild.channels[channel_id]
+        return None
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def wait_until_ready(self):
+        return
+
+
+# ─── Simulation ────────────────────────────────────────────
+def _label(channel: SimChannel, action: str, msg: SimMessage) -> str | None:
+    """Name the schedule transition a message operation represents, if any."""
+    content = msg.content.lower()
+    footer = msg.embed.footer.text if msg.embed and msg.embed.footer else ""
+    title = msg.embed.title if msg.embed else ""
+    if channel.system == "bear":
+        if action != "delete" and "Bear Phase: " in footer:
+            return footer.split("Bear Phase: ")[1].split(" ")[0]
+        if action == "send":
+            for phase, core in (
+                ("incoming", "bear is approaching"),
+                ("pre_attack", "get ready to attack the bear"),
+                ("attack", "attack the bear"),
+            ):
+                if core in content:
+                    return f"{phase} ping"
+    elif channel.system == "bear_log":
+        if action == "send" and "Bear Phase: victory" in footer:
+            return "victory log"
+    elif channel.system == "arena":
+        if action == "delete" and "arena is now live" in content:
+            return "ping cleanup"
+        if action == "send" and "arena is now live" in content:
+            return "open ping"
+        if action != "delete" and msg.embed:
+            return "open" if "Now Open" in title else "scheduled"
+    elif channel.system == "event":
+        if action == "send" and "get ready for the event" in content:
+            return "reminder"
+        if action == "send" and "starting soon" in content:
+            return "final_call"
+        if title == Simulation.EVENT_TITLE:
+            return {"send": "start", "edit": "start", "delete": "end"}[action]
+    return None
+
+
+class Simulation:
+    EVENT_TITLE = "Simulated event"
+
+    def __init__(self, args):
+        self.args = args
+        self.rest_delay = args.rest_ms / 1000
+        self._id = 10**15
+        self.rest_calls = 0
+        # (guild_id, system) -> [(virtual time, label)]
+        self.observed: dict[tuple[int, str], list[tuple[float, str]]] = defaultdict(list)
+        self.expected: dict[tuple[int, str], list[tuple[float, str]]] = defaultdict(list)
+
+    def next_id(self) -> int:
+        self._id += 1
+        return self._id
+
+    async def rest(self):
+        self.rest_calls += 1
+        if self.rest_delay:
+            await asyncio.sleep(self.rest_delay)
+
+    def record(self, channel: SimChannel, action: str, msg: SimMessage):
+        label = _label(channel, action, msg)
+        if label:
+            system = "bear" if channel.system == "bear_log" else channel.system
+            self.observed[(channel.guild.id, system)].append((clock.time(), label))
+
+    # ─── World and expected schedule ───────────────────────
+    def build(self, start: float) -> SimBot:
+        """Create guilds, fill gcfg and record when each transition is due."""
+        from config import (
+            gcfg,
+            BEAR_CHANNEL,
+            BEAR_LOG_CHANNEL,
+            ARENA_CHANNEL,
+            EVENT_CHANNEL,
+            BEAR_PHASE_OFFSETS,
+        )
+        from welcome_embeds import WELCOME_EMBED_VERSION
+
+        rng = random.Random(self.args.seed)
+        me = SimUser(self.next_id())
+        guilds = []
+        day0 = datetime.fromtimestamp(start, tz=timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        for i in range(self.args.guilds):
+            guild = SimGuild(self.next_id(), f"Sim {i}", me)
+            chans = {}
+            for name, system in (
+                (BEAR_CHANNEL, "bear"),
+                (BEAR_LOG_CHANNEL, "bear_log"),
+                (ARENA_CHANNEL, "arena"),
+                (EVENT_CHANNEL, "event"),
+            ):
+                ch = SimChannel(self, guild, self.next_id(), name, system)
+                guild.channels[ch.id] = chans[system] = ch
+            roles = {kind: SimRole(self.next_id(), kind) for kind in ("bear", "arena", "event")}
+            guild.roles.extend(roles.values())
+            guilds.append(guild)
+
+            # Each guild keeps its own daily bear and event time
+            bear_minute = rng.randrange(24 * 60)
+            event_minute = rng.randrange(24 * 60)
+            bears, events = [], []
+            for day in range(1, self.args.days + 1):
+                epoch = int((day0 + timedelta(days=day, minutes=bear_minute)).timestamp())
+                bears.append({"id": f"b{i}-{day}", "epoch": epoch})
+                s = int((day0 + timedelta(days=day, minutes=event_minute)).timestamp())
+                events.append({
+                    "id": f"e{i}-{day}",
+                    "title": self.EVENT_TITLE,
+                    "description": "Generated by simulate.py",
+                    "start_epoch": s,
+                    "end_epoch": s + self.args.event_minutes * 60,
+                    "thumbnail": "",
+                    "message_id": None,
+                    "template_key": None,
+                    "notifications": {},
+                })
+            gcfg[str(guild.id)] = {
+                "mode": "auto",
+                "bear": {
+                    "channel_id": chans["bear"].id,
+                    "log_channel_id": chans["bear_log"].id,
+                    "role_id": roles["bear"].id,
+                },
+                "arena": {"channel_id": chans["arena"].id, "role_id": roles["arena"].id},
+                "event": {"channel_id": chans["event"].id, "role_id": roles["event"].id},
+                "bears": bears,
+                "events": events,
+                "welcome_embed_version": WELCOME_EMBED_VERSION,
+            }
+
+            # Bears run one after another; each renders "scheduled" as soon
+            # as the previous one is gone
+            exp = self.expected[(guild.id, "bear")]
+            ready = start
+            for b in bears:
+                e = b["epoch"]
+                exp.append((ready, "scheduled"))
+                for phase in ("incoming", "pre_attack", "attack"):
+                    due = e + BEAR_PHASE_OFFSETS[phase] * 60
+                    exp += [(due, phase), (due, f"{phase} ping")]
+                ready = e + BEAR_PHASE_OFFSETS["victory"] * 60
+                exp += [(ready, "victory"), (ready, "victory log")]
+            exp = self.expected[(guild.id, "event")]
+            for ev in events:
+                s = ev["start_epoch"]
+                exp += [(s - 3600, "reminder"), (s - 600, "final_call"), (s, "start"), (ev["end_epoch"], "end")]
+
+        # Arena: the same daily window everywhere
+        arena = []
+
+        def open_at(d):
+            return d.replace(hour=23, minute=50)
+
+        now = datetime.fromtimestamp(start, tz=timezone.utc)
+        arena.append((start, "open" if now >= open_at(day0) else "scheduled"))
+        for day in range(self.args.days + 1):
+            d = day0 + timedelta(days=day)
+            if open_at(d) > now:
+                arena += [(open_at(d).timestamp(), "open ping"), (open_at(d).timestamp(), "open")]
+            reset = d + timedelta(days=1)
+            arena += [(reset.timestamp(), "ping cleanup"), (reset.timestamp(), "scheduled")]
+        for guild in guilds:
+            self.expected[(guild.id, "arena")] = list(arena)
+        return SimBot(me, guilds)
+
+    # ─── Checks ────────────────────────────────────────────
+    def check(self, end: float) -> dict:
+        """Compare observed transitions with the schedule, per guild and system."""
+        report = {}
+        for system in ("bear", "arena", "event"):
+            lateness, out_of_order, missing, extra, first_problem = [], 0, 0, 0, None
+            for (gid, sys_), expected in self.expected.items():
+                if sys_ != system:
+                    continue
+                expected = [(t, label) for t, label in expected if t <= end]
+                observed = [(t, label) for t, label in self.observed.get((gid, system), []) if t <= end]
+                missing += max(0, len(expected) - len(observed))
+                extra += max(0, len(observed) - len(expected))
+                for (due, want), (at, got) in zip(expected, observed):
+                    if want != got:
+                        out_of_order += 1
+                        if first_problem is None:
+                            first_problem = f"guild {gid}: expected {want} at {_fmt(due)}, got {got} at {_fmt(at)}"
+                    else:
+                        lateness.append(at - due)
+            report[system] = {
+                "transitions": len(lateness),
+                "out_of_order": out_of_order,
+                "missing": missing,
+                "extra": extra,
+                "first_problem": first_problem,
+                "late_p50": _pct(lateness, 50),
+                "late_p99": _pct(lateness, 99),
+                "late_max": max(lateness) if lateness else 0.0,
+            }
+        return report
+
+
+def _fmt(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%a %H:%M:%S")
+
+
+def _pct(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def simulate(sim: Simulation, start: float) -> dict:
+    import helpers
+    from admin_tools import live_feed
+    from cogs.arena import ArenaScheduler
+    from cogs.bear import NewBearScheduler
+    from cogs.events import EventScheduler
+
+    live_feed.enabled = False
+    bot = sim.build(start)
+    if sim.args.persist:
+        helpers.start_config_writer()
+    else:
+        # Drop saves instead of serialising every guild on each one
+        async def discard():
+            while True:
+                await helpers._write_queue.get()
+
+        asyncio.create_task(discard())
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    # Bear and event schedulers start their cycles from __init__
+    NewBearScheduler(bot)
+    EventScheduler(bot)
+    arena = ArenaScheduler(bot)
+    await arena.cog_load()
+
+    end = start + sim.args.days * 86400
+    await clock.sleep(end - clock.time())
+    bot.closed = True
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    # Stop the schedulers mid-sleep, as a shutdown would
+    pending = asyncio.all_tasks() - {asyncio.current_task()}
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    return {"cpu_sec": cpu, "wall_sec": wall, "end": end}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--guilds", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--event-minutes", type=int, default=120, help="length of each daily event")
+    parser.add_argument("--rest-ms", type=float, default=50, help="virtual latency of each REST call")
+    parser.add_argument("--start", help="simulated start, YYYY-MM-DD HH:MM UTC (default: now)")
+    parser.add_argument("--persist", action="store_true", help="write bot_config.json on every save, as the bot does")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Keep the cogs away from the real bot_config.json and restart snapshot
+    tmp = Path(tempfile.mkdtemp(prefix="kingshot-sim-"))
+    (tmp / "bot_config.json").write_text("{}", encoding="utf-8")
+    os.environ["KINGSHOT_CONFIG_PATH"] = str(tmp / "bot_config.json")
+    for key in ("KINGSHOT_SHARD_IDS", "KINGSHOT_LIVE_FEED_RECORD", "KINGSHOT_EVENT_LOG"):
+        os.environ.pop(key, None)
+
+    start = (
+        datetime.strptime(args.start, "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc).timestamp()
+        if args.start
+        else time.time()
+    )
+    sim = Simulation(args)
+    loop = VirtualTimeLoop()
+    asyncio.set_event_loop(loop)
+    clock.use_virtual(loop, start)
+    try:
+        result = loop.run_until_complete(simulate(sim, start))
+    finally:
+        loop.close()
+
+    report = sim.check(result["end"])
+    transitions = sum(r["transitions"] for r in report.values())
+    simulated = args.days * 86400
+    print(
+        f"\n🧪 Simulated {args.days} day(s) × {args.guilds} guilds from {_fmt(start)} UTC "
+        f"in {result['wall_sec']:.1f}s ({simulated / max(result['wall_sec'], 1e-9):,.0f}× real time)"
+    )
+    print(f"  {'system':<7} {'transitions':>11} {'late p50':>9} {'p99':>8} {'max':>8} {'order':>6} {'missing':>8} {'extra':>6}")
+    problems = []
+    for system, r in report.items():
+        print(
+            f"  {system:<7} {r['transitions']:>11} {r['late_p50']:>8.1f}s {r['late_p99']:>7.1f}s "
+            f"{r['late_max']:>7.1f}s {r['out_of_order']:>6} {r['missing']:>8} {r['extra']:>6}"
+        )
+        if r["first_problem"]:
+            problems.append(f"  ⚠️ {system}: {r['first_problem']}")
+    print("\n".join(problems))
+    print(
+        f"🧠 Scheduler CPU {result['cpu_sec']:.2f}s • {result['cpu_sec'] / max(transitions, 1) * 1e6:.0f}µs per transition • "
+        f"{sim.rest_calls} REST calls ({sim.rest_calls / args.days:,.0f}/day) at {args.rest_ms:.0f}ms"
+    )
+    if any(r["out_of_order"] or r["missing"] or r["extra"] for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
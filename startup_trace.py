@@ -0,0 +1,130 @@
+# startup_trace.py
+
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+log = logging.getLogger("kingshot")
+
+TRACE_DIR = Path(
+    os.getenv("KINGSHOT_STARTUP_TRACE_DIR", Path(__file__).parent / "startup_traces")
+)
+
+
+class StartupTracer:
+    """
+    Records named spans from process start until startup work has settled.
+
+    Spans are opened with begin()/end(), the span() context manager, or
+    track() for background startup coroutines. Once finish_when_idle() has
+    been called and every open span has closed, a waterfall is printed and
+    the timeline is written to TRACE_DIR as JSON. Recording stops after that.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.spans: list[dict] = []
+        self._open: set[int] = set()
+        self._finishing = False
+        self.done = False
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def begin(self, name: str) -> int | None:
+        if self.done:
+            return None
+        self.spans.append({"name": name, "start": self._now(), "end": None})
+        span_id = len(self.spans) - 1
+        self._open.add(span_id)
+        return span_id
+
+    def end(self, span_id: int | None) -> None:
+        if span_id is None or self.done or span_id not in self._open:
+            return
+        self.spans[span_id]["end"] = self._now()
+        self._open.discard(span_id)
+        self._maybe_finish()
+
+    def since_start(self, name: str) -> None:
+        """Record a finished span from the tracer's creation until now."""
+        if self.done:
+            return
+        self.spans.append({"name": name, "start": 0.0, "end": self._now()})
+
+    @contextmanager
+    def span(self, name: str):
+        span_id = self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(span_id)
+
+    def track(self, name: str, coro):
+        """Wrap a startup coroutine so its span opens now and closes when it returns."""
+        span_id = self.begin(name)
+
+        async def runner():
+            try:
+                return await coro
+            finally:
+                self.end(span_id)
+
+        return runner()
+
+    def finish_when_idle(self) -> None:
+        """Emit the summary as soon as no startup spans remain open."""
+        self._finishing = True
+        self._maybe_finish()
+
+    def _maybe_finish(self) -> None:
+        if self._finishing and not self._open and not self.done:
+            self.done = True
+            total = self._now()
+            print(self.waterfall(total))
+            self._write(total)
+
+    def waterfall(self, total: float, width: int = 40) -> str:
+        lines = [f"\n⏱️ Startup timeline ({total:.2f}s to fully reconciled):"]
+        scale = width / total if total > 0 else 0
+        for span in sorted(self.spans, key=lambda s: s["start"]):
+            start, end = span["start"], span["end"] if span["end"] is not None else total
+            offset = int(start * scale)
+            bar = "█" * max(1, int((end - start) * scale))
+            lines.append(
+                f"  {span['name']:<36} {start:>7.2f}s {end - start:>7.2f}s  "
+                f"{' ' * offset}{bar}"
+            )
+        return "\n".join(lines)
+
+    def _write(self, total: float) -> None:
+        timeline = {
+            "started_at": self.started_at.isoformat(),
+            "release": os.getenv("KINGSHOT_RELEASE"),
+            "python": sys.version.split()[0],
+            "total_sec": round(total, 4),
+            "spans": [
+                {
+                    "name": s["name"],
+                    "start_sec": round(s["start"], 4),
+                    "duration_sec": round((s["end"] or total) - s["start"], 4),
+                }
+                for s in self.spans
+            ],
+        }
+        try:
+            TRACE_DIR.mkdir(parents=True, exist_ok=True)
+            path = TRACE_DIR / f"startup_{self.started_at:%Y%m%d_%H%M%S}.json"
+            path.write_text(json.dumps(timeline, indent=2), encoding="utf-8")
+            log.info(f"Startup timeline saved to {path}")
+        except OSError as e:
+            log.error(f"Failed to save startup timeline: {e}")
+
+
+startup_tracer = StartupTracer()
@@ -0,0 +1,67 @@
+# warm_state.py
+
+import json
+import logging
+import time
+
+from discord.ext import commands
+
+from config import STATE_SNAPSHOT_PATH, WARM_SNAPSHOT_MAX_AGE_SEC
+
+log = logging.getLogger("kingshot")
+
+_restored: dict | None = None
+
+
+def save_snapshot(bot: commands.Bot) -> None:
+    """
+    Write each cog's snapshot_state() to STATE_SNAPSHOT_PATH.
+
+    Only called on a clean shutdown, so the next boot can trust what the
+    cogs last rendered instead of re-fetching every tracked message.
+    """
+    state = {"saved_at": time.time(), "cogs": {}}
+    for name, cog in bot.cogs.items():
+        snapshot = getattr(cog, "snapshot_state", None)
+        if snapshot:
+            try:
+                state["cogs"][name] = snapshot()
+            except Exception as e:
+                log.error(f"Failed to snapshot {name}: {e}")
+    try:
+        STATE_SNAPSHOT_PATH.write_text(json.dumps(state), encoding="utf-8")
+        log.info(f"Saved warm restart snapshot ({', '.join(state['cogs']) or 'empty'})")
+    except OSError as e:
+        log.error(f"Failed to save warm restart snapshot: {e}")
+
+
+def _load() -> dict:
+    try:
+        state = json.loads(STATE_SNAPSHOT_PATH.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        log.warning(f"Ignoring unreadable warm restart snapshot: {e}")
+        return {}
+    finally:
+        # One boot only: a later crash must not reuse this state
+        STATE_SNAPSHOT_PATH.unlink(missing_ok=True)
+
+    age = time.time() - state.get("saved_at", 0)
+    if age > WARM_SNAPSHOT_MAX_AGE_SEC:
+        log.info(f"Warm restart snapshot is {age:.0f}s old; doing a full resync")
+        return {}
+    log.info(f"Using warm restart snapshot from {age:.0f}s ago")
+    return state.get("cogs", {})
+
+
+def restored(cog_name: str) -> dict:
+    """
+    Return the state a cog saved before the last clean shutdown, or {} when
+    there is none or it is too old. Each cog's state is handed out once, so
+    reloading a cog later does a full resync.
+    """
+    global _restored
+    if _restored is None:
+        _restored = _load()
+    return _restored.pop(cog_name, {})
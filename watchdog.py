@@ -1,95 +1,365 @@
 import subprocess
 import sys
 import os
+import json
 import time
 import signal
 import psutil
 import threading
+from collections import deque
+from datetime import datetime, timezone
 
 from dotenv import load_dotenv
 load_dotenv()
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ─── Supervision settings (override via environment) ─────────────
+HEARTBEAT_FILE = os.getenv("KINGSHOT_HEARTBEAT_FILE", os.path.join(SCRIPT_DIR, "heartbeat.json"))
+HEARTBEAT_STALE_SEC = float(os.getenv("KINGSHOT_HEARTBEAT_STALE_SEC", "60"))
+# Time allowed for login, member chunking and the first heartbeat
+STARTUP_GRACE_SEC = float(os.getenv("KINGSHOT_STARTUP_GRACE_SEC", "600"))
+BACKOFF_INITIAL_SEC = 2
+BACKOFF_MAX_SEC = 300
+# A run longer than this resets the backoff
+STABLE_RUN_SEC = 600
+# More than CRASH_LOOP_MAX crashes within CRASH_LOOP_WINDOW_SEC is a crash loop
+CRASH_LOOP_MAX = 5
+CRASH_LOOP_WINDOW_SEC = 600
+CRASH_LOOP_COOLDOWN_SEC = float(os.getenv("KINGSHOT_CRASH_LOOP_COOLDOWN_SEC", "900"))
+RESTART_LOG = os.getenv("KINGSHOT_RESTART_LOG", os.path.join(SCRIPT_DIR, "watchdog_restarts.jsonl"))
+# Seconds a bot gets to close cleanly after SIGTERM before it is killed
+STOP_TIMEOUT_SEC = 15
+
+# ─── Resource limits (0 disables a limit) ───────────────────────
+RESOURCE_SAMPLE_SEC = float(os.getenv("KINGSHOT_RESOURCE_SAMPLE_SEC", "30"))
+MAX_RSS_MB = float(os.getenv("KINGSHOT_MAX_RSS_MB", "1536"))
+# Off by default: a busy bot (e.g. chunking large guilds) pins the CPU without leaking
+MAX_CPU_PERCENT = float(os.getenv("KINGSHOT_MAX_CPU_PERCENT", "0"))
+MAX_OPEN_FILES = int(os.getenv("KINGSHOT_MAX_OPEN_FILES", "2000"))
+MAX_THREADS = int(os.getenv("KINGSHOT_MAX_THREADS", "200"))
+# Consecutive samples over a limit before restarting (ignores short spikes)
+RESOURCE_BREACH_SAMPLES = 3
+RESOURCE_LOG = os.getenv("KINGSHOT_RESOURCE_LOG", os.path.join(SCRIPT_DIR, "watchdog_resources.jsonl"))
+RESOURCE_LOG_MAX_BYTES = 10 * 1024 * 1024
+# Samples kept in memory per bot lifetime for trend reporting
+RESOURCE_HISTORY = 2880
+
+IS_WINDOWS = os.name == "nt"
+# cluster.py runs several watchdogs in threads that share the log files
+_log_lock = threading.Lock()
+
+
 class BotWatchdog:
-    def __init__(self):
+    def __init__(self, cluster_id=None, env=None):
+        # cluster.py runs one watchdog per cluster, each with its own child env
+        self.cluster_id = cluster_id
+        self.env = env or {}
+        self.heartbeat_file = HEARTBEAT_FILE
+        if cluster_id is not None:
+            root, ext = os.path.splitext(HEARTBEAT_FILE)
+            self.heartbeat_file = f"{root}.{cluster_id}{ext}"
         self.bot_process = None
         self.should_restart = False
         self.running = True
+        self.started_at = None
+        self.first_beat_at = None
+        self.ready_at = None
+        self.backoff = BACKOFF_INITIAL_SEC
+        self.crashes = deque()
+        self._stop = threading.Event()
+        self.proc_info = None
+        self.resources = deque(maxlen=RESOURCE_HISTORY)
+        self.breaches = {}
+        self.next_sample = 0.0
+
+    def _print(self, message: str):
+        if self.cluster_id is not None:
+            body = message.lstrip("\n")
+            message = message[: len(message) - len(body)] + f"[cluster {self.cluster_id}] {body}"
+        print(message)
 
     def start_bot(self):
-        """Start the DEV bot process."""
-        print("\n🟢 Starting Kingshot Bot...")
+        """Start the bot process."""
+        self._print("\n🟢 Starting Kingshot Bot...")
 
-        script_dir = os.path.dirname(os.path.abspath(__file__))
         env = os.environ.copy()
-        
+        env.update(self.env)
+
         # Use the token from environment
         token = os.getenv("KINGSHOT_BOT_TOKEN")
         if token:
             env["KINGSHOT_BOT_TOKEN"] = token  # Map to what bot.py expects
         else:
-            print("⚠️ Warning: KINGSHOT_BOT_TOKEN not found in environment")
+            self._print("⚠️ Warning: KINGSHOT_BOT_TOKEN not found in environment")
+        env["KINGSHOT_HEARTBEAT_FILE"] = self.heartbeat_file
 
-        # Optional: if you don't use .env, include token manually
-        # env["KINGSHOT_DEV_TOKEN"] = "your_token_here"
+        # A previous run's heartbeat must not count for this process
+        try:
+            os.remove(self.heartbeat_file)
+        except FileNotFoundError:
+            pass
+
+        kwargs = {}
+        if IS_WINDOWS:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_CONSOLE
+        else:
+            # Own process group so stop_bot() reaches anything it spawns
+            kwargs["start_new_session"] = True
+        if self.cluster_id is not None:
+            # Clusters share our terminal; admin commands go through kingshotctl
+            kwargs["stdin"] = subprocess.DEVNULL
 
         self.bot_process = subprocess.Popen(
-            [sys.executable, "bot.py"],  # if bot.py is now standalone
-            cwd=script_dir,
+            [sys.executable, "bot.py"],
+            cwd=SCRIPT_DIR,
             env=env,
-            creationflags=subprocess.CREATE_NEW_CONSOLE
+            **kwargs,
         )
-        print(f"✅ Bot started with PID: {self.bot_process.pid}")
+        self.started_at = time.monotonic()
+        self.first_beat_at = None
+        self.ready_at = None
+        self.proc_info = psutil.Process(self.bot_process.pid)
+        self.proc_info.cpu_percent(None)  # prime; the first reading is always 0
+        self.resources.clear()
+        self.breaches = {}
+        self.next_sample = time.monotonic() + RESOURCE_SAMPLE_SEC
+        self._print(f"✅ Bot started with PID: {self.bot_process.pid}")
 
-    def stop_bot(self):
-        """Stop the bot process gracefully."""
+    def stop_bot(self, dump_stack: bool = False):
+        """Stop the bot process gracefully, then forcefully."""
         if self.bot_process:
-            print("\n🛑 Stopping bot...")
+            self._print("\n🛑 Stopping bot...")
+            if dump_stack and hasattr(signal, "SIGUSR1") and self.bot_process.poll() is None:
+                # bot.py registers faulthandler on SIGUSR1; the dump lands in its stderr
+                try:
+                    self.bot_process.send_signal(signal.SIGUSR1)
+                    time.sleep(1)
+                except OSError:
+                    pass
             try:
                 # Try to terminate gracefully first
                 self.bot_process.terminate()
-                self.bot_process.wait(timeout=5)
+                self.bot_process.wait(timeout=STOP_TIMEOUT_SEC)
             except subprocess.TimeoutExpired:
                 # Force kill if it doesn't terminate
-                print("⚠️ Bot didn't terminate gracefully, forcing stop...")
-                self.bot_process.kill()
+                self._print("⚠️ Bot didn't terminate gracefully, forcing stop...")
+                if IS_WINDOWS:
+                    self.bot_process.kill()
+                else:
+                    try:
+                        os.killpg(self.bot_process.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                self.bot_process.wait()
             self.bot_process = None
-            print("✅ Bot stopped")
+            self._print("✅ Bot stopped")
 
-    def restart_bot(self):
-        """Restart the bot process."""
-        print("\n🔁 Restarting bot...")
+    def restart_bot(self, reason: str = "requested", exit_code=None):
+        """Restart the bot process, backing off after crashes."""
+        self._print(f"\n🔁 Restarting bot ({reason})...")
         self.should_restart = True
-        self.stop_bot()
-        time.sleep(2)  # Give it a moment to fully stop
+        uptime = time.monotonic() - self.started_at if self.started_at else 0
+        self.stop_bot(dump_stack=reason == "heartbeat stale")
+
+        delay = 2  # Give it a moment to fully stop
+        # Resource restarts count too: a bot that is over a limit again soon
+        # after each restart must back off and can trip the crash loop
+        crashed = reason != "requested" and not (reason == "exited" and exit_code == 0)
+        if crashed:
+            if uptime >= STABLE_RUN_SEC:
+                self.backoff = BACKOFF_INITIAL_SEC
+            now = time.monotonic()
+            self.crashes.append(now)
+            while self.crashes and now - self.crashes[0] > CRASH_LOOP_WINDOW_SEC:
+                self.crashes.popleft()
+            delay = self.backoff
+            self.backoff = min(self.backoff * 2, BACKOFF_MAX_SEC)
+            if len(self.crashes) > CRASH_LOOP_MAX:
+                self._print(
+                    f"🚨 Crash loop: {len(self.crashes)} crashes in {CRASH_LOOP_WINDOW_SEC // 60} min — "
+                    f"pausing restarts for {CRASH_LOOP_COOLDOWN_SEC:.0f}s"
+                )
+                delay = CRASH_LOOP_COOLDOWN_SEC
+                self.crashes.clear()
+            self._print(f"⏳ Waiting {delay:.0f}s before restarting...")
+
+        self._record_restart(reason, exit_code, uptime, delay)
+        if self._stop.wait(delay):
+            return
         self.start_bot()
         self.should_restart = False
 
+    def _record_restart(self, reason, exit_code, uptime, delay):
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "reason": reason,
+            "exit_code": exit_code,
+            "uptime_sec": round(uptime, 1),
+            "time_to_heartbeat_sec": (
+                round(self.first_beat_at - self.started_at, 1) if self.first_beat_at else None
+            ),
+            "backoff_sec": delay,
+            "peak_rss_mb": max((r["rss_mb"] for r in self.resources), default=None),
+        }
+        if self.cluster_id is not None:
+            entry["cluster"] = self.cluster_id
+        try:
+            with _log_lock, open(RESTART_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            self._print(f"❌ Failed to record restart: {e}")
+
+    def _read_heartbeat(self):
+        try:
+            with open(self.heartbeat_file, encoding="utf-8") as f:
+                beat = json.load(f)
+        except (OSError, ValueError):
+            return None
+        proc = self.bot_process
+        if not proc or beat.get("pid") != proc.pid:
+            return None
+        return beat
+
+    def check_health(self):
+        """Return a restart reason if the running bot looks hung, else None."""
+        alive_for = time.monotonic() - self.started_at
+        beat = self._read_heartbeat()
+        if beat is None:
+            if alive_for > STARTUP_GRACE_SEC:
+                return "no heartbeat"
+            return None
+        if self.first_beat_at is None:
+            self.first_beat_at = time.monotonic()
+            self._print(f"💓 First heartbeat after {self.first_beat_at - self.started_at:.1f}s")
+        if time.time() - beat["ts"] > HEARTBEAT_STALE_SEC:
+            return "heartbeat stale"
+        if beat.get("ready") and self.ready_at is None:
+            self.ready_at = time.monotonic()
+        if not beat.get("ready") and alive_for > STARTUP_GRACE_SEC:
+            return "never became ready"
+        return None
+
+    def sample_resources(self):
+        """
+        Record the bot's RSS, CPU, open files and threads. Returns a restart
+        reason once a limit has been exceeded RESOURCE_BREACH_SAMPLES times
+        in a row, else None. Startup is exempt: limits apply from the first
+        ready heartbeat, or once STARTUP_GRACE_SEC has passed.
+        """
+        if time.monotonic() < self.next_sample or not self.proc_info:
+            return None
+        self.next_sample = time.monotonic() + RESOURCE_SAMPLE_SEC
+        p = self.proc_info
+        try:
+            with p.oneshot():
+                sample = {
+                    "at": round(time.time(), 1),
+                    "pid": p.pid,
+                    "uptime_sec": round(time.monotonic() - self.started_at, 1),
+                    "rss_mb": round(p.memory_info().rss / (1024 * 1024), 1),
+                    "cpu_percent": p.cpu_percent(None),
+                    "open_files": p.num_handles() if IS_WINDOWS else p.num_fds(),
+                    "threads": p.num_threads(),
+                }
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        if self.cluster_id is not None:
+            sample["cluster"] = self.cluster_id
+        self.resources.append(sample)
+        self._log_resources(sample)
+
+        if self.ready_at is None and sample["uptime_sec"] < STARTUP_GRACE_SEC:
+            return None
+
+        limits = {
+            "rss_mb": MAX_RSS_MB,
+            "cpu_percent": MAX_CPU_PERCENT,
+            "open_files": MAX_OPEN_FILES,
+            "threads": MAX_THREADS,
+        }
+        for key, limit in limits.items():
+            if limit and sample[key] > limit:
+                self.breaches[key] = self.breaches.get(key, 0) + 1
+                if self.breaches[key] >= RESOURCE_BREACH_SAMPLES:
+                    return f"resource: {key} {sample[key]} > {limit}"
+            else:
+                self.breaches.pop(key, None)
+
+        if len(self.resources) % 20 == 0:
+            self._print(self.resource_trend())
+        return None
+
+    def resource_trend(self) -> str:
+        """One-line summary of this lifetime's resource growth."""
+        first, last = self.resources[0], self.resources[-1]
+        hours = max((last["uptime_sec"] - first["uptime_sec"]) / 3600, 1e-9)
+        rss_rate = (last["rss_mb"] - first["rss_mb"]) / hours
+        line = (
+            f"📈 Bot {last['pid']}: RSS {last['rss_mb']:.0f}MB ({rss_rate:+.1f}MB/h) • "
+            f"CPU {last['cpu_percent']:.0f}% • files {last['open_files']} "
+            f"({last['open_files'] - first['open_files']:+d}) • threads {last['threads']}"
+        )
+        if MAX_RSS_MB and rss_rate > 0:
+            hours_left = (MAX_RSS_MB - last["rss_mb"]) / rss_rate
+            if hours_left < 24:
+                line += f" • ⚠️ RSS limit in ~{hours_left:.1f}h"
+        return line
+
+    def _log_resources(self, sample: dict):
+        try:
+            with _log_lock:
+                if os.path.exists(RESOURCE_LOG) and os.path.getsize(RESOURCE_LOG) > RESOURCE_LOG_MAX_BYTES:
+                    os.replace(RESOURCE_LOG, RESOURCE_LOG + ".1")
+                with open(RESOURCE_LOG, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(sample) + "\n")
+        except OSError as e:
+            self._print(f"❌ Failed to record resources: {e}")
+
     def run(self):
         """Main watchdog loop."""
         print("\n👀 Bot Watchdog Started (non-interactive mode)")
-        print("The watchdog will automatically restart the bot if it crashes.")
+        print("The watchdog will automatically restart the bot if it crashes or stops responding.")
         print("Stop the watchdog by killing this process (Ctrl+C or your deployment tool).\n")
-        
+
+        if not IS_WINDOWS:
+            # Deployment tools stop us with SIGTERM; take the bot down with us
+            signal.signal(signal.SIGTERM, lambda *_: self.shutdown())
+
+        self.supervise()
+        print("\n👋 Watchdog stopped")
+
+    def supervise(self):
+        """Start the bot and keep it running until shutdown(); safe to run in a thread."""
         self.start_bot()
-        
+
         while self.running:
             try:
                 # Check if bot process is still alive
-                if self.bot_process and self.bot_process.poll() is not None:
-                    print("\n⚠️ Bot process terminated unexpectedly")
+                code = self.bot_process.poll() if self.bot_process else None
+                if self.bot_process and code is not None:
+                    self._print(f"\n⚠️ Bot process exited with code {code}")
                     if not self.should_restart:  # Don't restart if we're already restarting
-                        print("🔄 Attempting to restart...")
-                        self.restart_bot()
-                time.sleep(1)  # Prevent high CPU usage
+                        self.restart_bot("exited", code)
+                elif self.bot_process:
+                    reason = self.check_health() or self.sample_resources()
+                    if reason:
+                        self._print(f"\n⚠️ Bot needs a restart: {reason}")
+                        self.restart_bot(reason)
+                self._stop.wait(1)  # Prevent high CPU usage
             except KeyboardInterrupt:
-                self.running = False
+                self.shutdown()
             except Exception as e:
-                print(f"❌ Watchdog error: {e}")
-                time.sleep(5)  # Wait before retrying
+                self._print(f"❌ Watchdog error: {e}")
+                self._stop.wait(5)  # Wait before retrying
         # Cleanup
         self.stop_bot()
-        print("\n👋 Watchdog stopped")
+
+    def shutdown(self):
+        self.running = False
+        self._stop.set()
+
 
 if __name__ == "__main__":
     watchdog = BotWatchdog()
-    watchdog.run() 
\ No newline at end of file
+    watchdog.run()
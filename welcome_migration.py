@@ -0,0 +1,212 @@
+# welcome_migration.py
+
+import asyncio
+import logging
+import time
+
+import discord
+from discord.ext import commands
+
+from admin_tools import live_feed
+from config import (
+    gcfg,
+    WELCOME_MIGRATION_CONCURRENCY,
+    WELCOME_MIGRATION_START_DELAY_SEC,
+    WELCOME_MIGRATION_YIELD_SEC,
+)
+from helpers import save_config
+from rest_accounting import rest_accounting, tag
+from welcome_embeds import (
+    make_arena_welcome_embed,
+    make_bear_welcome_embed,
+    make_event_welcome_embed,
+    WELCOME_EMBED_VERSION,
+)
+
+log = logging.getLogger("kingshot")
+
+# part -> (config section, message ID key, embed builder)
+PARTS = {
+    "bear": ("bear", "welcome_message_id", make_bear_welcome_embed),
+    "arena": ("arena", "welcome_message_id", make_arena_welcome_embed),
+    "event": ("event", "message_id", make_event_welcome_embed),
+}
+# Time-critical features the migration waits for (see rest_accounting.py)
+PING_FEATURES = ("bear_phase", "bear_cleanup", "arena_edit", "event_reminder")
+
+
+def needs_migration(guild_cfg: dict) -> bool:
+    return bool(guild_cfg.get("mode")) and guild_cfg.get("welcome_embed_version", "1.0") != WELCOME_EMBED_VERSION
+
+
+def migrated_parts(guild_cfg: dict) -> list[str]:
+    """Parts already at WELCOME_EMBED_VERSION in a guild that is part way through."""
+    progress = guild_cfg.get("welcome_migration") or {}
+    return progress.get("done", []) if progress.get("version") == WELCOME_EMBED_VERSION else []
+
+
+def mark_migrated(guild_cfg: dict, part: str) -> None:
+    """
+    Record that a guild's `part` welcome embed is current. Once every part
+    is, the guild's welcome_embed_version is bumped and the progress entry
+    dropped. The caller saves the config.
+    """
+    if guild_cfg.get("welcome_embed_version") == WELCOME_EMBED_VERSION:
+        return
+    done = migrated_parts(guild_cfg)
+    if part not in done:
+        done = done + [part]
+    if set(done) >= set(PARTS):
+        guild_cfg["welcome_embed_version"] = WELCOME_EMBED_VERSION
+        guild_cfg.pop("welcome_migration", None)
+    else:
+        guild_cfg["welcome_migration"] = {"version": WELCOME_EMBED_VERSION, "done": done}
+
+
+class WelcomeMigration:
+    """
+    Brings every guild's welcome embeds up to WELCOME_EMBED_VERSION in the
+    background after boot.
+
+    Guilds are migrated WELCOME_MIGRATION_CONCURRENCY at a time and each
+    edit waits while bear, arena or event pings are in flight; the
+    welcome_migration REST budget caps the rest. Each embed is recorded in
+    the guild's config as soon as it is done, so a restart picks up where
+    the last run stopped without editing anything twice.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.resumed = 0
+        self.updated = 0
+        self.scanned = False
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._logged_pct = 0
+
+    async def run(self):
+        await self.bot.wait_until_ready()
+        await asyncio.sleep(WELCOME_MIGRATION_START_DELAY_SEC)
+        guilds = [g for g in self.bot.guilds if needs_migration(gcfg.get(str(g.id), {}))]
+        self.scanned = True
+        if not guilds:
+            return
+        self.total = len(guilds)
+        self.resumed = sum(1 for g in guilds if migrated_parts(gcfg[str(g.id)]))
+        self.started_at = time.monotonic()
+        log.info(
+            f"Migrating welcome embeds to {WELCOME_EMBED_VERSION} in {self.total} guild(s)"
+            + (f", resuming {self.resumed}" if self.resumed else ""),
+            extra={"phase": "welcome_migration"},
+        )
+
+        limiter = asyncio.Semaphore(WELCOME_MIGRATION_CONCURRENCY)
+        await asyncio.gather(*(self._run_guild(guild, limiter) for guild in guilds))
+
+        self.finished_at = time.monotonic()
+        duration = round(self.finished_at - self.started_at, 3)
+        log.info(
+            f"Welcome embeds migrated in {duration}s: {self.updated} embed(s) in "
+            f"{self.done - self.failed} guild(s), {self.failed} failed (retried next boot)",
+            extra={"phase": "welcome_migration", "duration": duration},
+        )
+
+    async def _run_guild(self, guild: discord.Guild, limiter: asyncio.Semaphore):
+        async with limiter:
+            tag("welcome_migration", guild.id)
+            try:
+                self.updated += await self.migrate_guild(guild)
+            except Exception as e:
+                self.failed += 1
+                log.error(
+                    f"Welcome migration failed in {guild.name}: {e}",
+                    extra={"guild_id": guild.id, "phase": "welcome_migration"},
+                )
+            self.done += 1
+            pct = self.done * 100 // self.total
+            if pct >= self._logged_pct + 10 and self.done < self.total:
+                self._logged_pct = pct - pct % 10
+                log.info(f"Welcome migration {self.summary()}", extra={"phase": "welcome_migration"})
+
+    async def migrate_guild(self, guild: discord.Guild) -> int:
+        """
+        Update the guild's outdated welcome embeds; returns how many were
+        edited. Also used by /updateembeds, so it leaves the job's stats alone.
+        """
+        guild_cfg = gcfg.get(str(guild.id), {})
+        updated = 0
+        for part, (section, key, make_embed) in PARTS.items():
+            # Re-checked per part: /updateembeds or the job may have got here
+            # first while this one waited
+            if not needs_migration(guild_cfg):
+                break
+            if part in migrated_parts(guild_cfg):
+                continue
+            cfg = guild_cfg.get(section, {})
+            ch = guild.get_channel(cfg["channel_id"]) if cfg.get(key) and cfg.get("channel_id") else None
+            if ch:
+                await self._yield_to_pings()
+                try:
+                    # No fetch: editing a deleted message raises NotFound anyway
+                    await ch.get_partial_message(cfg[key]).edit(embed=make_embed(str(guild.id)))
+                    updated += 1
+                    live_feed.log(
+                        f"Updated {part} welcome message",
+                        "Guild: {} • Channel: #{}",
+                        guild,
+                        ch,
+                        guild.name, ch.name,
+                    )
+                except (discord.NotFound, discord.Forbidden):
+                    live_feed.log(
+                        f"Failed to update {part} welcome message",
+                        "Guild: {} • Message not found or no permission",
+                        guild,
+                        None,
+                        guild.name,
+                    )
+            # Missing or unreachable embeds have nothing to migrate
+            mark_migrated(guild_cfg, part)
+            save_config(gcfg)
+        return updated
+
+    @staticmethod
+    async def _yield_to_pings():
+        while rest_accounting.in_flight(PING_FEATURES):
+            await asyncio.sleep(WELCOME_MIGRATION_YIELD_SEC)
+
+    def progress(self) -> dict:
+        elapsed = ((self.finished_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        return {
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "resumed": self.resumed,
+            "updated": self.updated,
+            "percent": round(self.done / self.total * 100, 1) if self.total else 100.0,
+            "rate": round(rate, 2),
+            "eta_sec": round(remaining / rate) if rate and remaining else (0 if not remaining else None),
+            "running": self.started_at is not None and self.finished_at is None,
+        }
+
+    def summary(self) -> str:
+        if not self.scanned:
+            return f"to {WELCOME_EMBED_VERSION}: starts {WELCOME_MIGRATION_START_DELAY_SEC}s after ready"
+        if not self.total:
+            return f"to {WELCOME_EMBED_VERSION}: nothing to migrate"
+        p = self.progress()
+        line = (
+            f"to {WELCOME_EMBED_VERSION}: {p['done']}/{p['total']} guild(s) ({p['percent']:.0f}%) • "
+            f"{p['updated']} embed(s) edited • {p['failed']} failed"
+        )
+        if p["running"]:
+            eta = f"{p['eta_sec'] // 60}m{p['eta_sec'] % 60:02d}s" if p["eta_sec"] is not None else "?"
+            line += f" • {p['rate']:.1f} guild(s)/s • ETA {eta}"
+        elif self.finished_at:
+            line += f" • done in {self.finished_at - self.started_at:.0f}s"
+        return line